@@ -0,0 +1,7 @@
+"""Benchmarks for the recommender's hot paths, run against synthetic eBird data.
+
+    python -m benchmarks.run --quick --out bench.json
+
+See run.py for options, synthetic.py for the data generator and
+serialization.py for per-route response serialization timings.
+"""
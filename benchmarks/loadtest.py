@@ -0,0 +1,315 @@
+"""Load test the API: serve.py against the local eBird stand-in, driven over HTTP.
+
+    python -m benchmarks.loadtest                          # cold + warm, 20 s each
+    python -m benchmarks.loadtest --workers 4 --concurrency 64 --duration 60
+    python -m benchmarks.loadtest --scenario warm --mix recommend=6,hotspot=4 --out load.json
+
+For each scenario a fresh serve.py (own working directory, so empty caches)
+is started against benchmarks.upstream serving a SyntheticRegion with the
+given injected latency. concurrency clients then send requests back to back
+for duration seconds, picking routes by --mix weights:
+
+- cold: every request uses a new random location within --spread-km of the
+  centre, so nothing repeats and each request goes upstream.
+- warm: requests draw from a pool of --locations points; every distinct
+  request is sent once before timing starts.
+
+/recommend uses life lists of the --life-list-sizes sizes, uploaded first.
+Per route the report gives throughput, p50/p95/p99 latency, error rate and
+cache hit ratios from the X-Cache header: "hit" counts responses served
+without calling eBird, "resp" those from the response cache alone.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+import numpy as np
+
+from ebird_recommend.core.geo import _KM_PER_DEG_LAT
+
+from .synthetic import species_names
+
+_ROOT = Path(__file__).resolve().parent.parent
+_ROUTES = ("recommend", "notable", "hotspots", "hotspot")
+_RADII = (10, 25, 50)
+_DAYS = (7, 14)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_ready(url: str, proc: subprocess.Popen, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"{proc.args} exited with {proc.returncode}")
+        try:
+            if httpx.get(url, timeout=1).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{url} not ready after {timeout}s")
+
+
+class Stack:
+    """The stand-in upstream plus one serve.py, in a scratch directory."""
+
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.procs: list[subprocess.Popen] = []
+        self.logs = []
+        self.workdir = Path(tempfile.mkdtemp(prefix="ebird-load-"))
+        self.upstream_port, self.api_port = _free_port(), _free_port()
+        self.url = f"http://127.0.0.1:{self.api_port}"
+
+    def __enter__(self) -> "Stack":
+        a = self.args
+        env = {**os.environ, "PYTHONPATH": str(_ROOT)}
+        self._spawn([
+            sys.executable, "-m", "benchmarks.upstream", "--synthetic",
+            "--rows", str(a.rows), "--lat", str(a.lat), "--lng", str(a.lng),
+            "--radius", str(a.spread_km + max(_RADII)),
+            "--latency-ms", str(a.upstream_latency_ms), "--jitter-ms", str(a.upstream_jitter_ms),
+            "--error-rate", str(a.upstream_error_rate), "--port", str(self.upstream_port),
+        ], env, f"http://127.0.0.1:{self.upstream_port}/_stats")
+        self._spawn([
+            sys.executable, str(_ROOT / "serve.py"), "--port", str(self.api_port), "--workers", str(a.workers),
+        ], {
+            **env,
+            "EBIRD_BASE_URL": f"http://127.0.0.1:{self.upstream_port}/v2",
+            "EBIRD_API_KEY": "loadtest",
+        }, f"{self.url}/healthz")
+        return self
+
+    def _spawn(self, cmd: list[str], env: dict, ready_url: str) -> None:
+        log = open(self.workdir / f"{len(self.procs)}.log", "wb")
+        self.logs.append(log)
+        proc = subprocess.Popen(cmd, env=env, cwd=self.workdir, stdout=log, stderr=subprocess.STDOUT)
+        self.procs.append(proc)
+        try:
+            _wait_ready(ready_url, proc)
+        except RuntimeError:
+            self.__exit__()
+            raise
+
+    def upstream_requests(self) -> int:
+        return httpx.get(f"http://127.0.0.1:{self.upstream_port}/_stats").json()["requests"]
+
+    def __exit__(self, *exc) -> None:
+        for proc in reversed(self.procs):
+            proc.terminate()
+        for proc in self.procs:
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+        for log in self.logs:
+            log.close()
+
+
+class Workload:
+    """Seeded generator of (route, method, path, json body) requests."""
+
+    def __init__(self, args: argparse.Namespace, list_ids: list[str], cold: bool):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.list_ids = list_ids
+        self.cold = cold
+        self.routes, self.weights = zip(*args.mix.items())
+        self.pool = [self._point() for _ in range(args.locations)]
+        # Matches the stand-in's SyntheticRegion.sized() hotspot ids.
+        hotspots = max(20, min(2_000, args.rows // 30))
+        self.loc_ids = [f"L{i:06d}" for i in range(hotspots)]
+
+    def _point(self) -> tuple[float, float]:
+        a = self.args
+        r = a.spread_km * math.sqrt(self.rng.random())
+        theta = self.rng.random() * 2 * math.pi
+        lat = a.lat + r * math.sin(theta) / _KM_PER_DEG_LAT
+        lng = a.lng + r * math.cos(theta) / (_KM_PER_DEG_LAT * math.cos(math.radians(a.lat)))
+        return round(lat, 5), round(lng, 5)
+
+    def request(self, route: str, point: tuple[float, float], radius: int, days: int, index: int):
+        lat, lng = point
+        if route == "recommend":
+            body = {
+                "lat": lat, "lng": lng, "radius": radius, "days": days,
+                "life_list_id": self.list_ids[index % len(self.list_ids)],
+            }
+            return route, "POST", "/recommend", body
+        if route == "notable":
+            return route, "GET", f"/notable?lat={lat}&lng={lng}&radius={radius}&days={days}", None
+        if route == "hotspots":
+            return route, "GET", f"/hotspots?lat={lat}&lng={lng}&radius={radius}", None
+        loc_id = self.loc_ids[index % len(self.loc_ids)]
+        return route, "GET", f"/hotspot/{loc_id}?days={days}", None
+
+    def next(self):
+        route = self.rng.choices(self.routes, self.weights)[0]
+        point = self._point() if self.cold else self.rng.choice(self.pool)
+        index = self.rng.randrange(len(self.loc_ids) if self.cold else self.args.locations)
+        return self.request(route, point, self.rng.choice(_RADII), self.rng.choice(_DAYS), index)
+
+    def distinct(self):
+        """Every request the warm workload can produce."""
+        for route in self.routes:
+            for i, point in enumerate(self.pool):
+                for radius in _RADII:
+                    for days in _DAYS:
+                        for list_index in range(len(self.list_ids) if route == "recommend" else 1):
+                            yield self.request(route, point, radius, days, i if route == "hotspot" else list_index)
+
+
+async def _send(http: httpx.AsyncClient, request) -> tuple[str, float, int, str]:
+    route, method, path, body = request
+    start = time.perf_counter()
+    try:
+        res = await http.request(method, path, json=body)
+        status, cache = res.status_code, res.headers.get("x-cache", "")
+    except httpx.HTTPError:
+        status, cache = 0, ""
+    return route, time.perf_counter() - start, status, cache
+
+
+async def _drive(url: str, workload: Workload, concurrency: int, duration: float) -> tuple[list, float]:
+    results: list[tuple[str, float, int, str]] = []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as http:
+        deadline = time.perf_counter() + duration
+
+        async def client() -> None:
+            while time.perf_counter() < deadline:
+                results.append(await _send(http, workload.next()))
+
+        start = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+        return results, time.perf_counter() - start
+
+
+async def _prime(url: str, workload: Workload, concurrency: int) -> int:
+    requests = list(workload.distinct())
+    queue = iter(requests)
+    async with httpx.AsyncClient(base_url=url, timeout=120) as http:
+        async def client() -> None:
+            for request in queue:
+                await _send(http, request)
+
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+    return len(requests)
+
+
+def _upload_life_lists(url: str, sizes: list[int]) -> list[str]:
+    ids = []
+    for size in sizes:
+        names = species_names(size)
+        body = [{"scientific_name": sci, "common_name": com} for _, com, sci in names]
+        res = httpx.put(f"{url}/lifelist", json=body, timeout=30)
+        res.raise_for_status()
+        ids.append(res.json()["life_list_id"])
+    return ids
+
+
+def summarize(results: list[tuple[str, float, int, str]], elapsed: float) -> dict[str, dict]:
+    report = {}
+    for route in [*_ROUTES, "all"]:
+        rows = [r for r in results if route == "all" or r[0] == route]
+        if not rows:
+            continue
+        latency = np.array([r[1] for r in rows]) * 1000
+        ok = [r for r in rows if 0 < r[2] < 400]
+        report[route] = {
+            "requests": len(rows),
+            "throughput_rps": len(rows) / elapsed,
+            "p50_ms": float(np.percentile(latency, 50)),
+            "p95_ms": float(np.percentile(latency, 95)),
+            "p99_ms": float(np.percentile(latency, 99)),
+            "error_rate": 1 - len(ok) / len(rows),
+            "cache_hit_ratio": sum(r[3] in ("HIT", "UPSTREAM-HIT") for r in ok) / len(ok) if ok else 0.0,
+            "response_cache_hit_ratio": sum(r[3] == "HIT" for r in ok) / len(ok) if ok else 0.0,
+        }
+    return report
+
+
+def _print(name: str, report: dict[str, dict], extra: dict) -> None:
+    print(f"\n{name}: " + ", ".join(f"{k}={v}" for k, v in extra.items()))
+    print(f"{'route':<10} {'reqs':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'err':>6} {'hit':>6} {'resp':>6}")
+    for route, r in report.items():
+        print(
+            f"{route:<10} {r['requests']:>7} {r['throughput_rps']:>8.1f} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f}"
+            f" {r['p99_ms']:>8.1f} {r['error_rate']:>6.1%} {r['cache_hit_ratio']:>6.1%} {r['response_cache_hit_ratio']:>6.1%}"
+        )
+
+
+def run_scenario(name: str, args: argparse.Namespace) -> dict:
+    with Stack(args) as stack:
+        list_ids = _upload_life_lists(stack.url, args.life_list_sizes)
+        workload = Workload(args, list_ids, cold=name == "cold")
+        extra = {}
+        if name == "warm":
+            extra["primed_requests"] = asyncio.run(_prime(stack.url, workload, args.concurrency))
+        before = stack.upstream_requests()
+        results, elapsed = asyncio.run(_drive(stack.url, workload, args.concurrency, args.duration))
+        extra["upstream_requests"] = stack.upstream_requests() - before
+    report = summarize(results, elapsed)
+    _print(name, report, extra)
+    return {"routes": report, **extra}
+
+
+def _mix(value: str) -> dict[str, float]:
+    mix = {}
+    for part in value.split(","):
+        route, _, weight = part.partition("=")
+        if route not in _ROUTES:
+            raise argparse.ArgumentTypeError(f"unknown route {route!r} (expected {', '.join(_ROUTES)})")
+        mix[route] = float(weight or 1)
+    return mix
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.loadtest", description=__doc__.splitlines()[0])
+    parser.add_argument("--scenario", choices=["cold", "warm", "both"], default="both")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds of timed load per scenario")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent closed-loop clients")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for serve.py")
+    parser.add_argument("--mix", type=_mix, default=_mix("recommend=5,notable=2,hotspots=2,hotspot=1"),
+                        help="Route weights, e.g. recommend=5,notable=2,hotspots=2,hotspot=1")
+    parser.add_argument("--locations", type=int, default=20, help="Distinct locations in the warm pool")
+    parser.add_argument("--spread-km", type=float, default=40.0, help="Locations lie within this distance of the centre")
+    parser.add_argument("--lat", type=float, default=40.7)
+    parser.add_argument("--lng", type=float, default=-74.0)
+    parser.add_argument("--life-list-sizes", type=lambda v: [int(x) for x in v.split(",")], default=[50, 300, 1000])
+    parser.add_argument("--rows", type=int, default=20_000, help="Synthetic upstream observations")
+    parser.add_argument("--upstream-latency-ms", type=float, default=80.0)
+    parser.add_argument("--upstream-jitter-ms", type=float, default=40.0)
+    parser.add_argument("--upstream-error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", type=Path, help="Write the report as JSON")
+    args = parser.parse_args(argv)
+
+    scenarios = ["cold", "warm"] if args.scenario == "both" else [args.scenario]
+    report = {
+        "config": {k: v for k, v in vars(args).items() if k != "out"},
+        "scenarios": {name: run_scenario(name, args) for name in scenarios},
+    }
+    if args.out:
+        args.out.write_text(json.dumps(report, indent=2, default=str), encoding="utf-8")
+        print(f"\nWrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
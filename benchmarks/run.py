@@ -0,0 +1,116 @@
+"""Run the benchmark suites and write machine-readable results.
+
+    python -m benchmarks.run                      # all suites, full sizes
+    python -m benchmarks.run --quick --only recommend,cache
+    python -m benchmarks.run --out results/$(git rev-parse --short HEAD).json
+    python -m benchmarks.run --quick --compare results/base.json
+
+Results are one JSON document: environment metadata (commit, Python,
+library versions) and a list of results keyed by name and params. With
+--compare, each result's median is compared with the same key in an
+earlier file and regressions beyond --threshold are reported; the exit
+status is 1 if there are any.
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from ebird_recommend.core import fastjson
+
+from .suites import SUITES
+from .timing import result_key
+
+_NOISE_MS = 0.01
+
+
+def _git(*args: str) -> str | None:
+    try:
+        return subprocess.run(
+            ["git", *args], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _metadata(quick: bool) -> dict:
+    status = _git("status", "--porcelain", "--untracked-files=no")
+    return {
+        "commit": _git("rev-parse", "HEAD"),
+        "dirty": bool(status) if status is not None else None,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "json": "orjson" if fastjson.orjson is not None else "stdlib",
+        "quick": quick,
+    }
+
+
+def compare(results: list[dict], baseline: dict, threshold: float) -> list[str]:
+    """Lines describing each result's change against baseline; regressions are marked."""
+    before = {result_key(r): r for r in baseline["results"]}
+    lines = []
+    for r in results:
+        old = before.get(result_key(r))
+        if old is None:
+            continue
+        ratio = r["median_ms"] / old["median_ms"] if old["median_ms"] else float("inf")
+        mark = ""
+        # Sub-10 µs differences are timer noise whatever the ratio.
+        if abs(r["median_ms"] - old["median_ms"]) >= _NOISE_MS:
+            mark = "REGRESSION" if ratio > 1 + threshold else ("faster" if ratio < 1 - threshold else "")
+        lines.append(
+            f"{result_key(r):<70} {old['median_ms']:>10.3f} → {r['median_ms']:>10.3f} ms  x{ratio:.2f} {mark}"
+        )
+    return lines
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description=__doc__.splitlines()[0])
+    parser.add_argument("--only", help=f"Comma-separated suites ({', '.join(SUITES)})")
+    parser.add_argument("--quick", action="store_true", help="Smaller sizes for a fast check")
+    parser.add_argument("--out", type=Path, help="Write results JSON here (default: stdout summary only)")
+    parser.add_argument("--workdir", type=Path, help="Keep generated CSVs and caches here between runs")
+    parser.add_argument("--compare", type=Path, help="Earlier results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative slowdown reported as a regression")
+    args = parser.parse_args(argv)
+
+    names = args.only.split(",") if args.only else list(SUITES)
+    unknown = [n for n in names if n not in SUITES]
+    if unknown:
+        parser.error(f"unknown suite(s): {', '.join(unknown)}")
+
+    workdir = args.workdir or Path(tempfile.mkdtemp(prefix="ebird-bench-"))
+    workdir.mkdir(parents=True, exist_ok=True)
+    results = []
+    for name in names:
+        for result in SUITES[name](args.quick, workdir):
+            results.append(result)
+            print(f"{result_key(result):<70} {result['median_ms']:>10.3f} ms  ({result['runs']} runs)", flush=True)
+
+    document = {"meta": _metadata(args.quick), "results": results}
+    if args.out:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(json.dumps(document, indent=2), encoding="utf-8")
+        print(f"Wrote {len(results)} results to {args.out}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        lines = compare(results, baseline, args.threshold)
+        print(f"\nAgainst {args.compare} ({baseline['meta'].get('commit') or 'unknown commit'}):")
+        print("\n".join(lines) or "No results in common.")
+        return 1 if any(line.endswith("REGRESSION") for line in lines) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+"""Serialization time per API route: response_model path vs the fast path.
+
+"response_model" is what FastAPI does for a route that returns models:
+validate the return value against the declared type, dump it to JSON-able
+Python, then json.dumps it (as JSONResponse does). "rows" and "columns" are
+the routes' own fast paths (?format=rows / ?format=columns), and gzip / br
+the one-off cost of compressing the fast body.
+
+    python benchmarks/serialization.py --rows 200 --repeat 50
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from pydantic import TypeAdapter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ebird_recommend.api import compression  # noqa: E402
+from ebird_recommend.api.app import (  # noqa: E402
+    _CHECKLIST_FIELDS, _HOTSPOT_FIELDS, _RECOMMENDATION_FIELDS, _columns, _rows,
+)
+from ebird_recommend.core import fastjson  # noqa: E402
+from ebird_recommend.core.columns import ObsColumns  # noqa: E402
+from ebird_recommend.core.models import (  # noqa: E402
+    Checklist, Hotspot, HotspotDetailResponse, NotableObservation, Recommendation,
+)
+
+
+def _observations(n: int) -> ObsColumns:
+    return ObsColumns.from_records([
+        {
+            "speciesCode": f"sp{i % 300}", "comName": f"Common Bird {i % 300}",
+            "sciName": f"Genus species{i % 300}", "locId": f"L{i % 40}",
+            "locName": f"Hotspot number {i % 40}", "obsDt": "2026-10-01 07:30",
+            "howMany": i % 7 or None, "lat": 40.0 + i * 1e-4, "lng": -74.0 - i * 1e-4,
+            "obsValid": True, "obsReviewed": False, "locationPrivate": False, "subId": f"S{i}",
+        }
+        for i in range(n)
+    ])
+
+
+def _recommendations(n: int) -> list[Recommendation]:
+    return [
+        Recommendation(
+            species_code=f"sp{i}", common_name=f"Common Bird {i}", scientific_name=f"Genus species{i}",
+            loc_id=f"L{i % 40}", loc_name=f"Hotspot number {i % 40}", lat=40.0, lng=-74.0,
+            distance_km=12.3, last_reported="2026-10-01", report_count=3, is_notable=i % 5 == 0,
+            is_lifer=True, score=15.5, reason="lifer | seen 3d ago | 3 reports",
+            species_url=f"https://ebird.org/species/sp{i}", hotspot_url=f"https://ebird.org/hotspot/L{i % 40}",
+        )
+        for i in range(n)
+    ]
+
+
+def _hotspots(n: int) -> list[Hotspot]:
+    return [
+        Hotspot(
+            locId=f"L{i}", locName=f"Hotspot number {i}", lat=40.0, lng=-74.0,
+            countryCode="US", subnational1Code="US-NY", numSpeciesAllTime=200 + i,
+        )
+        for i in range(n)
+    ]
+
+
+def _checklists(n: int) -> list[Checklist]:
+    return [
+        Checklist(sub_id=f"S{i}", loc_id="L1", loc_name="Hotspot", obs_dt="2026-10-01 07:30", num_species=30)
+        for i in range(n)
+    ]
+
+
+def _response_model(annotation, content) -> bytes:
+    adapter = TypeAdapter(annotation)
+    value = adapter.validate_python(content, from_attributes=True)
+    data = adapter.dump_python(value, mode="json", by_alias=True)
+    return json.dumps(data, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+
+def _time(fn, repeat: int) -> tuple[float, bytes]:
+    body = fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000, body
+
+
+def main(rows: int, repeat: int) -> None:
+    recs, obs, spots, checklists = _recommendations(rows), _observations(rows), _hotspots(rows), _checklists(rows)
+    notable_models = obs.to_models(NotableObservation)
+
+    routes = {
+        "/recommend": {
+            "response_model": lambda: _response_model(list[Recommendation], recs),
+            "rows": lambda: fastjson.dumps(_rows(recs)),
+            "columns": lambda: fastjson.dumps(_columns(_rows(recs), _RECOMMENDATION_FIELDS)),
+        },
+        "/notable": {
+            "response_model": lambda: _response_model(list[NotableObservation], notable_models),
+            "rows": lambda: fastjson.dumps(obs.to_api()),
+            "columns": lambda: fastjson.dumps(obs.to_api_columns()),
+        },
+        "/hotspots": {
+            "response_model": lambda: _response_model(list[Hotspot], spots),
+            "rows": lambda: fastjson.dumps([h.model_dump(by_alias=True) for h in spots]),
+            "columns": lambda: fastjson.dumps(
+                _columns([h.model_dump(by_alias=True) for h in spots], _HOTSPOT_FIELDS)
+            ),
+        },
+        "/hotspot/{loc_id}": {
+            "response_model": lambda: _response_model(
+                HotspotDetailResponse,
+                {"notable": notable_models, "recent": notable_models, "checklists": checklists},
+            ),
+            "rows": lambda: fastjson.dumps(
+                {"notable": obs.to_api(), "recent": obs.to_api(), "checklists": _rows(checklists)}
+            ),
+            "columns": lambda: fastjson.dumps({
+                "notable": obs.to_api_columns(),
+                "recent": obs.to_api_columns(),
+                "checklists": _columns(_rows(checklists), _CHECKLIST_FIELDS),
+            }),
+        },
+    }
+    encodings = ["gzip"] + (["br"] if compression.brotli is not None else [])
+
+    print(f"{rows} rows per list, mean of {repeat} runs; json: {'orjson' if fastjson.orjson else 'stdlib'}")
+    print(f"{'route':<18} {'variant':<15} {'ms':>8} {'bytes':>9}")
+    for route, variants in routes.items():
+        base_ms = None
+        for variant, fn in variants.items():
+            ms, body = _time(fn, repeat)
+            base_ms = base_ms or ms
+            speedup = f"  x{base_ms / ms:.1f}" if variant != "response_model" else ""
+            print(f"{route:<18} {variant:<15} {ms:>8.3f} {len(body):>9}{speedup}")
+            if variant == "rows":
+                for encoding in encodings:
+                    ms, compressed = _time(lambda: compression.compress(body, encoding), repeat)
+                    print(f"{route:<18} {'  + ' + encoding:<15} {ms:>8.3f} {len(compressed):>9}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200, help="Items per list")
+    parser.add_argument("--repeat", type=int, default=50, help="Timed runs per variant")
+    args = parser.parse_args()
+    main(args.rows, args.repeat)
@@ -0,0 +1,202 @@
+"""Benchmark suites. Each yields one result dict per measured case.
+
+Suites take quick (smaller sizes, for a fast check) and a scratch
+directory for generated files and caches.
+"""
+
+import asyncio
+import os
+import random
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Callable, Iterator
+
+import httpx
+import numpy as np
+
+from ebird_recommend.core.cache import Cache, MemoryCache, SQLiteCache, TieredCache
+from ebird_recommend.core.geo import haversine, haversine_np
+from ebird_recommend.core.recommender import _parse_obs_date, recommend
+from ebird_recommend.core.user_data import load_life_list
+
+from .synthetic import SyntheticRegion, write_life_list_csv
+from .timing import measure
+
+Suite = Callable[[bool, Path], Iterator[dict]]
+
+
+def recommend_suite(quick: bool, workdir: Path) -> Iterator[dict]:
+    sizes = [200, 1_000, 10_000] if quick else [200, 1_000, 10_000, 100_000]
+    for rows in sizes:
+        region = SyntheticRegion.sized(rows)
+        seen = region.life_list()
+        cfg = region.config
+        inputs = {"columns": (region.columns(), region.columns(notable=True))}
+        if rows <= 10_000:
+            inputs["models"] = (region.models(), region.models(notable=True))
+        for kind, (all_obs, notable_obs) in inputs.items():
+            for top in (20, None):
+                yield measure(
+                    "recommend",
+                    lambda: recommend(cfg.lat, cfg.lng, seen, all_obs, notable_obs, 50, top=top),
+                    params={"rows": rows, "input": kind, "top": top or "all"},
+                    items=len(all_obs) + len(notable_obs),
+                )
+
+
+def haversine_suite(quick: bool, workdir: Path) -> Iterator[dict]:
+    rng = random.Random(0)
+    pairs = [(40 + rng.random(), -74 + rng.random()) for _ in range(10_000)]
+    yield measure(
+        "haversine",
+        lambda: [haversine(40.5, -73.5, lat, lng) for lat, lng in pairs],
+        params={"impl": "scalar"},
+        items=len(pairs),
+    )
+    for n in ([10_000, 100_000] if quick else [10_000, 100_000, 1_000_000]):
+        lat = np.random.default_rng(0).random(n) + 40
+        lng = np.random.default_rng(1).random(n) - 74
+        yield measure(
+            "haversine", lambda: haversine_np(40.5, -73.5, lat, lng),
+            params={"impl": "numpy", "n": n}, items=n,
+        )
+
+
+def parse_obs_date_suite(quick: bool, workdir: Path) -> Iterator[dict]:
+    today = date.today()
+    with_time = [f"{today - timedelta(days=i % 30)} {i % 24:02d}:{i % 60:02d}" for i in range(10_000)]
+    date_only = [str(today - timedelta(days=i % 30)) for i in range(10_000)]
+    for label, values in (("datetime", with_time), ("date", date_only)):
+        yield measure(
+            "_parse_obs_date", lambda: [_parse_obs_date(v) for v in values],
+            params={"format": label}, items=len(values),
+        )
+
+
+def load_life_list_suite(quick: bool, workdir: Path) -> Iterator[dict]:
+    sizes = [1_000, 10_000] if quick else [1_000, 10_000, 100_000, 1_000_000]
+    for rows in sizes:
+        path = workdir / f"MyEBirdData-{rows}.csv"
+        if not path.exists():
+            write_life_list_csv(path, rows)
+        yield measure(
+            "load_life_list", lambda: load_life_list(path),
+            params={"rows": rows, "workers": 1}, items=rows, min_time=0.5 if rows < 1_000_000 else 0,
+        )
+        if rows >= 1_000_000:
+            yield measure(
+                "load_life_list", lambda: load_life_list(path, workers=4),
+                params={"rows": rows, "workers": 4}, items=rows, min_time=0,
+            )
+
+
+def cache_suite(quick: bool, workdir: Path) -> Iterator[dict]:
+    payload = SyntheticRegion.sized(1_000).observations()[:500]
+    backends = {
+        "file": lambda: Cache(workdir / "cache-file"),
+        "sqlite": lambda: SQLiteCache(workdir / "cache-sqlite" / "cache.sqlite3"),
+        "memory": lambda: MemoryCache(max_entries=10_000),
+        "tiered": lambda: TieredCache(MemoryCache(max_entries=10_000), Cache(workdir / "cache-tiered")),
+    }
+    for backend, make in backends.items():
+        cache = make()
+        keys = [f"/data/obs/geo/recent?lat={i}&lng=0" for i in range(200)]
+        it = iter(range(10**9))
+        yield measure(
+            "Cache.set", lambda: cache.set(keys[next(it) % len(keys)], payload),
+            params={"backend": backend, "payload_rows": len(payload)},
+        )
+        for key in keys:
+            cache.set(key, payload)
+        yield measure(
+            "Cache.get", lambda: cache.get(keys[next(it) % len(keys)]),
+            params={"backend": backend, "payload_rows": len(payload), "result": "hit"},
+        )
+        yield measure(
+            "Cache.get", lambda: cache.get(f"missing-{next(it)}"),
+            params={"backend": backend, "result": "miss"},
+        )
+
+
+def api_recommend_suite(quick: bool, workdir: Path) -> Iterator[dict]:
+    """POST /recommend through the ASGI app in-process, upstream served from a SyntheticRegion.
+
+    Imports the app from inside workdir, so the data/ directories created at
+    import land there, then swaps the app's cache, response cache and life
+    list store for ones under workdir for the duration of the suite, so the
+    real data/ (and its upstream cache) is never read or cleared.
+    """
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        from ebird_recommend.api import deps
+        from ebird_recommend.api.app import app
+        from ebird_recommend.api.response_cache import ResponseCache
+        from ebird_recommend.core.client import AsyncEBirdClient
+        from ebird_recommend.core.lifelists import LifeListStore
+        from ebird_recommend.core.singleflight import SingleFlight
+    finally:
+        os.chdir(cwd)
+
+    saved = deps.cache, deps.responses, deps.life_lists, deps.flight
+    root = Path(workdir).resolve() / "api"
+    deps.cache = TieredCache(MemoryCache(), Cache(root / "cache"))
+    deps.responses = ResponseCache(deps.cache)
+    deps.life_lists = LifeListStore(root / "lifelists")
+    deps.flight = SingleFlight()
+
+    loop = asyncio.new_event_loop()
+    http = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench")
+    try:
+        for rows in ([1_000, 10_000] if quick else [1_000, 10_000, 100_000]):
+            region = SyntheticRegion.sized(rows)
+            api_key = f"bench-{rows}"
+            with deps._clients_lock:
+                deps._clients[api_key] = AsyncEBirdClient(
+                    api_key, cache=deps.cache, flight=deps.flight, transport=region.transport(),
+                )
+            list_id, _ = deps.life_lists.put(region.life_list())
+            body = {"lat": region.config.lat, "lng": region.config.lng, "radius": 50, "days": 14, "life_list_id": list_id}
+            headers = {"X-EBird-Api-Token": api_key}
+
+            async def post(extra: dict | None = None) -> httpx.Response:
+                res = await http.post("/recommend", json=body, headers={**headers, **(extra or {})})
+                if res.status_code >= 400:
+                    raise RuntimeError(f"/recommend answered {res.status_code}: {res.text}")
+                return res
+
+            def cold():
+                deps.cache.clear()
+                deps.responses.clear()
+                loop.run_until_complete(post())
+
+            def warm():
+                deps.responses.clear()
+                loop.run_until_complete(post())
+
+            etag = loop.run_until_complete(post()).headers["etag"]
+            cases = {
+                "cold": cold,
+                "upstream_cached": warm,
+                "response_cached": lambda: loop.run_until_complete(post()),
+                "not_modified": lambda: loop.run_until_complete(post({"If-None-Match": etag})),
+            }
+            for case, fn in cases.items():
+                yield measure("api /recommend", fn, params={"rows": rows, "case": case})
+    finally:
+        loop.run_until_complete(http.aclose())
+        loop.close()
+        with deps._clients_lock:
+            for api_key in [k for k in deps._clients if k.startswith("bench-")]:
+                deps._clients.pop(api_key).close()
+        deps.cache, deps.responses, deps.life_lists, deps.flight = saved
+
+
+SUITES: dict[str, Suite] = {
+    "recommend": recommend_suite,
+    "haversine": haversine_suite,
+    "parse_obs_date": parse_obs_date_suite,
+    "load_life_list": load_life_list_suite,
+    "cache": cache_suite,
+    "api": api_recommend_suite,
+}
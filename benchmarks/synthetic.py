@@ -0,0 +1,264 @@
+"""Synthetic eBird data for benchmarks.
+
+SyntheticRegion generates hotspots, recent observations and notable
+observations around a centre point in the raw eBird JSON shape, with
+configurable density, species and hotspot counts, date skew and radius.
+Species and hotspot popularity follow a Zipf-like curve, so a few common
+birds and busy hotspots dominate as in real data. Everything is derived from
+the seed, so two runs with the same config see identical data.
+
+region.handler serves the data as an httpx.MockTransport for the /v2
+endpoints EBirdClient uses, filtering by distance and days back like
+upstream does.
+
+write_life_list_csv writes a MyEBirdData.csv export with the full column
+set of the real download.
+"""
+
+import csv
+import math
+import re
+from datetime import date, timedelta
+from pathlib import Path
+from typing import NamedTuple
+from urllib.parse import unquote
+
+import httpx
+import numpy as np
+
+from ebird_recommend.core.columns import ObsColumns
+from ebird_recommend.core.geo import _KM_PER_DEG_LAT, haversine_np
+from ebird_recommend.core.models import NotableObservation, Observation
+
+
+class SyntheticConfig(NamedTuple):
+    lat: float = 40.7
+    lng: float = -74.0
+    radius_km: float = 50.0
+    species: int = 400
+    hotspots: int = 300
+    density: float = 2.0        # observations per hotspot per day
+    days: int = 30
+    date_skew: float = 1.0      # 0 = uniform over days; higher = more recent
+    notable_fraction: float = 0.03  # share of species flagged notable
+    seed: int = 0
+
+
+def _zipf_weights(n: int, s: float = 1.1) -> np.ndarray:
+    w = 1.0 / np.arange(1, n + 1) ** s
+    return w / w.sum()
+
+
+def species_names(n: int) -> list[tuple[str, str, str]]:
+    """(species code, common name, scientific name) for n synthetic species."""
+    return [(f"sp{i:05d}", f"Synthetic Bird {i}", f"Genus{i // 8} species{i}") for i in range(n)]
+
+
+class SyntheticRegion:
+    def __init__(self, config: SyntheticConfig = SyntheticConfig(), today: date | None = None):
+        self.config = config
+        self.today = today or date.today()
+        rng = np.random.default_rng(config.seed)
+        self.species = species_names(config.species)
+
+        # Hotspots uniform by area inside the radius.
+        r = config.radius_km * np.sqrt(rng.random(config.hotspots))
+        theta = rng.random(config.hotspots) * 2 * math.pi
+        cos_lat = max(math.cos(math.radians(config.lat)), 0.01)
+        self.hotspot_lat = config.lat + r * np.sin(theta) / _KM_PER_DEG_LAT
+        self.hotspot_lng = config.lng + r * np.cos(theta) / (_KM_PER_DEG_LAT * cos_lat)
+        self._hotspots = [
+            {
+                "locId": f"L{i:06d}",
+                "locName": f"Synthetic Hotspot {i}",
+                "countryCode": "US",
+                "subnational1Code": "US-NY",
+                "lat": round(float(lat), 6),
+                "lng": round(float(lng), 6),
+                "latestObsDt": str(self.today),
+                "numSpeciesAllTime": int(50 + rng.integers(0, 300)),
+            }
+            for i, (lat, lng) in enumerate(zip(self.hotspot_lat, self.hotspot_lng))
+        ]
+
+        n = int(config.hotspots * config.density * config.days)
+        loc = rng.choice(config.hotspots, n, p=_zipf_weights(config.hotspots, 0.8))
+        sp = rng.choice(config.species, n, p=_zipf_weights(config.species))
+        days_ago = np.floor(config.days * rng.random(n) ** (1 + config.date_skew)).astype(int)
+        minutes = rng.integers(5 * 60, 19 * 60, n)
+        how_many = rng.integers(0, 12, n)
+        self.notable_species = set(
+            rng.choice(config.species, max(1, int(config.species * config.notable_fraction)), replace=False).tolist()
+        )
+
+        self.obs_lat = self.hotspot_lat[loc]
+        self.obs_lng = self.hotspot_lng[loc]
+        self.obs_days_ago = days_ago
+        self._observations = []
+        for i in range(n):
+            code, com, sci = self.species[sp[i]]
+            h = self._hotspots[loc[i]]
+            day = self.today - timedelta(days=int(days_ago[i]))
+            m = int(minutes[i])
+            self._observations.append({
+                "speciesCode": code,
+                "comName": com,
+                "sciName": sci,
+                "locId": h["locId"],
+                "locName": h["locName"],
+                "obsDt": f"{day} {m // 60:02d}:{m % 60:02d}" if i % 20 else str(day),
+                "howMany": int(how_many[i]) or None,
+                "lat": h["lat"],
+                "lng": h["lng"],
+                "obsValid": True,
+                "obsReviewed": False,
+                "locationPrivate": False,
+                # A few checklists per hotspot and day.
+                "subId": f"S{loc[i]}x{days_ago[i]}x{i % 3}",
+            })
+        self.obs_notable = np.array([int(s) in self.notable_species for s in sp], dtype=bool)
+
+    @classmethod
+    def sized(cls, rows: int, **config) -> "SyntheticRegion":
+        """A region with roughly rows observations over its days (default 30)."""
+        days = config.pop("days", SyntheticConfig().days)
+        hotspots = config.pop("hotspots", max(20, min(2_000, rows // days)))
+        return cls(SyntheticConfig(hotspots=hotspots, days=days, density=rows / (hotspots * days), **config))
+
+    # -- data ------------------------------------------------------------------
+
+    def hotspots(self) -> list[dict]:
+        return self._hotspots
+
+    def observations(self) -> list[dict]:
+        return self._observations
+
+    def notable(self) -> list[dict]:
+        return [
+            {**o, "obsReviewed": True}
+            for o, flag in zip(self._observations, self.obs_notable.tolist()) if flag
+        ]
+
+    def columns(self, notable: bool = False) -> ObsColumns:
+        return ObsColumns.from_records(self.notable() if notable else self._observations)
+
+    def models(self, notable: bool = False) -> list[Observation]:
+        if notable:
+            return [NotableObservation(**o) for o in self.notable()]
+        return [Observation(**o) for o in self._observations]
+
+    def life_list(self, fraction: float = 0.6) -> frozenset[str]:
+        """Scientific names of the commonest fraction of species, as a seen set."""
+        return frozenset(sci for _, _, sci in self.species[: int(len(self.species) * fraction)])
+
+    # -- stub upstream ---------------------------------------------------------
+
+    def _select(self, lat: float, lng: float, dist: float, back: int, notable: bool) -> list[dict]:
+        mask = (self.obs_days_ago < back) & (haversine_np(lat, lng, self.obs_lat, self.obs_lng) <= dist)
+        if notable:
+            mask &= self.obs_notable
+        rows = [self._observations[i] for i in np.flatnonzero(mask).tolist()]
+        if notable:
+            return [{**o, "obsReviewed": True} for o in rows]
+        # Like upstream, report only the latest sighting of each species.
+        latest: dict[str, dict] = {}
+        for o in rows:
+            if o["speciesCode"] not in latest or o["obsDt"] > latest[o["speciesCode"]]["obsDt"]:
+                latest[o["speciesCode"]] = o
+        return list(latest.values())
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        """httpx.MockTransport handler for the eBird /v2 endpoints."""
+        path = unquote(request.url.path)
+        q = request.url.params
+        back = int(q.get("back", 14))
+        if path.endswith("/data/obs/geo/recent") or path.endswith("/data/obs/geo/recent/notable"):
+            data = self._select(
+                float(q["lat"]), float(q["lng"]), float(q.get("dist", 25)), back,
+                notable=path.endswith("/notable"),
+            )
+        elif m := re.search(r"/data/obs/([^/]+)/recent(/notable)?$", path):
+            loc_id, notable = m.group(1), bool(m.group(2))
+            data = [
+                {**o, "obsReviewed": True} if notable else o
+                for o, flag, ago in zip(self._observations, self.obs_notable.tolist(), self.obs_days_ago.tolist())
+                if o["locId"] == loc_id and ago < back and (flag or not notable)
+            ]
+        elif path.endswith("/ref/hotspot/geo"):
+            dist = haversine_np(float(q["lat"]), float(q["lng"]), self.hotspot_lat, self.hotspot_lng)
+            data = [self._hotspots[i] for i in np.flatnonzero(dist <= float(q.get("dist", 25))).tolist()]
+        elif "/ref/hotspot/" in path:
+            data = self._hotspots
+        elif m := re.search(r"/product/lists/([^/]+)$", path):
+            subs: dict[str, dict] = {}
+            for o in self._observations:
+                if o["locId"] == m.group(1) and o["subId"] not in subs:
+                    subs[o["subId"]] = {
+                        "subId": o["subId"],
+                        "locId": o["locId"],
+                        "loc": {"name": o["locName"]},
+                        "isoObsDate": o["obsDt"] if len(o["obsDt"]) > 10 else f"{o['obsDt']} 07:00",
+                        "numSpecies": 1 + len(o["subId"]) % 40,
+                    }
+            data = sorted(subs.values(), key=lambda c: c["isoObsDate"], reverse=True)
+            data = data[: int(q.get("maxResults", 10))]
+        else:
+            return httpx.Response(404, json={"errors": [{"title": "Not Found"}]})
+        return httpx.Response(200, json=data)
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handler)
+
+
+# ---------------------------------------------------------------------------
+# Life list export
+# ---------------------------------------------------------------------------
+
+_EXPORT_HEADER = [
+    "Submission ID", "Common Name", "Scientific Name", "Taxonomic Order", "Count",
+    "State/Province", "County", "Location ID", "Location", "Latitude", "Longitude",
+    "Date", "Time", "Protocol", "Duration (Min)", "All Obs Reported",
+    "Distance Traveled (km)", "Area Covered (ha)", "Number of Observers",
+    "Breeding Code", "Observation Details", "Checklist Comments", "ML Catalog Numbers",
+]
+
+
+def write_life_list_csv(
+    path: str | Path,
+    rows: int,
+    *,
+    species: int = 2_000,
+    date_format: str = "%Y-%m-%d",
+    seed: int = 0,
+) -> Path:
+    """Write a MyEBirdData.csv-style export with rows observation rows.
+
+    Rows draw from species synthetic species (Zipf-weighted, like a real
+    observer's list) over the last 20 years; some carry quoted comments
+    with commas and embedded newlines.
+    """
+    path = Path(path)
+    rng = np.random.default_rng(seed)
+    names = species_names(species)
+    start = date.today() - timedelta(days=20 * 365)
+    with path.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(_EXPORT_HEADER)
+        batch = 100_000
+        for offset in range(0, rows, batch):
+            n = min(batch, rows - offset)
+            sp = rng.choice(species, n, p=_zipf_weights(species, 0.9))
+            day = rng.integers(0, 20 * 365, n)
+            loc = rng.integers(0, 5_000, n)
+            count = rng.integers(1, 30, n)
+            for i in range(n):
+                _, com, sci = names[sp[i]]
+                row_id = offset + i
+                comment = "" if row_id % 50 else "Seen at dawn, calling; flock of\nmixed species"
+                writer.writerow([
+                    f"S{row_id // 20}", com, sci, int(sp[i]), int(count[i]) if row_id % 9 else "X",
+                    "US-NY", "Kings", f"L{loc[i]}", f"Synthetic Location {loc[i]}",
+                    "40.6", "-73.9", (start + timedelta(days=int(day[i]))).strftime(date_format),
+                    "07:15 AM", "eBird - Traveling Count", 60, 1, 2.1, "", 1, "", comment, "", "",
+                ])
+    return path
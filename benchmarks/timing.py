@@ -0,0 +1,59 @@
+"""Timing and result records shared by the benchmark suites."""
+
+import gc
+import statistics
+import time
+from typing import Callable
+
+
+def measure(
+    name: str,
+    fn: Callable[[], object],
+    *,
+    params: dict | None = None,
+    items: int | None = None,
+    min_time: float = 0.3,
+    min_runs: int = 3,
+    max_runs: int = 1_000,
+) -> dict:
+    """Time fn after one warm-up call; runs until min_time has passed (at least min_runs).
+
+    items is the number of elements one call processes, used to report
+    per-item cost and throughput. GC is disabled while timing.
+    """
+    fn()
+    times: list[float] = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        total = 0.0
+        while len(times) < min_runs or (total < min_time and len(times) < max_runs):
+            start = time.perf_counter()
+            fn()
+            elapsed = time.perf_counter() - start
+            times.append(elapsed)
+            total += elapsed
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    result = {
+        "name": name,
+        "params": params or {},
+        "runs": len(times),
+        "mean_ms": statistics.fmean(times) * 1000,
+        "median_ms": statistics.median(times) * 1000,
+        "min_ms": min(times) * 1000,
+        "stdev_ms": statistics.stdev(times) * 1000 if len(times) > 1 else 0.0,
+    }
+    if items:
+        result["items"] = items
+        result["per_item_us"] = result["median_ms"] * 1000 / items
+        result["items_per_s"] = items / (result["median_ms"] / 1000)
+    return result
+
+
+def result_key(result: dict) -> str:
+    """Identity of a result across runs: its name plus sorted params."""
+    params = ",".join(f"{k}={v}" for k, v in sorted(result["params"].items()))
+    return f"{result['name']}[{params}]"
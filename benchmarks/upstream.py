@@ -0,0 +1,87 @@
+"""Local stand-in for the eBird /v2 API, for offline profiling and load tests.
+
+Serves the endpoints EBirdClient uses from recorded cassettes
+(EBIRD_CASSETTE_MODE=record, see ebird_recommend/core/cassettes.py) or from
+a SyntheticRegion, with optional injected latency and errors:
+
+    python -m benchmarks.upstream --synthetic --rows 20000 --latency-ms 80 --jitter-ms 40
+    python -m benchmarks.upstream --cassettes data/cassettes --error-rate 0.01
+
+then point the API at it:
+
+    EBIRD_BASE_URL=http://127.0.0.1:8001/v2 python serve.py
+
+Data and injected faults are seeded, so runs are repeatable.
+"""
+
+import argparse
+import asyncio
+from typing import Callable
+
+import httpx
+from fastapi import FastAPI, Request, Response
+
+from ebird_recommend.core.cassettes import CassetteStore, Faults, ReplayTransport
+
+from .synthetic import SyntheticRegion
+
+Handler = Callable[[httpx.Request], httpx.Response]
+
+
+def create_app(handler: Handler, faults: Faults | None = None) -> FastAPI:
+    """ASGI app answering GET /v2/... through handler, after any injected delay or error."""
+    faults = faults or Faults()
+    app = FastAPI(title="eBird API stand-in", docs_url=None, redoc_url=None, openapi_url=None)
+    app.state.requests = 0
+
+    @app.get("/v2/{path:path}")
+    async def upstream(path: str, request: Request):
+        app.state.requests += 1
+        delay, fail = faults.draw()
+        if delay:
+            await asyncio.sleep(delay)
+        if fail:
+            res = faults.error()
+        else:
+            # Building and encoding large synthetic payloads is CPU-bound; keep
+            # the event loop free so concurrent requests overlap as upstream's would.
+            res = await asyncio.to_thread(handler, httpx.Request("GET", str(request.url)))
+        return Response(res.content, status_code=res.status_code, media_type=res.headers.get("content-type"))
+
+    @app.get("/_stats")
+    async def stats():
+        return {"requests": app.state.requests}
+
+    return app
+
+
+def main(argv: list[str] | None = None) -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.upstream", description=__doc__.splitlines()[0])
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--synthetic", action="store_true", help="Serve a SyntheticRegion")
+    source.add_argument("--cassettes", help="Serve responses recorded in this directory")
+    parser.add_argument("--rows", type=int, default=20_000, help="Synthetic observations (30 days)")
+    parser.add_argument("--lat", type=float, default=40.7)
+    parser.add_argument("--lng", type=float, default=-74.0)
+    parser.add_argument("--radius", type=float, default=100.0, help="Synthetic region radius in km")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    args = parser.parse_args(argv)
+
+    if args.synthetic:
+        region = SyntheticRegion.sized(args.rows, lat=args.lat, lng=args.lng, radius_km=args.radius, seed=args.seed)
+        handler = region.handler
+    else:
+        handler = ReplayTransport(CassetteStore(args.cassettes)).handle_request
+    faults = Faults(args.latency_ms, args.jitter_ms, args.error_rate, seed=args.seed)
+    uvicorn.run(create_app(handler, faults), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
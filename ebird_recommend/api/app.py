@@ -4,20 +4,43 @@ All routes call the same core/ functions used by the CLI.
 Attribution: Data provided by eBird (https://ebird.org), Cornell Lab of Ornithology.
 """
 
+import asyncio
+import csv
 import os
-from typing import Annotated
+from contextlib import asynccontextmanager
+from typing import Annotated, Awaitable, Callable, Literal
 
-from fastapi import Depends, FastAPI, HTTPException, Query
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 
-from ebird_recommend.core.models import Hotspot, HotspotDetailResponse, NotableObservation, RecommendRequest, Recommendation
-from ebird_recommend.core.recommender import recommend
-from .deps import api_key_dep, get_client
+from ebird_recommend.core import fastjson, metrics
+from ebird_recommend.core.client import ReadLog, track_reads
+from ebird_recommend.core.lifelists import life_list_id
+from ebird_recommend.core.models import (
+    BatchRecommendation, BatchRecommendRequest, Checklist, Hotspot, HotspotDetailResponse, LifeListRef,
+    NotableObservation, RecommendRequest, Recommendation, SeenSpecies,
+)
+from ebird_recommend.core.recommender import recommend, recommend_batch
+from ebird_recommend.core.timing import phase
+from ebird_recommend.core.user_data import LifeListParser
+from . import deps
+from .compression import MIN_SIZE, CompressionMiddleware, compress, negotiate
+from .deps import api_key_dep, close_clients, lease_client
+from .metrics import MetricsMiddleware
+from .timing import TimingMiddleware
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    close_clients()
+
 
 app = FastAPI(
     title="eBird Recommender API",
     description="Recommends birding hotspots and target species based on your eBird life list.",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 _raw_origins = os.getenv("ALLOWED_ORIGINS", "*")
@@ -26,10 +49,108 @@ _origins = [o.strip() for o in _raw_origins.split(",")]
 app.add_middleware(
     CORSMiddleware,
     allow_origins=_origins,
-    allow_methods=["GET", "POST"],
+    allow_methods=["GET", "POST", "PUT"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Cache", "Server-Timing", "X-Profile"],
+)
+
+# gzip/brotli for JSON bodies of MIN_SIZE bytes or more, by Accept-Encoding.
+_COMPRESS = os.getenv("EBIRD_COMPRESS", "").lower() in ("1", "true", "yes")
+if _COMPRESS:
+    app.add_middleware(CompressionMiddleware)
+
+# Server-Timing on every response; optional per-request log lines and profiles.
+app.add_middleware(
+    TimingMiddleware,
+    log_requests=os.getenv("EBIRD_TIMING_LOG", "").lower() in ("1", "true", "yes"),
+    profile_all=os.getenv("EBIRD_PROFILE", "").lower() in ("1", "true", "yes"),
+    profile_key=os.getenv("EBIRD_PROFILE_KEY") or None,
 )
 
+# Outermost, so latency includes compression and CORS.
+app.add_middleware(MetricsMiddleware)
+
+# Response cache keys round coordinates to this many decimals (~100 m);
+# responses are computed from the exact ones.
+_COORD_DECIMALS = 3
+
+
+def _coord_key(lat: float, lng: float) -> tuple[float, float]:
+    return round(lat, _COORD_DECIMALS), round(lng, _COORD_DECIMALS)
+
+_RECOMMENDATION_FIELDS = list(Recommendation.model_fields)
+_CHECKLIST_FIELDS = list(Checklist.model_fields)
+_HOTSPOT_FIELDS = [f.alias or name for name, f in Hotspot.model_fields.items()]
+
+
+Format = Annotated[
+    Literal["rows", "columns"],
+    Query(description='"columns" returns each list as {field: [values]} instead of a list of objects'),
+]
+
+
+def _json(content, headers: dict[str, str] | None = None) -> Response:
+    """Serialize an already API-shaped payload, bypassing response_model validation."""
+    return Response(fastjson.dumps(content), media_type="application/json", headers=headers)
+
+
+def _upstream_status(reads: ReadLog) -> str:
+    """X-Cache value for a computed response: MISS if it had to call eBird."""
+    return "MISS" if reads.fetched else "UPSTREAM-HIT"
+
+
+def _rows(models: list) -> list[dict]:
+    """Field dicts of flat, alias-free models the server built itself.
+
+    Skips pydantic's serializer: these were validated on construction and
+    hold only JSON-native values.
+    """
+    return [vars(m) for m in models]
+
+
+def _columns(rows: list[dict], fields) -> dict[str, list]:
+    return {f: [r[f] for r in rows] for f in fields}
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+
+async def _cached(request: Request, key: tuple, compute: Callable[[], Awaitable[bytes]]) -> Response:
+    """Serve key from the response cache, computing and storing the body on a miss.
+
+    Answers 304 when If-None-Match carries the current ETag.
+    """
+    with phase("cache"):
+        entry = deps.responses.get(key)
+    if entry is None:
+        with track_reads() as reads:
+            body = await compute()
+        entry = deps.responses.put(key, body, reads)
+        headers = {"X-Cache": _upstream_status(reads)}
+    else:
+        headers = {"X-Cache": "HIT"}
+    etag, body = entry.etag, entry.body
+    if _COMPRESS:
+        headers["Vary"] = "Accept-Encoding"
+        encoding = negotiate(request.headers.get("accept-encoding")) if len(body) >= MIN_SIZE else None
+        if encoding is not None:
+            # Compress each cached body once per encoding; the variant gets its own ETag.
+            body = entry.encoded.get(encoding)
+            if body is None:
+                with phase("compress"):
+                    body = entry.encoded.setdefault(encoding, compress(entry.body, encoding))
+            etag = f'{etag[:-1]}-{encoding}"'
+            headers["Content-Encoding"] = encoding
+    headers["ETag"] = etag
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
+
+
 # ---------------------------------------------------------------------------
 # Routes
 # ---------------------------------------------------------------------------
@@ -39,79 +160,227 @@ def healthz():
     return {"status": "ok"}
 
 
+@app.get("/stats")
+def stats():
+    """Upstream fetch and cache counters for this worker."""
+    return {
+        "singleflight": deps.flight.stats(),
+        "cache": deps.cache.stats(),
+        "responses": deps.responses.stats(),
+    }
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics_route():
+    """Prometheus text exposition of this worker's metrics."""
+    return Response(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 @app.get("/hotspots", response_model=list[Hotspot])
-def hotspots(
+async def hotspots(
+    request: Request,
     lat: Annotated[float, Query(description="Latitude")],
     lng: Annotated[float, Query(description="Longitude")],
     radius: Annotated[int, Query(ge=1, le=500, description="Search radius in km")] = 50,
+    format: Format = "rows",
     api_key: Annotated[str, Depends(api_key_dep)] = ...,
 ):
     """Return eBird hotspots within radius km of the given coordinates."""
-    try:
-        return get_client(api_key).nearby_hotspots(lat, lng, radius)
-    except Exception as e:
-        raise HTTPException(status_code=502, detail=str(e))
+    async def compute() -> bytes:
+        try:
+            with lease_client(api_key) as client:
+                spots = await client.nearby_hotspots(lat, lng, radius)
+        except Exception as e:
+            raise HTTPException(status_code=502, detail=str(e))
+        rows = [h.model_dump(by_alias=True) for h in spots]
+        if format == "columns":
+            return fastjson.dumps(_columns(rows, _HOTSPOT_FIELDS))
+        return fastjson.dumps(rows)
+
+    return await _cached(request, ("hotspots", *_coord_key(lat, lng), radius, format), compute)
 
 
 @app.get("/notable", response_model=list[NotableObservation])
-def notable(
+async def notable(
+    request: Request,
     lat: Annotated[float, Query(description="Latitude")],
     lng: Annotated[float, Query(description="Longitude")],
     radius: Annotated[int, Query(ge=1, le=500, description="Search radius in km")] = 50,
     days: Annotated[int, Query(ge=1, le=30, description="Days back to search")] = 14,
+    format: Format = "rows",
     api_key: Annotated[str, Depends(api_key_dep)] = ...,
 ):
     """Return recent notable (rare/flagged) observations near the given coordinates."""
+    async def compute() -> bytes:
+        try:
+            with lease_client(api_key) as client:
+                obs = await client.nearby_notable_obs(lat, lng, radius, days, lean=True)
+        except Exception as e:
+            raise HTTPException(status_code=502, detail=str(e))
+        return fastjson.dumps(obs.to_api_columns() if format == "columns" else obs.to_api())
+
+    return await _cached(request, ("notable", *_coord_key(lat, lng), radius, days, format), compute)
+
+
+@app.put("/lifelist", response_model=LifeListRef)
+def upload_life_list(life_list: list[SeenSpecies]):
+    """Store a life list and return its id for use as life_list_id on /recommend."""
+    list_id, seen = deps.life_lists.put(s.scientific_name for s in life_list)
+    return LifeListRef(life_list_id=list_id, species=len(seen))
+
+
+def _with_hotspot_info(client, recs: list[Recommendation]) -> list[Recommendation]:
+    """Fill in hotspot metadata from the local catalog, if one is loaded."""
+    index = deps.hotspots.index(client.sync) if deps.hotspots is not None else None
+    if index is not None:
+        for r in recs:
+            h = index.get(r.loc_id)
+            if h is not None:
+                r.num_species_all_time = h.num_species_all_time
+    return recs
+
+
+def _life_list(body: RecommendRequest | BatchRecommendRequest) -> frozenset[str]:
+    """Scientific names of the request's life list, inline or by life_list_id."""
+    if body.life_list_id is None:
+        return frozenset(s.scientific_name for s in body.life_list)
+    seen = deps.life_lists.get(body.life_list_id)
+    if seen is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Unknown life_list_id. Upload the life list again with PUT /lifelist.",
+        )
+    return seen
+
+
+@app.put("/lifelist/csv", response_model=LifeListRef)
+async def upload_life_list_csv(request: Request):
+    """Store a life list streamed as a raw MyEBirdData.csv body.
+
+    The body is parsed chunk by chunk as it arrives, so only one row per
+    species is ever held in memory, never the file itself.
+    """
+    parser = LifeListParser()
     try:
-        return get_client(api_key).nearby_notable_obs(lat, lng, radius, days)
-    except Exception as e:
-        raise HTTPException(status_code=502, detail=str(e))
+        async for chunk in request.stream():
+            if chunk:
+                await asyncio.to_thread(parser.feed, chunk)
+        seen = await asyncio.to_thread(parser.close)
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=422, detail="Life list CSV must be UTF-8.")
+    except (csv.Error, ValueError) as exc:
+        raise HTTPException(status_code=400, detail=f"Malformed life list CSV: {exc}")
+    if not seen:
+        raise HTTPException(status_code=422, detail='No rows with a "Scientific Name" found in the CSV.')
+
+    list_id, names = deps.life_lists.put(seen)
+    return LifeListRef(life_list_id=list_id, species=len(names))
 
 
 @app.post("/recommend", response_model=list[Recommendation])
-def recommend_route(
+async def recommend_route(
+    request: Request,
     body: RecommendRequest,
+    format: Format = "rows",
     api_key: Annotated[str, Depends(api_key_dep)] = ...,
 ):
     """Return ranked bird/hotspot recommendations based on the submitted life list."""
-    seen = {s.scientific_name: s for s in body.life_list}
+    lat, lng = body.lat, body.lng
+    # life_list_id is a content hash, so an inline list keys the same as its upload.
+    if body.life_list_id is not None:
+        list_key = body.life_list_id
+    else:
+        list_key = life_list_id(s.scientific_name for s in body.life_list)
+    key = ("recommend", *_coord_key(lat, lng), body.radius, body.days, body.top, body.lifer, body.notable, list_key, format)
 
-    try:
-        client = get_client(api_key)
-        all_obs     = client.nearby_recent_obs(body.lat, body.lng, body.radius, body.days)
-        notable_obs = client.nearby_notable_obs(body.lat, body.lng, body.radius, body.days)
-    except Exception as e:
-        raise HTTPException(status_code=502, detail=str(e))
+    async def compute() -> bytes:
+        with phase("lifelist"):
+            seen = _life_list(body)
+        with lease_client(api_key) as client:
+            try:
+                with phase("upstream"):
+                    all_obs, notable_obs = await asyncio.gather(
+                        client.nearby_recent_obs(lat, lng, body.radius, body.days, lean=True),
+                        client.nearby_notable_obs(lat, lng, body.radius, body.days, lean=True),
+                    )
+            except Exception as e:
+                raise HTTPException(status_code=502, detail=str(e))
 
-    recs = recommend(body.lat, body.lng, seen, all_obs, notable_obs, max_dist_km=body.radius)
+            # Scoring is CPU-bound; keep it off the event loop.
+            recs = await asyncio.to_thread(
+                recommend, lat, lng, seen, all_obs, notable_obs,
+                max_dist_km=body.radius, lifer=body.lifer, notable=body.notable, top=body.top,
+            )
+            with phase("hotspot_info"):
+                recs = _with_hotspot_info(client, recs)
+            with phase("serialize"):
+                rows = _rows(recs)
+                return fastjson.dumps(_columns(rows, _RECOMMENDATION_FIELDS) if format == "columns" else rows)
 
-    if body.lifer == "yes":
-        recs = [r for r in recs if r.is_lifer]
-    elif body.lifer == "no":
-        recs = [r for r in recs if not r.is_lifer]
+    return await _cached(request, key, compute)
 
-    if body.notable == "yes":
-        recs = [r for r in recs if r.is_notable]
-    elif body.notable == "no":
-        recs = [r for r in recs if not r.is_notable]
 
-    return recs[:body.top]
+@app.post("/recommend/batch", response_model=list[BatchRecommendation])
+async def recommend_batch_route(
+    body: BatchRecommendRequest,
+    format: Format = "rows",
+    api_key: Annotated[str, Depends(api_key_dep)] = ...,
+):
+    """Return recommendations for each of several origins, sharing one set of upstream fetches."""
+    seen = _life_list(body)
+    circles = [(o.lat, o.lng, o.radius) for o in body.origins]
+    with lease_client(api_key) as client:
+        try:
+            all_obs, notable_obs = await asyncio.gather(
+                client.nearby_recent_obs_many(circles, body.days, lean=True),
+                client.nearby_notable_obs_many(circles, body.days, lean=True),
+            )
+        except Exception as e:
+            raise HTTPException(status_code=502, detail=str(e))
+
+        results = await asyncio.to_thread(
+            recommend_batch, circles, seen, all_obs, notable_obs,
+            lifer=body.lifer, notable=body.notable, top=body.top,
+        )
+        batch = []
+        for origin, recs in zip(body.origins, results):
+            rows = _rows(_with_hotspot_info(client, recs))
+            batch.append({
+                "origin": origin.model_dump(),
+                "recommendations": _columns(rows, _RECOMMENDATION_FIELDS) if format == "columns" else rows,
+            })
+        return _json(batch)
 
 
 @app.get("/hotspot/{loc_id}", response_model=HotspotDetailResponse)
-def hotspot_detail(
+async def hotspot_detail(
     loc_id: str,
     days: Annotated[int, Query(ge=1, le=30, description="Days back to search")] = 14,
     limit: Annotated[int, Query(ge=1, le=200, description="Max checklists to return")] = 10,
+    format: Format = "rows",
     api_key: Annotated[str, Depends(api_key_dep)] = ...,
 ):
     """Return notable obs, all recent obs, and recent checklists for a specific hotspot."""
     try:
-        client = get_client(api_key)
-        notable  = client.notable_obs_at_location(loc_id, days)
-        recent   = client.recent_obs_at_location(loc_id, days)
-        checklists = client.checklists_at_location(loc_id, limit)
+        with lease_client(api_key) as client, track_reads() as reads, phase("upstream"):
+            notable, recent, checklists = await asyncio.gather(
+                client.notable_obs_at_location(loc_id, days, lean=True),
+                client.recent_obs_at_location(loc_id, days, lean=True),
+                client.checklists_at_location(loc_id, limit),
+            )
     except Exception as e:
         raise HTTPException(status_code=502, detail=str(e))
 
-    return HotspotDetailResponse(notable=notable, recent=recent, checklists=checklists)
+    headers = {"X-Cache": _upstream_status(reads)}
+    with phase("serialize"):
+        if format == "columns":
+            return _json({
+                "notable": notable.to_api_columns(),
+                "recent": recent.to_api_columns(),
+                "checklists": _columns(_rows(checklists), _CHECKLIST_FIELDS),
+            }, headers)
+        return _json({
+            "notable": notable.to_api(),
+            "recent": recent.to_api(),
+            "checklists": _rows(checklists),
+        }, headers)
@@ -0,0 +1,117 @@
+"""Content-Encoding negotiation for large JSON responses.
+
+gzip is always available; brotli is preferred when the optional "brotli"
+package is installed (pip install ebird-recommend[fast]) and the client
+accepts it. Bodies under MIN_SIZE are sent as they are, since compressing
+them costs more than it saves.
+"""
+
+import gzip
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+MIN_SIZE = 1024
+
+# Favour speed: levels beyond these shrink JSON only marginally.
+_GZIP_LEVEL = 5
+_BROTLI_QUALITY = 4
+
+
+def negotiate(accept_encoding: str | None) -> str | None:
+    """The encoding to use for a request's Accept-Encoding header, or None."""
+    if not accept_encoding:
+        return None
+    accepted: dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding.strip()] = q
+    wildcard = accepted.get("*", 0.0)
+    candidates = (["br"] if brotli is not None else []) + ["gzip"]
+    best = max(candidates, key=lambda c: accepted.get(c, wildcard))
+    return best if accepted.get(best, wildcard) > 0 else None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=_BROTLI_QUALITY)
+    # mtime=0 keeps the output, and so any cached copy, deterministic.
+    return gzip.compress(body, compresslevel=_GZIP_LEVEL, mtime=0)
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing complete JSON bodies of MIN_SIZE or more.
+
+    Responses that already carry a Content-Encoding (e.g. from the response
+    cache, which compresses each body once) and streamed responses are passed
+    through unchanged.
+    """
+
+    def __init__(self, app, min_size: int = MIN_SIZE):
+        self.app = app
+        self.min_size = min_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept = None
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept = value.decode("latin-1")
+                break
+        encoding = negotiate(accept)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+
+        async def wrapped(message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body" or start is None:
+                # Later chunks of a streamed response, already passed through.
+                await send(message)
+                return
+
+            headers = [(k, v) for k, v in start["headers"]]
+            names = {k.lower() for k, _ in headers}
+            body = message.get("body", b"")
+            content_type = next((v for k, v in headers if k.lower() == b"content-type"), b"")
+            compressible = (
+                b"content-encoding" not in names
+                and not message.get("more_body", False)
+                and content_type.startswith(b"application/json")
+                and len(body) >= self.min_size
+            )
+            if compressible:
+                body = compress(body, encoding)
+                headers = [(k, v) for k, v in headers if k.lower() != b"content-length"]
+                headers += [
+                    (b"content-encoding", encoding.encode()),
+                    (b"content-length", str(len(body)).encode()),
+                ]
+                message = {**message, "body": body}
+            if content_type.startswith(b"application/json"):
+                vary = [v for k, v in headers if k.lower() == b"vary"]
+                if not any(b"accept-encoding" in v.lower() for v in vary):
+                    headers = [(k, v) for k, v in headers if k.lower() != b"vary"]
+                    headers.append((b"vary", b", ".join(vary + [b"Accept-Encoding"])))
+            await send({**start, "headers": headers})
+            start = None
+            await send(message)
+
+        await self.app(scope, receive, wrapped)
@@ -1,27 +1,182 @@
 """Shared FastAPI dependencies."""
 
 import os
-from functools import lru_cache
+import threading
+from collections import Counter, OrderedDict
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Annotated
 
 from dotenv import load_dotenv
 from fastapi import Header, HTTPException
 
-from ebird_recommend.core.cache import Cache
-from ebird_recommend.core.client import EBirdClient
+from ebird_recommend.core import metrics
+from ebird_recommend.core.cache import MemoryCache, TieredCache, open_cache
+from ebird_recommend.core.cassettes import Faults, open_transport
+from ebird_recommend.core.client import BASE_URL, AsyncEBirdClient
+from ebird_recommend.core.history import HistoryStore
+from ebird_recommend.core.hotspots import HotspotCatalog
+from ebird_recommend.core.lifelists import LifeListStore
+from ebird_recommend.core.singleflight import SingleFlight
+from .response_cache import ResponseCache
 
 load_dotenv()
 
 _CACHE_DIR = Path("data/.cache")
 _CACHE_TTL = 4.0
+# Stale-while-revalidate: entries older than _CACHE_TTL are served while a
+# background refresh runs; only entries past the hard TTL block on upstream.
+_CACHE_HARD_TTL = float(os.getenv("EBIRD_CACHE_HARD_TTL_HOURS", "24"))
+_CACHE_BACKEND = os.getenv("EBIRD_CACHE_BACKEND", "file")
+_CACHE_MAX_MB = os.getenv("EBIRD_CACHE_MAX_MB")
+_MEMORY_CACHE_ENTRIES = int(os.getenv("EBIRD_MEMORY_CACHE_ENTRIES", "1024"))
+_MEMORY_CACHE_MB = os.getenv("EBIRD_MEMORY_CACHE_MB")
 
+_LIFE_LIST_DIR = Path("data/lifelists")
+_LIFE_LIST_MEMORY = int(os.getenv("EBIRD_LIFE_LIST_MEMORY", "256"))
 
-@lru_cache(maxsize=32)
-def get_client(api_key: str) -> EBirdClient:
-    """Return a cached EBirdClient for the given API key."""
-    cache = Cache(_CACHE_DIR, ttl_hours=_CACHE_TTL)
-    return EBirdClient(api_key, cache=cache)
+# Archive every fetched observation (see HistoryStore).
+_HISTORY_DIR = Path("data/history")
+_HISTORY = os.getenv("EBIRD_HISTORY", "").lower() in ("1", "true", "yes")
+_HISTORY_RETENTION_DAYS = os.getenv("EBIRD_HISTORY_RETENTION_DAYS")
+
+# Comma-separated eBird region codes to keep in the local hotspot catalog.
+_HOTSPOT_DIR = Path("data/hotspots")
+_HOTSPOT_REGIONS = [r.strip() for r in os.getenv("EBIRD_HOTSPOT_REGIONS", "").split(",") if r.strip()]
+_HOTSPOT_TTL_HOURS = float(os.getenv("EBIRD_HOTSPOT_TTL_HOURS", "168"))
+
+_MAX_CLIENTS = 32
+_POOL_SIZE = int(os.getenv("EBIRD_POOL_SIZE", "10"))
+_HTTP2 = os.getenv("EBIRD_HTTP2", "").lower() in ("1", "true", "yes")
+# Answer nearby geo queries from a shared grid-snapped superset (see EBirdClient).
+_GEO_REUSE = os.getenv("EBIRD_GEO_REUSE", "").lower() in ("1", "true", "yes")
+# Cache observation windows as per-day partitions and refresh only the newest days.
+_PARTITIONED_OBS = os.getenv("EBIRD_PARTITIONED_OBS", "").lower() in ("1", "true", "yes")
+# Concurrent upstream tile fetches per client for radii beyond eBird's 50 km cap.
+_TILE_CONCURRENCY = int(os.getenv("EBIRD_TILE_CONCURRENCY", "4"))
+# Wider queries than this many tiles fall back to one 50 km query at the centre.
+_MAX_TILES = int(os.getenv("EBIRD_MAX_TILES", "36"))
+# Cross-worker coalescing via lock files; only useful with several uvicorn workers.
+_SINGLEFLIGHT_LOCKS = os.getenv("EBIRD_SINGLEFLIGHT_LOCKS", "").lower() in ("1", "true", "yes")
+# Point at another eBird-compatible server, e.g. python -m benchmarks.upstream.
+_BASE_URL = os.getenv("EBIRD_BASE_URL", BASE_URL)
+# "record" saves every upstream response under the cassette directory; "replay"
+# serves them back offline, with optional injected latency (ms) and error rate.
+_CASSETTE_MODE = os.getenv("EBIRD_CASSETTE_MODE", "")
+_CASSETTE_DIR = Path(os.getenv("EBIRD_CASSETTE_DIR", "data/cassettes"))
+_faults = Faults.from_env()
+# Finished /recommend, /notable and /hotspots bodies kept per worker (0 disables).
+_RESPONSE_CACHE_ENTRIES = int(os.getenv("EBIRD_RESPONSE_CACHE_ENTRIES", "512"))
+
+# Shared by all clients: the cache key does not include the API key.
+flight = SingleFlight(_CACHE_DIR / "locks" if _SINGLEFLIGHT_LOCKS else None)
+cache = TieredCache(
+    MemoryCache(
+        max_entries=_MEMORY_CACHE_ENTRIES,
+        max_bytes=int(float(_MEMORY_CACHE_MB) * 1024 * 1024) if _MEMORY_CACHE_MB else None,
+        ttl_hours=_CACHE_HARD_TTL,
+    ),
+    open_cache(
+        _CACHE_BACKEND,
+        _CACHE_DIR,
+        ttl_hours=_CACHE_HARD_TTL,
+        max_bytes=int(float(_CACHE_MAX_MB) * 1024 * 1024) if _CACHE_MAX_MB else None,
+    ),
+)
+
+history = HistoryStore(
+    _HISTORY_DIR,
+    retention_days=int(_HISTORY_RETENTION_DAYS) if _HISTORY_RETENTION_DAYS else None,
+) if _HISTORY else None
+
+hotspots = HotspotCatalog(
+    _HOTSPOT_DIR, _HOTSPOT_REGIONS, ttl_hours=_HOTSPOT_TTL_HOURS,
+) if _HOTSPOT_REGIONS else None
+
+responses = ResponseCache(cache, ttl_hours=_CACHE_TTL, max_entries=_RESPONSE_CACHE_ENTRIES)
+
+life_lists = LifeListStore(_LIFE_LIST_DIR, max_entries=_LIFE_LIST_MEMORY)
+
+_clients: OrderedDict[str, AsyncEBirdClient] = OrderedDict()
+_clients_lock = threading.RLock()  # lease_client calls get_client under it
+# Requests currently using each client; an evicted client in use is closed by
+# its last lease instead of at eviction.
+_leases: Counter[AsyncEBirdClient] = Counter()
+_evicted: set[AsyncEBirdClient] = set()
+
+metrics.Gauge("ebird_clients_cached", "API-key clients held in the get_client LRU.").set_function(
+    lambda: len(_clients)
+)
+metrics.Gauge("ebird_clients_max", "Capacity of the get_client LRU.").set(_MAX_CLIENTS)
+
+
+def get_client(api_key: str) -> AsyncEBirdClient:
+    """Return a cached AsyncEBirdClient for the given API key.
+
+    Clients are kept in a small LRU so each key reuses its connection pool.
+    An evicted client is closed at once, or, if a request holds it through
+    lease_client, when that request finishes.
+    """
+    with _clients_lock:
+        client = _clients.get(api_key)
+        if client is not None:
+            _clients.move_to_end(api_key)
+            return client
+        client = AsyncEBirdClient(
+            api_key,
+            cache=cache,
+            pool_size=_POOL_SIZE,
+            http2=_HTTP2,
+            flight=flight,
+            stale_after_hours=_CACHE_TTL,
+            geo_reuse=_GEO_REUSE,
+            tile_concurrency=_TILE_CONCURRENCY,
+            max_tiles=_MAX_TILES,
+            partitioned=_PARTITIONED_OBS,
+            history=history,
+            hotspots=hotspots,
+            transport=open_transport(
+                _CASSETTE_MODE, _CASSETTE_DIR, faults=_faults, pool_size=_POOL_SIZE, http2=_HTTP2,
+            ) if _CASSETTE_MODE else None,
+            base_url=_BASE_URL,
+        )
+        _clients[api_key] = client
+        if len(_clients) > _MAX_CLIENTS:
+            _, evicted = _clients.popitem(last=False)
+            if _leases[evicted]:
+                _evicted.add(evicted)
+            else:
+                evicted.close()
+        return client
+
+
+@contextmanager
+def lease_client(api_key: str) -> Iterator[AsyncEBirdClient]:
+    """get_client, kept open for the duration of the with block even if evicted."""
+    with _clients_lock:
+        client = get_client(api_key)
+        _leases[client] += 1
+    try:
+        yield client
+    finally:
+        with _clients_lock:
+            _leases[client] -= 1
+            if not _leases[client]:
+                del _leases[client]
+                if client in _evicted:
+                    _evicted.discard(client)
+                    client.close()
+
+
+def close_clients() -> None:
+    """Close every cached client's connection pool (called on shutdown)."""
+    with _clients_lock:
+        while _clients:
+            _, client = _clients.popitem()
+            client.close()
+        while _evicted:
+            _evicted.pop().close()
 
 
 def api_key_dep(
@@ -0,0 +1,52 @@
+"""Request metrics for the API, exposed with everything else at /metrics.
+
+MetricsMiddleware records in-flight requests, latency per route and method,
+and request counts by status. Routes are labelled by their path template
+(/hotspot/{loc_id}, not the concrete URL) so label cardinality stays fixed;
+requests that match no route share the "unmatched" label.
+"""
+
+import time
+
+from ebird_recommend.core import metrics
+
+_IN_FLIGHT = metrics.Gauge("ebird_http_requests_in_flight", "HTTP requests currently being served.")
+_SECONDS = metrics.Histogram(
+    "ebird_http_request_seconds", "HTTP request latency by route template and method.", ("method", "route")
+)
+_REQUESTS = metrics.Counter(
+    "ebird_http_requests_total", "HTTP requests by route template, method and status.", ("method", "route", "status")
+)
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware, so streaming and compression are unaffected."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_flight = _IN_FLIGHT.labels()
+        in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_flight.dec()
+            # The router stores the matched route in the (shared) scope.
+            route = getattr(scope.get("route"), "path", "unmatched")
+            method = scope["method"]
+            _SECONDS.labels(method, route).observe(time.perf_counter() - start)
+            _REQUESTS.labels(method, route, str(status)).inc()
@@ -0,0 +1,114 @@
+"""Cache of finished API responses, validated against the upstream cache.
+
+Each entry holds the serialized body of a route for one normalized request
+together with the upstream cache entries it was computed from (key and
+cached_at, see client.track_reads). The entry stays valid while every one
+of those upstream entries is unchanged and none is past the soft TTL; the
+ETag is a hash of the request key and those versions, so it only changes
+when the underlying data does.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import NamedTuple
+
+from ebird_recommend.core import metrics
+from ebird_recommend.core.cache import Cache, SQLiteCache, TieredCache
+
+_LOOKUPS = metrics.Counter(
+    "ebird_response_cache_lookups_total",
+    "Response cache lookups by result: hit, miss, or expired (past the TTL or upstream data changed).",
+    ("result",),
+)
+_HIT, _MISS, _EXPIRED = (_LOOKUPS.labels(result) for result in ("hit", "miss", "expired"))
+
+
+class CachedResponse(NamedTuple):
+    etag: str
+    body: bytes
+    reads: tuple[tuple[str, datetime], ...]
+    expires_at: datetime
+    # Content-Encoding → compressed body, filled in on first use.
+    encoded: dict[str, bytes]
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        cache: Cache | SQLiteCache | TieredCache | None,
+        ttl_hours: float = 4.0,
+        max_entries: int = 512,
+    ):
+        self.cache = cache
+        self.ttl = timedelta(hours=ttl_hours)
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, CachedResponse] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple) -> CachedResponse | None:
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and self._valid(entry):
+            with self._lock:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            _HIT.inc()
+            return entry
+        with self._lock:
+            if entry is not None:
+                self._entries.pop(key, None)
+            self.misses += 1
+        (_MISS if entry is None else _EXPIRED).inc()
+        return None
+
+    def _valid(self, entry: CachedResponse) -> bool:
+        if datetime.now() > entry.expires_at:
+            return False
+        for cache_key, cached_at in entry.reads:
+            if self.cache is None or self.cache.cached_at(cache_key) != cached_at:
+                return False
+        return True
+
+    def put(self, key: tuple, body: bytes, reads: dict[str, datetime | None]) -> CachedResponse:
+        """Store body for key, computed from the upstream entries in reads."""
+        versions: list[tuple[str, datetime]] = []
+        for cache_key, cached_at in sorted(reads.items()):
+            if cached_at is None and self.cache is not None:
+                # Read from another caller's fetch; look the version up now.
+                cached_at = self.cache.cached_at(cache_key)
+            if cached_at is not None:
+                versions.append((cache_key, cached_at))
+
+        h = hashlib.sha256(repr(key).encode())
+        if versions:
+            for cache_key, cached_at in versions:
+                h.update(f"\n{cache_key}@{cached_at.isoformat()}".encode())
+        else:
+            h.update(body)
+        oldest = min((cached_at for _, cached_at in versions), default=datetime.now())
+        entry = CachedResponse(
+            etag=f'"{h.hexdigest()[:32]}"',
+            body=body,
+            reads=tuple(versions),
+            expires_at=oldest + self.ttl,
+            encoded={},
+        )
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def clear(self) -> int:
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+            return count
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
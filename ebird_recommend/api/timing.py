@@ -0,0 +1,100 @@
+"""Per-request phase timing and on-demand profiling for the API.
+
+TimingMiddleware runs each request inside core.timing.track_phases() and
+reports the phases (upstream, fetch, decode, columns, recommend, serialize,
+...) as a Server-Timing header, which browser dev tools show in the network
+panel. With log_requests it also writes one logfmt line per request:
+
+    method=POST route=/recommend status=200 total_ms=84.1 upstream_ms=61.0 fetch_ms=58.2 ...
+
+A request is profiled when profile_all is set, or when its X-Debug-Profile
+header equals profile_key. A SamplingProfiler then samples the threads that
+work on the request and writes a folded-stack file (see core/profiler.py)
+to profile_dir, named in the response's X-Profile header. The samples are
+of whole threads, so other requests sharing them show up too; profile on an
+otherwise idle worker for clean flamegraphs.
+"""
+
+import logging
+import re
+import time
+from datetime import datetime
+from pathlib import Path
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from ebird_recommend.core.profiler import SamplingProfiler
+from ebird_recommend.core.timing import track_phases
+
+log = logging.getLogger(__name__)
+
+PROFILE_HEADER = "x-debug-profile"
+
+
+def _slug(route: str) -> str:
+    return re.sub(r"[^A-Za-z0-9]+", "-", route).strip("-") or "root"
+
+
+class TimingMiddleware:
+    def __init__(
+        self,
+        app,
+        *,
+        log_requests: bool = False,
+        profile_all: bool = False,
+        profile_key: str | None = None,
+        profile_dir: str | Path = "data/profiles",
+    ):
+        self.app = app
+        self.log_requests = log_requests
+        self.profile_all = profile_all
+        self.profile_key = profile_key
+        self.profile_dir = Path(profile_dir)
+        if log_requests and not log.handlers:
+            # uvicorn only configures its own loggers.
+            log.addHandler(logging.StreamHandler())
+            log.setLevel(logging.INFO)
+
+    def _wants_profile(self, scope) -> bool:
+        if self.profile_all:
+            return True
+        return bool(self.profile_key) and Headers(scope=scope).get(PROFILE_HEADER) == self.profile_key
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+        profile_path: Path | None = None
+
+        with track_phases() as phases:
+            profiler = SamplingProfiler(lambda: phases.threads).start() if self._wants_profile(scope) else None
+
+            async def send_wrapper(message):
+                nonlocal status, profile_path
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", phases.server_timing(time.perf_counter() - start))
+                    if profiler is not None:
+                        route = getattr(scope.get("route"), "path", scope["path"])
+                        stamp = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+                        profile_path = self.profile_dir / f"{stamp}-{scope['method']}-{_slug(route)}.folded"
+                        headers["X-Profile"] = profile_path.name
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                total = time.perf_counter() - start
+                if profiler is not None:
+                    profiler.stop()
+                    if profile_path is not None:
+                        profiler.write(profile_path)
+                if self.log_requests:
+                    route = getattr(scope.get("route"), "path", "unmatched")
+                    fields = [f"total_ms={total * 1000:.2f}"]
+                    fields += [f"{name}_ms={ms}" for name, ms in phases.milliseconds().items()]
+                    log.info("method=%s route=%s status=%d %s", scope["method"], route, status, " ".join(fields))
@@ -1,4 +1,5 @@
 import os
+from datetime import date, datetime
 from pathlib import Path
 
 import typer
@@ -7,26 +8,60 @@ from rich.console import Console
 from rich.table import Table
 from rich import print as rprint
 
-from ebird_recommend.core.client import EBirdClient
+from ebird_recommend.core.cassettes import Faults, open_transport
+from ebird_recommend.core.client import BASE_URL, EBirdClient
 from ebird_recommend.core.user_data import load_life_list
 from ebird_recommend.core.recommender import recommend
-from ebird_recommend.core.cache import Cache
+from ebird_recommend.core.cache import open_cache
+from ebird_recommend.core.history import HistoryStore
+from ebird_recommend.core.hotspots import HotspotCatalog
 
 load_dotenv()
 app = typer.Typer(help="eBird lifer recommender — find birds worth chasing nearby.")
+cache_app = typer.Typer(help="Inspect and maintain the local eBird response cache.")
+app.add_typer(cache_app, name="cache")
+history_app = typer.Typer(help="Query and maintain the local observation archive.")
+app.add_typer(history_app, name="history")
 console = Console()
 
 _DEFAULT_CACHE_DIR = Path("data/.cache")
 _DEFAULT_CACHE_TTL = 4.0  # hours
+_DEFAULT_CACHE_BACKEND = os.getenv("EBIRD_CACHE_BACKEND", "file")  # "file" | "sqlite"
+_DEFAULT_HISTORY_DIR = Path("data/history")
+_HISTORY = os.getenv("EBIRD_HISTORY", "").lower() in ("1", "true", "yes")
+_HISTORY_RETENTION_DAYS = os.getenv("EBIRD_HISTORY_RETENTION_DAYS")
 
 
-def _get_client(no_cache: bool = False, cache_ttl: float = _DEFAULT_CACHE_TTL) -> EBirdClient:
+_DEFAULT_HOTSPOT_DIR = Path("data/hotspots")
+_HOTSPOT_REGIONS = [r.strip() for r in os.getenv("EBIRD_HOTSPOT_REGIONS", "").split(",") if r.strip()]
+_HOTSPOT_TTL_HOURS = float(os.getenv("EBIRD_HOTSPOT_TTL_HOURS", "168"))
+
+
+def _history_store() -> HistoryStore:
+    retention = int(_HISTORY_RETENTION_DAYS) if _HISTORY_RETENTION_DAYS else None
+    return HistoryStore(_DEFAULT_HISTORY_DIR, retention_days=retention)
+
+
+def _get_client(
+    no_cache: bool = False,
+    cache_ttl: float = _DEFAULT_CACHE_TTL,
+    hotspots: HotspotCatalog | None = None,
+) -> EBirdClient:
     key = os.getenv("EBIRD_API_KEY")
     if not key:
         rprint("[bold red]Error:[/] EBIRD_API_KEY not set. Add it to your .env file.")
         raise typer.Exit(1)
-    cache = None if no_cache else Cache(_DEFAULT_CACHE_DIR, ttl_hours=cache_ttl)
-    return EBirdClient(key, cache=cache)
+    cache = None if no_cache else open_cache(_DEFAULT_CACHE_BACKEND, _DEFAULT_CACHE_DIR, ttl_hours=cache_ttl)
+    cassette_mode = os.getenv("EBIRD_CASSETTE_MODE")
+    transport = open_transport(
+        cassette_mode,
+        os.getenv("EBIRD_CASSETTE_DIR", "data/cassettes"),
+        faults=Faults.from_env(),
+    ) if cassette_mode else None
+    return EBirdClient(
+        key, cache=cache, history=_history_store() if _HISTORY else None, hotspots=hotspots,
+        transport=transport, base_url=os.getenv("EBIRD_BASE_URL", BASE_URL),
+    )
 
 
 @app.command()
@@ -72,9 +107,12 @@ def hotspots(
     no_cache: bool = typer.Option(False, "--no-cache", help="Bypass cache and fetch fresh data."),
 ):
     """List eBird hotspots near a location."""
-    client = _get_client(no_cache=no_cache)
-
-    with console.status("Fetching nearby hotspots…"):
+    catalog = None
+    if _HOTSPOT_REGIONS and not no_cache:
+        catalog = HotspotCatalog(_DEFAULT_HOTSPOT_DIR, _HOTSPOT_REGIONS, ttl_hours=_HOTSPOT_TTL_HOURS)
+    with _get_client(no_cache=no_cache, hotspots=catalog) as client, console.status("Fetching nearby hotspots…"):
+        if catalog is not None:
+            catalog.index(client, wait=True)
         spots = client.nearby_hotspots(lat, lng, radius)
 
     console.print(f"\nFound [bold]{len(spots)}[/] hotspots within {radius} km\n")
@@ -105,9 +143,7 @@ def notable(
     no_cache: bool = typer.Option(False, "--no-cache", help="Bypass cache and fetch fresh data."),
 ):
     """Show recent notable (rare/flagged) observations near a location."""
-    client = _get_client(no_cache=no_cache)
-
-    with console.status("Fetching notable observations…"):
+    with _get_client(no_cache=no_cache) as client, console.status("Fetching notable observations…"):
         obs_list = client.nearby_notable_obs(lat, lng, radius, days)
 
     console.print(f"\nFound [bold]{len(obs_list)}[/] notable observations in the last {days} days\n")
@@ -145,20 +181,33 @@ def rec(
     lifers_only: bool = typer.Option(False, "--lifers-only", help="Show only species you haven't seen."),
     no_cache: bool = typer.Option(False, "--no-cache", help="Bypass cache and fetch fresh data."),
     cache_ttl: float = typer.Option(_DEFAULT_CACHE_TTL, "--cache-ttl", help="Cache TTL in hours.", show_default=True),
+    until: datetime = typer.Option(
+        None, "--until", formats=["%Y-%m-%d"],
+        help="Use the local history archive for the --days ending on this date (no eBird calls).",
+    ),
 ):
     """Recommend birds and hotspots worth visiting near you."""
-    client = _get_client(no_cache=no_cache, cache_ttl=cache_ttl)
-
     try:
         seen = load_life_list(csv)
     except FileNotFoundError as e:
         rprint(f"[bold red]Error:[/] {e}")
         raise typer.Exit(1)
 
-    cache_label = "[dim](cached)[/]" if not no_cache else "[dim](live)[/]"
-    with console.status(f"Fetching observations within {radius} km (last {days} days)… {cache_label}"):
-        all_obs     = client.nearby_recent_obs(lat, lng, radius, days)
-        notable_obs = client.nearby_notable_obs(lat, lng, radius, days)
+    as_of = until.date() if until else None
+    if as_of is not None:
+        store = _history_store()
+        start = date.fromordinal(as_of.toordinal() - days)
+        with console.status(f"Reading archived observations {start} – {as_of}…"):
+            all_obs     = store.query(start, as_of, lat=lat, lng=lng, dist_km=radius)
+            notable_obs = store.query(start, as_of, lat=lat, lng=lng, dist_km=radius, notable=True)
+    else:
+        cache_label = "[dim](cached)[/]" if not no_cache else "[dim](live)[/]"
+        with (
+            _get_client(no_cache=no_cache, cache_ttl=cache_ttl) as client,
+            console.status(f"Fetching observations within {radius} km (last {days} days)… {cache_label}"),
+        ):
+            all_obs     = client.nearby_recent_obs(lat, lng, radius, days)
+            notable_obs = client.nearby_notable_obs(lat, lng, radius, days)
 
     console.print(
         f"\nLoaded [bold]{len(seen)}[/] species from your life list | "
@@ -166,12 +215,10 @@ def rec(
         f"[bold]{len(notable_obs)}[/] notable obs\n"
     )
 
-    recs = recommend(lat, lng, seen, all_obs, notable_obs, max_dist_km=radius)
-
-    if lifers_only:
-        recs = [r for r in recs if r.is_lifer]
-
-    recs = recs[:top]
+    recs = recommend(
+        lat, lng, seen, all_obs, notable_obs, max_dist_km=radius,
+        lifer="yes" if lifers_only else "all", top=top, as_of=as_of,
+    )
 
     if not recs:
         console.print("[yellow]No recommendations found.[/]")
@@ -210,3 +257,91 @@ def rec(
     console.print(
         "\n[dim]Data: eBird (https://ebird.org), Cornell Lab of Ornithology[/]\n"
     )
+
+
+# ---------------------------------------------------------------------------
+# Cache maintenance
+# ---------------------------------------------------------------------------
+
+_backend_option = typer.Option(
+    _DEFAULT_CACHE_BACKEND, "--backend", help="Cache backend: file or sqlite.", show_default=True,
+)
+
+
+@cache_app.command("stats")
+def cache_stats(backend: str = _backend_option):
+    """Show entry count and size of the cache."""
+    usage = open_cache(backend, _DEFAULT_CACHE_DIR).usage()
+
+    table = Table(title=f"Cache ({backend}) at {_DEFAULT_CACHE_DIR}", show_lines=False)
+    table.add_column("Metric", style="cyan")
+    table.add_column("Value", justify="right")
+    for name, value in usage.items():
+        shown = f"{value / 1024:,.1f} KiB" if name.endswith("bytes") else f"{value:,}"
+        table.add_row(name.replace("_", " "), shown)
+
+    console.print(table)
+
+
+@cache_app.command("sweep")
+def cache_sweep(backend: str = _backend_option):
+    """Delete expired cache entries (sqlite backend only)."""
+    cache = open_cache(backend, _DEFAULT_CACHE_DIR)
+    if not hasattr(cache, "sweep"):
+        rprint("[bold red]Error:[/] The file backend drops expired entries on read; nothing to sweep.")
+        raise typer.Exit(1)
+    console.print(f"Removed [bold]{cache.sweep()}[/] expired entries.")
+
+
+@cache_app.command("clear")
+def cache_clear(backend: str = _backend_option):
+    """Delete every cache entry."""
+    console.print(f"Removed [bold]{open_cache(backend, _DEFAULT_CACHE_DIR).clear()}[/] entries.")
+
+
+# ---------------------------------------------------------------------------
+# History archive
+# ---------------------------------------------------------------------------
+
+@history_app.command("stats")
+def history_stats():
+    """Show partitions, segments, rows and size of the archive."""
+    store = _history_store()
+    days = store.days()
+
+    table = Table(title=f"History at {_DEFAULT_HISTORY_DIR}", show_lines=False)
+    table.add_column("Metric", style="cyan")
+    table.add_column("Value", justify="right")
+    for name, value in store.usage().items():
+        shown = f"{value / 1024:,.1f} KiB" if name.endswith("bytes") else f"{value:,}"
+        table.add_row(name, shown)
+    table.add_row("range", f"{days[0]} – {days[-1]}" if days else "—")
+
+    console.print(table)
+
+
+@history_app.command("compact")
+def history_compact():
+    """Merge each day's segments into one without duplicates and apply retention."""
+    result = _history_store().compact()
+    console.print(
+        f"Compacted [bold]{result['partitions_compacted']}[/] partitions, "
+        f"removed [bold]{result['duplicates_removed']}[/] duplicate rows and "
+        f"[bold]{result['partitions_pruned']}[/] expired partitions."
+    )
+
+
+@history_app.command("prune")
+def history_prune(
+    keep_days: int = typer.Option(
+        None, "--keep-days", help="Override EBIRD_HISTORY_RETENTION_DAYS for this run.",
+    ),
+):
+    """Delete partitions older than the retention period."""
+    store = _history_store()
+    if keep_days is not None:
+        store.retention_days = keep_days
+    if store.retention_days is None:
+        rprint("[bold red]Error:[/] No retention set. Pass --keep-days or set EBIRD_HISTORY_RETENTION_DAYS.")
+        raise typer.Exit(1)
+    console.print(f"Removed [bold]{store.prune()}[/] partitions.")
@@ -2,12 +2,47 @@
 
 Cache files live in data/.cache/ and are invalidated after a configurable TTL.
 Each entry is a JSON file keyed by an MD5 hash of the request parameters.
+
+SQLiteCache is an alternative disk store: one WAL-mode database with atomic
+upserts, an indexed expiry column, bulk expiry sweeps and an optional size
+cap enforced by LRU eviction. Use open_cache() to pick a backend by name.
+
+MemoryCache is an optional bounded LRU of already-decoded payloads; wrap it
+and a disk store in TieredCache to serve hot keys without touching the disk.
+
+get_entry() and set() take an optional ttl that overrides the store's for
+that call, for entries kept longer than the rest (the client's partitioned
+windows); pass the same ttl to both.
 """
 
 import json
 import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
 from datetime import datetime, timedelta
+from typing import NamedTuple
+
+from . import fastjson, metrics
+
+_LOOKUPS = metrics.Counter(
+    "ebird_cache_lookups_total",
+    "Upstream cache lookups by tier and result (hit, miss, expired).",
+    ("tier", "result"),
+)
+
+
+def _lookup_counters(tier: str) -> tuple:
+    return tuple(_LOOKUPS.labels(tier, result) for result in ("hit", "miss", "expired"))
+
+
+class CacheEntry(NamedTuple):
+    payload: list | dict
+    cached_at: datetime
+    size: int  # encoded JSON size in bytes (approximate for the memory tier)
 
 
 class Cache:
@@ -15,32 +50,59 @@ class Cache:
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         self.ttl = timedelta(hours=ttl_hours)
+        self.hits = 0
+        self.misses = 0
+        self._hit, self._miss, self._expired = _lookup_counters("file")
 
     def _path(self, key: str) -> Path:
         h = hashlib.md5(key.encode()).hexdigest()
         return self.cache_dir / f"{h}.json"
 
     def get(self, key: str) -> list | dict | None:
+        entry = self.get_entry(key)
+        return entry.payload if entry else None
+
+    def get_entry(self, key: str, ttl: timedelta | None = None) -> CacheEntry | None:
         path = self._path(key)
         if not path.exists():
+            self.misses += 1
+            self._miss.inc()
             return None
         try:
-            data = json.loads(path.read_text(encoding="utf-8"))
+            raw = path.read_bytes()
+            data = fastjson.loads(raw)
             cached_at = datetime.fromisoformat(data["cached_at"])
-            if datetime.now() - cached_at > self.ttl:
+            if datetime.now() - cached_at > (ttl or self.ttl):
                 path.unlink(missing_ok=True)
+                self.misses += 1
+                self._expired.inc()
                 return None
-            return data["payload"]
-        except (json.JSONDecodeError, KeyError, ValueError):
+            self.hits += 1
+            self._hit.inc()
+            return CacheEntry(data["payload"], cached_at, len(raw))
+        except (KeyError, ValueError):  # JSONDecodeError is a ValueError
             path.unlink(missing_ok=True)
+            self.misses += 1
+            self._miss.inc()
             return None
 
-    def set(self, key: str, payload: list | dict) -> None:
+    def cached_at(self, key: str) -> datetime | None:
+        """cached_at of a live entry, without counting a lookup."""
+        try:
+            cached_at = datetime.fromisoformat(fastjson.loads(self._path(key).read_bytes())["cached_at"])
+        except (OSError, KeyError, ValueError):
+            return None
+        return cached_at if datetime.now() - cached_at <= self.ttl else None
+
+    def set(self, key: str, payload: list | dict, ttl: timedelta | None = None) -> CacheEntry:
         path = self._path(key)
-        path.write_text(
-            json.dumps({"cached_at": datetime.now().isoformat(), "payload": payload}),
-            encoding="utf-8",
-        )
+        cached_at = datetime.now()
+        text = json.dumps({"cached_at": cached_at.isoformat(), "payload": payload})
+        # Write-then-rename so concurrent readers never see a torn file.
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(text, encoding="utf-8")
+        os.replace(tmp, path)
+        return CacheEntry(payload, cached_at, len(text))
 
     def clear(self) -> int:
         """Delete all cache files. Returns the count of files removed."""
@@ -49,3 +111,340 @@ class Cache:
             f.unlink(missing_ok=True)
             count += 1
         return count
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+    def usage(self) -> dict[str, int]:
+        """Scan the cache directory for entry count and size on disk."""
+        files = list(self.cache_dir.glob("*.json"))
+        return {"entries": len(files), "bytes": sum(f.stat().st_size for f in files)}
+
+
+class SQLiteCache:
+    """Single-file SQLite (WAL) cache store with the Cache interface.
+
+    Safe to share between threads and between processes: each thread gets
+    its own connection, and writes are single-statement upserts.
+    """
+
+    # Avoid a write per hit: only refresh last_access when it is this stale.
+    _TOUCH_INTERVAL = 60.0
+    # Sweep expired rows every this many writes.
+    _SWEEP_EVERY = 100
+
+    def __init__(
+        self,
+        db_path: str | Path,
+        ttl_hours: float = 4.0,
+        max_bytes: int | None = None,
+    ):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = timedelta(hours=ttl_hours)
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._hit, self._miss, self._expired = _lookup_counters("sqlite")
+
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key         TEXT PRIMARY KEY,
+                payload     TEXT NOT NULL,
+                cached_at   REAL NOT NULL,
+                expires_at  REAL NOT NULL,
+                last_access REAL NOT NULL,
+                size        INTEGER NOT NULL
+            )
+            """
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS entries_expires_at ON entries (expires_at)")
+        conn.execute("CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access)")
+        # Running total of entry sizes, kept by triggers on every upsert and
+        # delete (sweeps and evictions included) in every process sharing the
+        # file, so enforcing max_bytes never scans the table.
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS totals (id INTEGER PRIMARY KEY CHECK (id = 0), bytes INTEGER NOT NULL)"
+        )
+        conn.execute(
+            "INSERT OR IGNORE INTO totals (id, bytes) SELECT 0, COALESCE(SUM(size), 0) FROM entries"
+        )
+        for name, event, delta in (
+            ("entries_insert", "INSERT", "new.size"),
+            ("entries_update", "UPDATE OF size", "new.size - old.size"),
+            ("entries_delete", "DELETE", "-old.size"),
+        ):
+            conn.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {name} AFTER {event} ON entries BEGIN"
+                f" UPDATE totals SET bytes = bytes + {delta} WHERE id = 0; END"
+            )
+        conn.execute("COMMIT")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> list | dict | None:
+        entry = self.get_entry(key)
+        return entry.payload if entry else None
+
+    def get_entry(self, key: str, ttl: timedelta | None = None) -> CacheEntry | None:
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT payload, cached_at, last_access, size FROM entries WHERE key = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            self._miss.inc()
+            return None
+        payload, cached_at, last_access, size = row
+        now = time.time()
+        if now - cached_at > (ttl or self.ttl).total_seconds():
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self.misses += 1
+            self._expired.inc()
+            return None
+        if now - last_access > self._TOUCH_INTERVAL:
+            conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (now, key))
+        self.hits += 1
+        self._hit.inc()
+        return CacheEntry(fastjson.loads(payload), datetime.fromtimestamp(cached_at), size)
+
+    def cached_at(self, key: str) -> datetime | None:
+        """cached_at of a live entry, without counting a lookup or decoding the payload."""
+        row = self._conn().execute("SELECT cached_at FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None or time.time() - row[0] > self.ttl.total_seconds():
+            return None
+        return datetime.fromtimestamp(row[0])
+
+    def set(self, key: str, payload: list | dict, ttl: timedelta | None = None) -> CacheEntry:
+        text = json.dumps(payload)
+        now = time.time()
+        self._conn().execute(
+            """
+            INSERT INTO entries (key, payload, cached_at, expires_at, last_access, size)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (key) DO UPDATE SET
+                payload = excluded.payload,
+                cached_at = excluded.cached_at,
+                expires_at = excluded.expires_at,
+                last_access = excluded.last_access,
+                size = excluded.size
+            """,
+            (key, text, now, now + (ttl or self.ttl).total_seconds(), now, len(text)),
+        )
+        self._writes += 1
+        if self._writes % self._SWEEP_EVERY == 0:
+            self.sweep()
+        if self.max_bytes is not None:
+            self._enforce_size()
+        return CacheEntry(payload, datetime.fromtimestamp(now), len(text))
+
+    def _enforce_size(self) -> None:
+        conn = self._conn()
+        (total,) = conn.execute("SELECT bytes FROM totals WHERE id = 0").fetchone()
+        while total > self.max_bytes:
+            # Evict least-recently-used rows in batches until under the cap.
+            rows = conn.execute(
+                "SELECT key, size FROM entries ORDER BY last_access LIMIT 64"
+            ).fetchall()
+            if not rows:
+                break
+            evict = []
+            for key, size in rows:
+                evict.append((key,))
+                total -= size
+                if total <= self.max_bytes:
+                    break
+            conn.executemany("DELETE FROM entries WHERE key = ?", evict)
+            self.evictions += len(evict)
+
+    def sweep(self) -> int:
+        """Delete all expired rows. Returns the count removed."""
+        cur = self._conn().execute("DELETE FROM entries WHERE expires_at <= ?", (time.time(),))
+        return cur.rowcount
+
+    def clear(self) -> int:
+        """Delete all entries. Returns the count removed."""
+        cur = self._conn().execute("DELETE FROM entries")
+        return cur.rowcount
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+    def usage(self) -> dict[str, int]:
+        entries, size, expired = self._conn().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0), COUNT(*) FILTER (WHERE expires_at <= ?)"
+            " FROM entries",
+            (time.time(),),
+        ).fetchone()
+        return {
+            "entries": entries,
+            "bytes": size,
+            "expired": expired,
+            "file_bytes": sum(
+                p.stat().st_size
+                for p in self.db_path.parent.glob(self.db_path.name + "*")
+            ),
+        }
+
+
+def open_cache(
+    backend: str,
+    cache_dir: str | Path,
+    ttl_hours: float = 4.0,
+    max_bytes: int | None = None,
+) -> "Cache | SQLiteCache":
+    """Return the disk store named by backend ("file" or "sqlite")."""
+    if backend == "file":
+        return Cache(cache_dir, ttl_hours=ttl_hours)
+    if backend == "sqlite":
+        return SQLiteCache(Path(cache_dir) / "cache.sqlite3", ttl_hours=ttl_hours, max_bytes=max_bytes)
+    raise ValueError(f"Unknown cache backend: {backend!r} (expected 'file' or 'sqlite')")
+
+
+class MemoryCache:
+    """Bounded in-process LRU of decoded payloads.
+
+    Entries expire relative to their original cached_at (as recorded by the
+    disk tier), so promoting an entry to memory never extends its lifetime.
+    Payloads are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int | None = None,
+        ttl_hours: float = 4.0,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = timedelta(hours=ttl_hours)
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._hit, self._miss, self._expired = _lookup_counters("memory")
+
+    def get(self, key: str) -> list | dict | None:
+        entry = self.get_entry(key)
+        return entry.payload if entry else None
+
+    def get_entry(self, key: str, ttl: timedelta | None = None) -> CacheEntry | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                self._miss.inc()
+                return None
+            if datetime.now() - entry.cached_at > (ttl or self.ttl):
+                self._drop(key)
+                self.misses += 1
+                self._expired.inc()
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self._hit.inc()
+            return entry
+
+    def cached_at(self, key: str) -> datetime | None:
+        """cached_at of a live entry, without counting a lookup or moving it in the LRU."""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or datetime.now() - entry.cached_at > self.ttl:
+            return None
+        return entry.cached_at
+
+    def put(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = entry
+            self._bytes += entry.size
+            while self._entries and (
+                len(self._entries) > self.max_entries
+                or (self.max_bytes is not None and self._bytes > self.max_bytes)
+            ):
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def set(self, key: str, payload: list | dict, ttl: timedelta | None = None) -> CacheEntry:
+        entry = CacheEntry(payload, datetime.now(), len(json.dumps(payload)))
+        self.put(key, entry)
+        return entry
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def clear(self) -> int:
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+            self._bytes = 0
+            return count
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+        }
+
+
+class TieredCache:
+    """A MemoryCache in front of a disk-backed store, with the Cache interface."""
+
+    def __init__(self, memory: MemoryCache, disk: Cache | SQLiteCache):
+        self.memory = memory
+        self.disk = disk
+        self.ttl = disk.ttl
+
+    def get(self, key: str) -> list | dict | None:
+        entry = self.get_entry(key)
+        return entry.payload if entry else None
+
+    def get_entry(self, key: str, ttl: timedelta | None = None) -> CacheEntry | None:
+        entry = self.memory.get_entry(key, ttl)
+        if entry is not None:
+            return entry
+        entry = self.disk.get_entry(key, ttl)
+        if entry is not None:
+            self.memory.put(key, entry)
+        return entry
+
+    def cached_at(self, key: str) -> datetime | None:
+        """cached_at of a live entry, without counting a lookup."""
+        cached_at = self.memory.cached_at(key)
+        return cached_at if cached_at is not None else self.disk.cached_at(key)
+
+    def set(self, key: str, payload: list | dict, ttl: timedelta | None = None) -> CacheEntry:
+        entry = self.disk.set(key, payload, ttl)
+        self.memory.put(key, entry)
+        return entry
+
+    def clear(self) -> int:
+        self.memory.clear()
+        return self.disk.clear()
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        return {"memory": self.memory.stats(), "disk": self.disk.stats()}
+
+    def usage(self) -> dict[str, int]:
+        return self.disk.usage()
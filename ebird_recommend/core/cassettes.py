@@ -0,0 +1,182 @@
+"""Record and replay eBird API responses.
+
+A cassette directory holds one JSON file per distinct upstream request
+(path relative to the /v2 base, plus sorted query parameters), with the
+status, content type and raw body of the response. RecordTransport passes
+requests through to eBird and writes each response to the directory;
+ReplayTransport answers from the directory without any network access,
+optionally with injected latency and errors so that tests and profiles see
+upstream-like behaviour with deterministic data.
+
+Both are httpx transports, passed to EBirdClient(transport=...). The API
+and CLI build them from EBIRD_CASSETTE_MODE / EBIRD_CASSETTE_DIR (see
+open_transport).
+"""
+
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlencode
+
+import httpx
+
+log = logging.getLogger(__name__)
+
+
+def request_key(request: httpx.Request) -> str:
+    """Canonical "GET path?query" for a request, independent of the base URL."""
+    path = request.url.path
+    if "/v2/" in path:
+        path = path[path.index("/v2/") + 3:]
+    query = urlencode(sorted(request.url.params.multi_items()))
+    return f"{request.method} {path}?{query}" if query else f"{request.method} {path}"
+
+
+class CassetteStore:
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{hashlib.sha1(key.encode()).hexdigest()[:24]}.json"
+
+    def load(self, key: str) -> httpx.Response | None:
+        try:
+            data = json.loads(self._path(key).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return httpx.Response(
+            data["status"],
+            headers={"content-type": data["content_type"]},
+            content=data["body"].encode(),
+        )
+
+    def save(self, key: str, response: httpx.Response) -> None:
+        data = {
+            "request": key,
+            "status": response.status_code,
+            "content_type": response.headers.get("content-type", "application/json"),
+            "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "body": response.text,
+        }
+        path = self._path(key)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(data), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def keys(self) -> list[str]:
+        """Requests recorded in the directory."""
+        keys = []
+        for p in sorted(self.directory.glob("*.json")):
+            try:
+                keys.append(json.loads(p.read_text(encoding="utf-8"))["request"])
+            except (OSError, ValueError, KeyError):
+                continue
+        return keys
+
+
+class Faults:
+    """Seeded injected latency (base + uniform jitter, in ms) and error rate."""
+
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        seed: int | None = None,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, environ=os.environ) -> "Faults":
+        """Faults from EBIRD_REPLAY_LATENCY_MS, _JITTER_MS, _ERROR_RATE and _SEED."""
+        return cls(
+            latency_ms=float(environ.get("EBIRD_REPLAY_LATENCY_MS", "0")),
+            jitter_ms=float(environ.get("EBIRD_REPLAY_JITTER_MS", "0")),
+            error_rate=float(environ.get("EBIRD_REPLAY_ERROR_RATE", "0")),
+            seed=int(environ.get("EBIRD_REPLAY_SEED", "0")),
+        )
+
+    def draw(self) -> tuple[float, bool]:
+        """(delay in seconds, whether to fail) for the next request."""
+        with self._lock:
+            delay = self.latency_ms + self._rng.random() * self.jitter_ms
+            fail = self._rng.random() < self.error_rate
+        return delay / 1000, fail
+
+    def error(self) -> httpx.Response:
+        return httpx.Response(
+            self.error_status, json={"errors": [{"status": str(self.error_status), "title": "Injected error"}]},
+        )
+
+
+class RecordTransport(httpx.BaseTransport):
+    """Forwards requests to inner and writes every response to the store."""
+
+    def __init__(self, store: CassetteStore, inner: httpx.BaseTransport | None = None):
+        self.store = store
+        self.inner = inner or httpx.HTTPTransport()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        response = self.inner.handle_request(request)
+        response.read()
+        if response.status_code < 500:
+            self.store.save(request_key(request), response)
+        return httpx.Response(
+            response.status_code,
+            headers={"content-type": response.headers.get("content-type", "application/json")},
+            content=response.content,
+        )
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+class ReplayTransport(httpx.BaseTransport):
+    """Serves recorded responses; unrecorded requests get a 404."""
+
+    def __init__(self, store: CassetteStore, faults: Faults | None = None):
+        self.store = store
+        self.faults = faults or Faults()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        delay, fail = self.faults.draw()
+        if delay:
+            time.sleep(delay)
+        if fail:
+            return self.faults.error()
+        key = request_key(request)
+        response = self.store.load(key)
+        if response is None:
+            log.warning("No cassette for %s in %s", key, self.store.directory)
+            return httpx.Response(404, json={"errors": [{"status": "404", "title": f"No cassette for {key}"}]})
+        return response
+
+
+def open_transport(
+    mode: str,
+    directory: str | Path,
+    *,
+    faults: Faults | None = None,
+    pool_size: int = 10,
+    http2: bool = False,
+) -> httpx.BaseTransport:
+    """Return the transport for mode ("record" or "replay") over a cassette directory."""
+    store = CassetteStore(directory)
+    if mode == "record":
+        limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+        return RecordTransport(store, httpx.HTTPTransport(http2=http2, limits=limits))
+    if mode == "replay":
+        return ReplayTransport(store, faults)
+    raise ValueError(f"Unknown cassette mode: {mode!r} (expected 'record' or 'replay')")
@@ -4,38 +4,586 @@ Docs: https://documenter.getpostman.com/view/664302/S1ENwy59
 Attribution: Data provided by eBird (https://ebird.org), Cornell Lab of Ornithology.
 """
 
+import asyncio
+import contextvars
+import functools
 import json
+import logging
+import re
+import threading
+import time
 import httpx
-from typing import Optional
+import numpy as np
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Callable, Iterator, Optional
 from .models import Checklist, Hotspot, Observation, NotableObservation
-from .cache import Cache
+from . import fastjson, metrics
+from .cache import Cache, CacheEntry, TieredCache
+from .columns import ObsColumns
+from .history import HistoryStore
+from .hotspots import HotspotCatalog
+from .geo import covers, haversine, haversine_matrix, snap, tile_centers
+from .singleflight import SingleFlight
+from .timing import phase
 
 BASE_URL = "https://api.ebird.org/v2"
 
+log = logging.getLogger(__name__)
+
+# Upstream limits for the geo endpoints.
+MAX_DIST_KM = 50
+MAX_BACK_DAYS = 30
+
+# Geo reuse snaps query centres to this grid (~2 km) before fetching a superset.
+GEO_GRID_DEG = 0.02
+_MAX_KNOWN_AREAS = 4096
+
+_HOTSPOTS_GEO = "/ref/hotspot/geo"
+_RECENT_GEO = "/data/obs/geo/recent"
+_NOTABLE_GEO = "/data/obs/geo/recent/notable"
+
+# Geo endpoints that report only the latest sighting of each species in the
+# queried area; a narrower query cannot be filtered out of a wider answer.
+_LATEST_PER_SPECIES = {_RECENT_GEO}
+
+# Partitioned refreshes re-fetch the days since the last refresh plus this many.
+PARTITION_OVERLAP_DAYS = 2
+# Partitioned windows outlive the cache TTL so an expired one can still be
+# refreshed by days; past MAX_BACK_DAYS none of its days are useful.
+_PARTITION_TTL = timedelta(days=MAX_BACK_DAYS)
+
+
+_UPSTREAM_SECONDS = metrics.Histogram(
+    "ebird_upstream_request_seconds", "eBird API request latency by endpoint.", ("endpoint",)
+)
+_UPSTREAM_BYTES = metrics.Histogram(
+    "ebird_upstream_response_bytes", "eBird API response body size by endpoint.", ("endpoint",),
+    buckets=metrics.SIZE_BUCKETS,
+)
+_UPSTREAM_ERRORS = metrics.Counter(
+    "ebird_upstream_errors_total",
+    "Failed eBird API requests by endpoint and reason (HTTP status or exception class).",
+    ("endpoint", "reason"),
+)
+_CLIENT_REQUESTS = metrics.Counter(
+    "ebird_client_requests_total",
+    "Client reads by endpoint and source: cache, stale (served while refreshing) or fetch.",
+    ("endpoint", "source"),
+)
+
+# Path segments that identify a location or region rather than an endpoint.
+_ENDPOINT_IDS = re.compile(r"^/(data/obs|ref/hotspot|product/lists)/(?!geo(?:/|$))[^/]+")
+
+
+@lru_cache(maxsize=1024)
+def _endpoint(path: str) -> str:
+    """Metric label for an upstream path: location and region ids become placeholders."""
+    return _ENDPOINT_IDS.sub(lambda m: f"/{m.group(1)}/{{id}}", path)
+
+
+def _observations(data: list[dict], model: type[Observation], lean: bool) -> list[Observation] | ObsColumns:
+    """Raw observation rows as lean columns or as pydantic models."""
+    with phase("columns" if lean else "models"):
+        return ObsColumns.from_records(data) if lean else [model(**o) for o in data]
+
+
+class ReadLog(dict[str, datetime | None]):
+    """Cache key → cached_at of each entry read, plus the upstream paths fetched."""
+
+    def __init__(self):
+        super().__init__()
+        self.fetched: list[str] = []
+
+
+# Cache entries read while serving the current request; see track_reads().
+_reads: contextvars.ContextVar[ReadLog | None] = contextvars.ContextVar("ebird_reads", default=None)
+
+
+@contextmanager
+def track_reads() -> Iterator[ReadLog]:
+    """Collect the cache keys read inside the block, with the entry's cached_at.
+
+    The timestamp is None when the payload came from another caller's
+    in-flight fetch. Reads made through asyncio.to_thread and the client's
+    tile threads are included, since they run in copies of this context.
+    The log's fetched lists every upstream request made for the block
+    (background refreshes excluded).
+    """
+    reads = ReadLog()
+    token = _reads.set(reads)
+    try:
+        yield reads
+    finally:
+        _reads.reset(token)
+
+
+def _record(cache_key: str, cached_at: datetime | None) -> None:
+    reads = _reads.get()
+    if reads is not None and (cached_at is not None or cache_key not in reads):
+        reads[cache_key] = cached_at
+
+
+def _merge_key(o: dict) -> tuple:
+    """Identity of a row when merging overlapping geo results."""
+    if "speciesCode" in o:
+        return (o.get("subId") or (o["locId"], o["obsDt"]), o["speciesCode"])
+    return (o["locId"],)  # hotspot
+
+
+def _latest_per_species(path: str, rows: list[dict]) -> list[dict]:
+    """Rows merged from several geo queries, as one query over their union returns them.
+
+    Endpoints in _LATEST_PER_SPECIES keep only the newest row of each
+    species; others are returned as they are.
+    """
+    if path not in _LATEST_PER_SPECIES:
+        return rows
+    latest: dict[str, dict] = {}
+    for o in rows:
+        kept = latest.get(o["speciesCode"])
+        if kept is None or o["obsDt"] > kept["obsDt"]:
+            latest[o["speciesCode"]] = o
+    return list(latest.values())
+
+
+def _split_days(rows: list[dict]) -> dict[str, list[dict]]:
+    days: dict[str, list[dict]] = {}
+    for o in rows:
+        days.setdefault(o["obsDt"][:10], []).append(o)
+    return days
+
+
+def _first_day(back: int) -> str:
+    """The oldest day of a back-day window, today being its first day."""
+    return str(date.today() - timedelta(days=back - 1))
+
+
+def _window(state: dict, back: int) -> list[dict]:
+    """Rows of a partitioned state from the last back days, newest day first."""
+    first = _first_day(back)
+    days = state["days"]
+    return [o for day in sorted(days, reverse=True) if day >= first for o in days[day]]
+
 
 class EBirdClient:
-    def __init__(self, api_key: str, cache: Cache | None = None):
+    """Synchronous eBird client.
+
+    Owns a long-lived httpx.Client so that repeated calls reuse pooled
+    keep-alive connections (and, with http2=True, multiplex over one).
+    Call close() — or use the client as a context manager — when done.
+
+    Observation methods accept lean=True to return an ObsColumns decoded
+    straight from the raw JSON instead of one pydantic model per row.
+
+    Concurrent cache misses on the same key are coalesced through a
+    SingleFlight; pass a shared one to deduplicate across clients.
+
+    With stale_after_hours set (shorter than the cache TTL), entries older
+    than stale_after_hours are still served, and one background refresh is
+    scheduled per key; only entries past the cache TTL block on upstream.
+
+    With geo_reuse=True (requires a cache), hotspot and notable geo queries
+    are answered from a superset fetched at the upstream maximum radius and
+    window around a grid-snapped centre, filtered locally by distance and
+    date, so nearby and narrower requests share one upstream entry. Recent
+    observations report only the latest sighting of each species in the
+    queried area, so a narrower circle cannot be cut out of a wider one
+    without losing species: those queries are only snapped to the grid and
+    shared by requests with the same snapped centre, dist and back, and the
+    rows are returned as fetched for the snapped centre.
+
+    Geo queries wider than the upstream MAX_DIST_KM are split into cached
+    MAX_DIST_KM tiles on a fixed lattice, fetched concurrently (at most
+    tile_concurrency at a time) and merged without duplicates. The *_many
+    methods answer several circles at once from one such merged fetch.
+    Tiling costs one upstream request per tile (8 for 60 km, 36 for 200 km)
+    and each tile reaches past the circle, so tiles fetch roughly twice the
+    rows that are kept. Recent observations are reduced to the latest
+    sighting per species across tiles, as one upstream query would be, but
+    a species whose latest sighting in a tile lies outside the circle is
+    missed. Queries needing more than max_tiles tiles fall back to a single
+    MAX_DIST_KM query at the centre, which is what eBird itself answers for
+    wider radii.
+
+    With partitioned=True (requires a cache), observation windows are cached
+    as per-day partitions of one query without its back parameter. A stale
+    window (in the background) or one past the cache TTL (while the caller
+    waits) is refreshed by fetching only the days since the last refresh
+    plus PARTITION_OVERLAP_DAYS, merged in by (subId, speciesCode); days
+    older than the window are dropped. A back-day window holds today and
+    the back - 1 days before it. Because each upstream response holds
+    only the latest sighting per species, a merged window can keep an
+    older sighting of a species alongside its newest one.
+
+    With a HistoryStore, every observation payload fetched upstream is also
+    appended to that local archive. With a HotspotCatalog, nearby_hotspots
+    is answered from the catalog's local index wherever it covers the query.
+
+    transport replaces the HTTP transport (e.g. a cassettes.ReplayTransport,
+    or an httpx.MockTransport serving synthetic data in benchmarks);
+    pool_size and http2 then do not apply. base_url points the client at
+    another eBird-compatible server, such as benchmarks.upstream.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        cache: Cache | TieredCache | None = None,
+        *,
+        pool_size: int = 10,
+        http2: bool = False,
+        timeout: float = 15,
+        flight: SingleFlight | None = None,
+        stale_after_hours: float | None = None,
+        geo_reuse: bool = False,
+        tile_concurrency: int = 4,
+        max_tiles: int = 36,
+        partitioned: bool = False,
+        history: HistoryStore | None = None,
+        hotspots: HotspotCatalog | None = None,
+        transport: httpx.BaseTransport | None = None,
+        base_url: str = BASE_URL,
+    ):
         self._headers = {"X-eBirdApiToken": api_key}
+        self._base_url = base_url.rstrip("/")
         self._cache = cache
+        self.flight = flight or SingleFlight()
+        self._stale_after = timedelta(hours=stale_after_hours) if stale_after_hours is not None else None
+        self._refreshing: set[str] = set()
+        self._refresh_lock = threading.Lock()
+        self._refresher: ThreadPoolExecutor | None = None
+        self._geo_reuse = geo_reuse and cache is not None
+        self._partitioned = partitioned and cache is not None
+        self._history = history
+        self._hotspots = hotspots
+        # path → {(lat, lng, dist, back): None}: supersets fetched so far, oldest first
+        self._areas: dict[str, OrderedDict[tuple, None]] = {}
+        self._areas_lock = threading.Lock()
+        self._tile_concurrency = tile_concurrency
+        self._max_tiles = max_tiles
+        self._tiler = ThreadPoolExecutor(max_workers=tile_concurrency, thread_name_prefix="ebird-tile")
+        self._http = httpx.Client(
+            headers=self._headers,
+            timeout=timeout,
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=pool_size,
+                max_keepalive_connections=pool_size,
+            ),
+            transport=transport,
+        )
+
+    def close(self) -> None:
+        """Close pooled connections and stop background refreshes."""
+        if self._refresher is not None:
+            self._refresher.shutdown(wait=False, cancel_futures=True)
+        self._tiler.shutdown(wait=False, cancel_futures=True)
+        self._http.close()
+
+    def __enter__(self) -> "EBirdClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
 
     def _get(self, path: str, params: dict) -> list | dict:
         cache_key = path + json.dumps(params, sort_keys=True)
 
         if self._cache:
-            cached = self._cache.get(cache_key)
-            if cached is not None:
-                return cached
+            entry = self._cache.get_entry(cache_key)
+            if entry is not None:
+                if self._is_stale(entry.cached_at):
+                    self._schedule_refresh(cache_key, lambda: self._fetch(path, params, cache_key))
+                    _CLIENT_REQUESTS.labels(_endpoint(path), "stale").inc()
+                else:
+                    _CLIENT_REQUESTS.labels(_endpoint(path), "cache").inc()
+                _record(cache_key, entry.cached_at)
+                return entry.payload
+
+        _CLIENT_REQUESTS.labels(_endpoint(path), "fetch").inc()
+        data = self.flight.do(
+            cache_key,
+            lambda: self._fetch(path, params, cache_key),
+            recheck=(lambda: self._fresh(cache_key)) if self._cache else None,
+        )
+        if self._cache:
+            _record(cache_key, None)
+        return data
+
+    def _is_stale(self, cached_at: datetime) -> bool:
+        return self._stale_after is not None and datetime.now() - cached_at > self._stale_after
+
+    def _fresh(self, cache_key: str) -> list | dict | None:
+        """Cached payload for cache_key, unless missing or past the soft TTL."""
+        entry = self._cache.get_entry(cache_key)
+        if entry is None or self._is_stale(entry.cached_at):
+            return None
+        return entry.payload
+
+    def _schedule_refresh(self, cache_key: str, fetch: Callable[[], list | dict]) -> None:
+        with self._refresh_lock:
+            if cache_key in self._refreshing:
+                return
+            self._refreshing.add(cache_key)
+            if self._refresher is None:
+                self._refresher = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ebird-refresh")
+
+        def refresh() -> None:
+            try:
+                self.flight.do(cache_key, fetch, recheck=lambda: self._fresh(cache_key))
+            except Exception:
+                log.warning("Background refresh failed for %s", cache_key, exc_info=True)
+            finally:
+                with self._refresh_lock:
+                    self._refreshing.discard(cache_key)
 
-        url = f"{BASE_URL}{path}"
-        response = httpx.get(url, headers=self._headers, params=params, timeout=15)
-        response.raise_for_status()
-        data = response.json()
+        try:
+            self._refresher.submit(refresh)
+        except RuntimeError:  # executor shut down by close()
+            with self._refresh_lock:
+                self._refreshing.discard(cache_key)
+
+    def _request(self, path: str, params: dict) -> list | dict:
+        url = f"{self._base_url}{path}"
+        if (reads := _reads.get()) is not None:
+            reads.fetched.append(path)
+        endpoint = _endpoint(path)
+        start = time.perf_counter()
+        try:
+            with phase("fetch"):
+                response = self._http.get(url, params=params)
+                response.raise_for_status()
+            with phase("decode"):
+                data = fastjson.loads(response.content)
+        except httpx.HTTPStatusError as e:
+            _UPSTREAM_ERRORS.labels(endpoint, str(e.response.status_code)).inc()
+            raise
+        except Exception as e:
+            _UPSTREAM_ERRORS.labels(endpoint, type(e).__name__).inc()
+            raise
+        finally:
+            _UPSTREAM_SECONDS.labels(endpoint).observe(time.perf_counter() - start)
+        _UPSTREAM_BYTES.labels(endpoint).observe(len(response.content))
+
+        if self._history is not None and path.startswith("/data/obs/"):
+            try:
+                self._history.append(data, notable=path.endswith("/notable"))
+            except (OSError, KeyError, ValueError):
+                log.warning("Could not archive observations from %s", path, exc_info=True)
+
+        return data
+
+    def _fetch(self, path: str, params: dict, cache_key: str) -> list | dict:
+        data = self._request(path, params)
 
         if self._cache:
-            self._cache.set(cache_key, data)
+            _record(cache_key, self._cache.set(cache_key, data).cached_at)
 
         return data
 
+    def _get_window(self, path: str, params: dict, back: int | None) -> list:
+        """GET an endpoint with an optional back (days) window, partitioned if enabled."""
+        if back is None:
+            return self._get(path, params)
+        if not self._partitioned:
+            return self._get(path, {**params, "back": back})
+
+        key = "days:" + path + json.dumps(params, sort_keys=True)
+        entry = self._cache.get_entry(key, _PARTITION_TTL)
+        if entry is not None and entry.payload["back"] >= back:
+            if datetime.now() - entry.cached_at > self._cache.ttl:
+                _CLIENT_REQUESTS.labels(_endpoint(path), "fetch").inc()
+                state = self.flight.do(
+                    key, lambda: self._refresh_days(path, params, key, entry), recheck=lambda: self._fresh(key),
+                )
+                _record(key, None)
+                return _window(state, back)
+            if self._is_stale(entry.cached_at):
+                self._schedule_refresh(key, lambda: self._refresh_days(path, params, key, entry))
+                _CLIENT_REQUESTS.labels(_endpoint(path), "stale").inc()
+            else:
+                _CLIENT_REQUESTS.labels(_endpoint(path), "cache").inc()
+            _record(key, entry.cached_at)
+            return _window(entry.payload, back)
+
+        _CLIENT_REQUESTS.labels(_endpoint(path), "fetch").inc()
+        state = self.flight.do(f"{key}#{back}", lambda: self._fetch_days(path, params, back, key))
+        _record(key, None)
+        return _window(state, back)
+
+    def _fetch_days(self, path: str, params: dict, back: int, key: str) -> dict:
+        """Fetch a whole window and store it as per-day partitions."""
+        state = {"back": back, "days": _split_days(self._request(path, {**params, "back": back}))}
+        _record(key, self._cache.set(key, state, _PARTITION_TTL).cached_at)
+        return state
+
+    def _refresh_days(self, path: str, params: dict, key: str, entry: CacheEntry) -> dict:
+        """Fetch the newest days of a partitioned window and merge them into entry's."""
+        state = entry.payload
+        back = state["back"]
+        recent = (date.today() - entry.cached_at.date()).days + PARTITION_OVERLAP_DAYS
+        if recent >= back:
+            return self._fetch_days(path, params, back, key)
+
+        first = _first_day(back)
+        days = {day: rows for day, rows in state["days"].items() if day >= first}
+        for day, rows in _split_days(self._request(path, {**params, "back": recent})).items():
+            merged = {_merge_key(o): o for o in days.get(day, ())}
+            merged.update((_merge_key(o), o) for o in rows)
+            days[day] = list(merged.values())
+
+        state = {"back": back, "days": days}
+        _record(key, self._cache.set(key, state, _PARTITION_TTL).cached_at)
+        return state
+
+    def _geo_get(
+        self,
+        path: str,
+        lat: float,
+        lng: float,
+        dist_km: int,
+        params: dict,
+        back: int | None = None,
+    ) -> list:
+        """GET a lat/lng/dist endpoint, reusing a covering superset if enabled."""
+        if dist_km > MAX_DIST_KM:
+            return self._tiled_get(path, lat, lng, dist_km, params, back)
+
+        query = {"lat": lat, "lng": lng, "dist": dist_km, **params}
+        if not self._geo_reuse:
+            return self._get_window(path, query, back)
+
+        if path in _LATEST_PER_SPECIES:
+            s_lat, s_lng = snap(lat, lng, GEO_GRID_DEG)
+            return self._get_window(path, {**query, "lat": s_lat, "lng": s_lng}, back)
+
+        area = self._covering_area(path, lat, lng, dist_km, back)
+        if area is None:
+            s_lat, s_lng = snap(lat, lng, GEO_GRID_DEG)
+            area = (s_lat, s_lng, MAX_DIST_KM, MAX_BACK_DAYS if back is not None else None)
+            if not covers(s_lat, s_lng, MAX_DIST_KM, lat, lng, dist_km):
+                return self._get_window(path, query, back)
+
+        a_lat, a_lng, a_dist, a_back = area
+        superset = {"lat": a_lat, "lng": a_lng, "dist": a_dist, **params}
+        data = self._get_window(path, superset, a_back)
+        self._remember_area(path, area)
+
+        first = _first_day(back) if back is not None else None
+        return [
+            o for o in data
+            if haversine(lat, lng, o["lat"], o["lng"]) <= dist_km
+            and (first is None or o["obsDt"][:10] >= first)
+        ]
+
+    def _tiled_get(
+        self,
+        path: str,
+        lat: float,
+        lng: float,
+        dist_km: int,
+        params: dict,
+        back: int | None,
+    ) -> list:
+        """Cover a circle wider than the upstream cap with MAX_DIST_KM tiles and merge them."""
+        results = self._fetch_areas(path, self._tile_areas(lat, lng, dist_km), params, back)
+        return self._merge_tiles(path, results, lat, lng, dist_km)
+
+    def _tile_areas(self, lat: float, lng: float, dist_km: int) -> list[tuple[float, float, int]]:
+        """Tiles covering the circle, or just its centre past max_tiles."""
+        centers = tile_centers(lat, lng, dist_km, MAX_DIST_KM)
+        if len(centers) > self._max_tiles:
+            return [(lat, lng, MAX_DIST_KM)]
+        return [(t_lat, t_lng, MAX_DIST_KM) for t_lat, t_lng in centers]
+
+    def _merge_tiles(self, path: str, results: list[list], lat: float, lng: float, dist_km: int) -> list:
+        merged: dict[tuple, dict] = {}
+        for rows in results:
+            for o in rows:
+                if haversine(lat, lng, o["lat"], o["lng"]) <= dist_km:
+                    merged.setdefault(_merge_key(o), o)
+        return _latest_per_species(path, list(merged.values()))
+
+    def _fetch_areas(
+        self, path: str, areas: list[tuple[float, float, int]], params: dict, back: int | None,
+    ) -> list[list]:
+        """_geo_get every (lat, lng, dist_km) area on the tile pool, in order."""
+        futures = [
+            self._tiler.submit(contextvars.copy_context().run, self._geo_get, path, *area, params, back)
+            for area in areas
+        ]
+        return [future.result() for future in futures]
+
+    def _geo_get_many(
+        self,
+        path: str,
+        circles: list[tuple[float, float, int]],
+        params: dict,
+        back: int | None,
+    ) -> list:
+        """Union of several geo queries, with each upstream area fetched once.
+
+        Either every circle is fetched on its own (wide ones as tiles), or all
+        of them are covered by one shared set of lattice tiles, whichever
+        takes fewer upstream requests. Rows are deduplicated as in
+        _tiled_get and kept if they fall inside at least one circle.
+        """
+        circles, areas = self._many_areas(circles)
+        return self._merge_many(path, self._fetch_areas(path, areas, params, back), circles)
+
+    def _many_areas(self, circles: list[tuple[float, float, int]]) -> tuple[list, list]:
+        """The distinct circles and the areas to fetch for them (see _geo_get_many)."""
+        circles = list(dict.fromkeys(circles))
+        own: list[tuple[float, float, int]] = []
+        shared: dict[tuple[float, float, int], None] = {}
+        for lat, lng, dist_km in circles:
+            tiles = [(t_lat, t_lng, MAX_DIST_KM) for t_lat, t_lng in tile_centers(lat, lng, dist_km, MAX_DIST_KM)]
+            shared.update(dict.fromkeys(tiles))
+            own.extend(self._tile_areas(lat, lng, dist_km) if dist_km > MAX_DIST_KM else [(lat, lng, dist_km)])
+        areas = list(shared) if len(shared) < len(dict.fromkeys(own)) else list(dict.fromkeys(own))
+        return circles, areas
+
+    def _merge_many(self, path: str, results: list[list], circles: list[tuple[float, float, int]]) -> list:
+        merged: dict[tuple, dict] = {}
+        for rows in results:
+            for o in rows:
+                merged.setdefault(_merge_key(o), o)
+        rows = list(merged.values())
+        if not rows:
+            return rows
+
+        c_lat, c_lng, c_dist = (np.array(v, dtype=np.float64) for v in zip(*circles))
+        dist = haversine_matrix(
+            c_lat, c_lng,
+            np.fromiter((o["lat"] for o in rows), dtype=np.float64, count=len(rows)),
+            np.fromiter((o["lng"] for o in rows), dtype=np.float64, count=len(rows)),
+        )
+        inside = (dist <= c_dist[:, None]).any(axis=0)
+        return _latest_per_species(path, [o for o, keep in zip(rows, inside.tolist()) if keep])
+
+    def _covering_area(
+        self, path: str, lat: float, lng: float, dist_km: int, back: int | None,
+    ) -> tuple | None:
+        with self._areas_lock:
+            known = list(self._areas.get(path, ()))
+        for area in reversed(known):
+            a_lat, a_lng, a_dist, a_back = area
+            if (back is None or a_back >= back) and covers(a_lat, a_lng, a_dist, lat, lng, dist_km):
+                return area
+        return None
+
+    def _remember_area(self, path: str, area: tuple) -> None:
+        with self._areas_lock:
+            areas = self._areas.setdefault(path, OrderedDict())
+            areas[area] = None
+            areas.move_to_end(area)
+            if len(areas) > _MAX_KNOWN_AREAS:
+                areas.popitem(last=False)
+
     # ------------------------------------------------------------------
     # Hotspots
     # ------------------------------------------------------------------
@@ -47,10 +595,23 @@ class EBirdClient:
         dist_km: int = 50,
     ) -> list[Hotspot]:
         """Return hotspots within dist_km kilometres of the given coordinates."""
-        data = self._get(
-            "/ref/hotspot/geo",
-            {"lat": lat, "lng": lng, "dist": dist_km, "fmt": "json"},
-        )
+        local = self._catalog_hotspots(lat, lng, dist_km)
+        if local is not None:
+            return local
+        data = self._geo_get(_HOTSPOTS_GEO, lat, lng, dist_km, {"fmt": "json"})
+        return [Hotspot(**h) for h in data]
+
+    def _catalog_hotspots(self, lat: float, lng: float, dist_km: int) -> list[Hotspot] | None:
+        """Hotspots from the HotspotCatalog, or None if it does not cover the query."""
+        if self._hotspots is not None:
+            index = self._hotspots.index(self)
+            if index is not None and index.covers(lat, lng, dist_km):
+                return index.within(lat, lng, dist_km)
+        return None
+
+    def region_hotspots(self, region_code: str) -> list[Hotspot]:
+        """Every hotspot in an eBird region (country, subnational1 or subnational2 code)."""
+        data = self._get(f"/ref/hotspot/{region_code}", {"fmt": "json"})
         return [Hotspot(**h) for h in data]
 
     # ------------------------------------------------------------------
@@ -61,13 +622,12 @@ class EBirdClient:
         self,
         loc_id: str,
         back: int = 14,
-    ) -> list[Observation]:
+        *,
+        lean: bool = False,
+    ) -> list[Observation] | ObsColumns:
         """Recent observations at a specific hotspot."""
-        data = self._get(
-            f"/data/obs/{loc_id}/recent",
-            {"back": back, "detail": "simple"},
-        )
-        return [Observation(**o) for o in data]
+        data = self._get_window(f"/data/obs/{loc_id}/recent", {"detail": "simple"}, back)
+        return _observations(data, Observation, lean)
 
     def nearby_notable_obs(
         self,
@@ -75,25 +635,23 @@ class EBirdClient:
         lng: float,
         dist_km: int = 50,
         back: int = 14,
-    ) -> list[NotableObservation]:
+        *,
+        lean: bool = False,
+    ) -> list[NotableObservation] | ObsColumns:
         """Recent notable (rare/flagged) observations near a location."""
-        data = self._get(
-            "/data/obs/geo/recent/notable",
-            {"lat": lat, "lng": lng, "dist": dist_km, "back": back, "detail": "simple"},
-        )
-        return [NotableObservation(**o) for o in data]
+        data = self._geo_get(_NOTABLE_GEO, lat, lng, dist_km, {"detail": "simple"}, back=back)
+        return _observations(data, NotableObservation, lean)
 
     def notable_obs_at_location(
         self,
         loc_id: str,
         back: int = 14,
-    ) -> list[NotableObservation]:
+        *,
+        lean: bool = False,
+    ) -> list[NotableObservation] | ObsColumns:
         """Recent notable (rare/flagged) observations at a specific hotspot."""
-        data = self._get(
-            f"/data/obs/{loc_id}/recent/notable",
-            {"back": back, "detail": "simple"},
-        )
-        return [NotableObservation(**o) for o in data]
+        data = self._get_window(f"/data/obs/{loc_id}/recent/notable", {"detail": "simple"}, back)
+        return _observations(data, NotableObservation, lean)
 
     def checklists_at_location(
         self,
@@ -123,10 +681,137 @@ class EBirdClient:
         lng: float,
         dist_km: int = 50,
         back: int = 14,
-    ) -> list[Observation]:
+        *,
+        lean: bool = False,
+    ) -> list[Observation] | ObsColumns:
         """All recent observations near a location (not just notable)."""
-        data = self._get(
-            "/data/obs/geo/recent",
-            {"lat": lat, "lng": lng, "dist": dist_km, "back": back, "detail": "simple"},
-        )
-        return [Observation(**o) for o in data]
+        data = self._geo_get(_RECENT_GEO, lat, lng, dist_km, {"detail": "simple"}, back=back)
+        return _observations(data, Observation, lean)
+
+    def nearby_recent_obs_many(
+        self,
+        circles: list[tuple[float, float, int]],
+        back: int = 14,
+        *,
+        lean: bool = False,
+    ) -> list[Observation] | ObsColumns:
+        """Recent observations within any of several (lat, lng, dist_km) circles."""
+        data = self._geo_get_many(_RECENT_GEO, circles, {"detail": "simple"}, back)
+        return _observations(data, Observation, lean)
+
+    def nearby_notable_obs_many(
+        self,
+        circles: list[tuple[float, float, int]],
+        back: int = 14,
+        *,
+        lean: bool = False,
+    ) -> list[NotableObservation] | ObsColumns:
+        """Recent notable observations within any of several (lat, lng, dist_km) circles."""
+        data = self._geo_get_many(_NOTABLE_GEO, circles, {"detail": "simple"}, back)
+        return _observations(data, NotableObservation, lean)
+
+
+class AsyncEBirdClient:
+    """Async facade over EBirdClient with the same method surface.
+
+    Each call runs the synchronous client on the facade's own thread pool,
+    sized to pool_size like the connection pool, so independent fetches can
+    be awaited concurrently (e.g. with asyncio.gather) while still sharing
+    one Cache and one set of request/decoding logic, without competing for
+    the event loop's default executor.
+
+    Wide queries and the *_many methods are tiled here rather than in a
+    worker: each tile is a separate call on the pool (at most
+    tile_concurrency per query at a time), so no worker sits waiting for
+    other threads.
+    """
+
+    def __init__(self, api_key: str, cache: Cache | TieredCache | None = None, **kwargs):
+        self.sync = EBirdClient(api_key, cache=cache, **kwargs)
+        self._pool = ThreadPoolExecutor(max_workers=kwargs.get("pool_size", 10), thread_name_prefix="ebird-async")
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self.sync.close()
+
+    async def _run(self, fn: Callable, /, *args, **kwargs):
+        """fn(*args, **kwargs) on the pool, in a copy of the current context (like asyncio.to_thread)."""
+        call = functools.partial(contextvars.copy_context().run, fn, *args, **kwargs)
+        return await asyncio.get_running_loop().run_in_executor(self._pool, call)
+
+    async def _fetch_areas(
+        self, path: str, areas: list[tuple[float, float, int]], params: dict, back: int | None,
+    ) -> list[list]:
+        limit = asyncio.Semaphore(self.sync._tile_concurrency)
+
+        async def fetch(area: tuple[float, float, int]) -> list:
+            async with limit:
+                return await self._run(self.sync._geo_get, path, *area, params, back)
+
+        return await asyncio.gather(*(fetch(area) for area in areas))
+
+    async def _tiled_get(
+        self, path: str, lat: float, lng: float, dist_km: int, params: dict, back: int | None = None,
+    ) -> list:
+        results = await self._fetch_areas(path, self.sync._tile_areas(lat, lng, dist_km), params, back)
+        return await self._run(self.sync._merge_tiles, path, results, lat, lng, dist_km)
+
+    async def _geo_get_many(
+        self, path: str, circles: list[tuple[float, float, int]], params: dict, back: int | None,
+    ) -> list:
+        circles, areas = self.sync._many_areas(circles)
+        results = await self._fetch_areas(path, areas, params, back)
+        return await self._run(self.sync._merge_many, path, results, circles)
+
+    async def nearby_hotspots(self, lat: float, lng: float, dist_km: int = 50) -> list[Hotspot]:
+        if dist_km <= MAX_DIST_KM:
+            return await self._run(self.sync.nearby_hotspots, lat, lng, dist_km)
+        local = await self._run(self.sync._catalog_hotspots, lat, lng, dist_km)
+        if local is not None:
+            return local
+        data = await self._tiled_get(_HOTSPOTS_GEO, lat, lng, dist_km, {"fmt": "json"})
+        return [Hotspot(**h) for h in data]
+
+    async def region_hotspots(self, region_code: str) -> list[Hotspot]:
+        return await self._run(self.sync.region_hotspots, region_code)
+
+    async def recent_obs_at_location(
+        self, loc_id: str, back: int = 14, *, lean: bool = False,
+    ) -> list[Observation] | ObsColumns:
+        return await self._run(self.sync.recent_obs_at_location, loc_id, back, lean=lean)
+
+    async def nearby_notable_obs(
+        self, lat: float, lng: float, dist_km: int = 50, back: int = 14, *, lean: bool = False,
+    ) -> list[NotableObservation] | ObsColumns:
+        if dist_km <= MAX_DIST_KM:
+            return await self._run(self.sync.nearby_notable_obs, lat, lng, dist_km, back, lean=lean)
+        data = await self._tiled_get(_NOTABLE_GEO, lat, lng, dist_km, {"detail": "simple"}, back)
+        return await self._run(_observations, data, NotableObservation, lean)
+
+    async def notable_obs_at_location(
+        self, loc_id: str, back: int = 14, *, lean: bool = False,
+    ) -> list[NotableObservation] | ObsColumns:
+        return await self._run(self.sync.notable_obs_at_location, loc_id, back, lean=lean)
+
+    async def checklists_at_location(self, loc_id: str, limit: int = 10) -> list[Checklist]:
+        return await self._run(self.sync.checklists_at_location, loc_id, limit)
+
+    async def nearby_recent_obs(
+        self, lat: float, lng: float, dist_km: int = 50, back: int = 14, *, lean: bool = False,
+    ) -> list[Observation] | ObsColumns:
+        if dist_km <= MAX_DIST_KM:
+            return await self._run(self.sync.nearby_recent_obs, lat, lng, dist_km, back, lean=lean)
+        data = await self._tiled_get(_RECENT_GEO, lat, lng, dist_km, {"detail": "simple"}, back)
+        return await self._run(_observations, data, Observation, lean)
+
+    async def nearby_recent_obs_many(
+        self, circles: list[tuple[float, float, int]], back: int = 14, *, lean: bool = False,
+    ) -> list[Observation] | ObsColumns:
+        data = await self._geo_get_many(_RECENT_GEO, circles, {"detail": "simple"}, back)
+        return await self._run(_observations, data, Observation, lean)
+
+    async def nearby_notable_obs_many(
+        self, circles: list[tuple[float, float, int]], back: int = 14, *, lean: bool = False,
+    ) -> list[NotableObservation] | ObsColumns:
+        data = await self._geo_get_many(_NOTABLE_GEO, circles, {"detail": "simple"}, back)
+        return await self._run(_observations, data, NotableObservation, lean)
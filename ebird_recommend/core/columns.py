@@ -0,0 +1,104 @@
+"""Compact columnar representation of eBird observations.
+
+ObsColumns holds raw observation JSON as parallel lists, with the strings
+that repeat across rows (species, location and name fields) interned. It is
+the "lean" decode target of EBirdClient: cheaper to build than one pydantic
+model per row, consumed directly by the recommender, and serializable
+straight back to the API's camelCase observation shape.
+"""
+
+import sys
+from typing import Iterable, Iterator
+
+from .models import Observation
+
+# (column, eBird JSON key, default) — order and defaults match Observation.
+_FIELDS: tuple[tuple[str, str, object], ...] = (
+    ("species_code", "speciesCode", None),
+    ("common_name", "comName", None),
+    ("scientific_name", "sciName", None),
+    ("loc_id", "locId", None),
+    ("loc_name", "locName", None),
+    ("obs_dt", "obsDt", None),
+    ("how_many", "howMany", None),
+    ("lat", "lat", None),
+    ("lng", "lng", None),
+    ("obs_valid", "obsValid", True),
+    ("obs_reviewed", "obsReviewed", False),
+    ("location_private", "locationPrivate", False),
+    ("sub_id", "subId", ""),
+)
+_INTERNED = {"species_code", "common_name", "scientific_name", "loc_id", "loc_name"}
+
+
+class ObsRecord:
+    """One observation row with Observation's attribute names, minus validation."""
+
+    __slots__ = tuple(name for name, _, _ in _FIELDS)
+
+    def __init__(self, *values):
+        for name, value in zip(self.__slots__, values):
+            setattr(self, name, value)
+
+
+class ObsColumns:
+    __slots__ = tuple(name for name, _, _ in _FIELDS)
+
+    def __init__(self, **columns: list):
+        for name, _, _ in _FIELDS:
+            setattr(self, name, columns.get(name, []))
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict]) -> "ObsColumns":
+        """Build from raw eBird JSON objects (camelCase keys)."""
+        records = records if isinstance(records, list) else list(records)
+        intern = sys.intern
+        columns = {}
+        for name, key, default in _FIELDS:
+            if name in _INTERNED:
+                columns[name] = [intern(r[key]) for r in records]
+            elif default is None:
+                columns[name] = [r.get(key) for r in records]
+            else:
+                columns[name] = [r.get(key, default) for r in records]
+        return cls(**columns)
+
+    @classmethod
+    def from_models(cls, observations: Iterable[Observation]) -> "ObsColumns":
+        observations = list(observations)
+        return cls(**{
+            name: [getattr(o, name) for o in observations] for name, _, _ in _FIELDS
+        })
+
+    def __len__(self) -> int:
+        return len(self.species_code)
+
+    def records(self) -> Iterator[ObsRecord]:
+        """Iterate rows as attribute-access records."""
+        return map(ObsRecord, *(getattr(self, name) for name, _, _ in _FIELDS))
+
+    def to_models(self, model: type[Observation] = Observation) -> list[Observation]:
+        """Validated pydantic models, for callers that need the full contract."""
+        return [model(**row) for row in self.to_api()]
+
+    def to_api(self) -> list[dict]:
+        """Rows as camelCase dicts, the JSON shape of Observation in API responses."""
+        keys = [key for _, key, _ in _FIELDS]
+        return [dict(zip(keys, row)) for row in zip(*(getattr(self, name) for name, _, _ in _FIELDS))]
+
+    def to_api_columns(self) -> dict[str, list]:
+        """Columns keyed by their camelCase API name (the ?format=columns shape)."""
+        return {key: getattr(self, name) for name, key, _ in _FIELDS}
+
+    def take(self, indices: Iterable[int]) -> "ObsColumns":
+        """Subset of rows, in the given order."""
+        indices = list(indices)
+        return ObsColumns(**{
+            name: [column[i] for i in indices]
+            for name, column in ((n, getattr(self, n)) for n, _, _ in _FIELDS)
+        })
+
+    def __add__(self, other: "ObsColumns") -> "ObsColumns":
+        return ObsColumns(**{
+            name: getattr(self, name) + getattr(other, name) for name, _, _ in _FIELDS
+        })
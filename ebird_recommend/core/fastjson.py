@@ -0,0 +1,25 @@
+"""JSON encode/decode, using orjson when it is installed.
+
+Install the "fast" extra (pip install ebird-recommend[fast]) to enable it;
+otherwise these fall back to the standard library with the same behaviour.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+def loads(data: bytes | str):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj) -> bytes:
+    """Serialize obj to compact UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
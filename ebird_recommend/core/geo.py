@@ -0,0 +1,97 @@
+"""Geometry helpers shared by the client and the recommender."""
+
+import math
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+
+
+def haversine(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Return great-circle distance in kilometres."""
+    R = EARTH_RADIUS_KM
+    φ1, φ2 = math.radians(lat1), math.radians(lat2)
+    dφ = math.radians(lat2 - lat1)
+    dλ = math.radians(lng2 - lng1)
+    a = math.sin(dφ / 2) ** 2 + math.cos(φ1) * math.cos(φ2) * math.sin(dλ / 2) ** 2
+    return R * 2 * math.asin(math.sqrt(a))
+
+
+def haversine_np(lat1: float, lng1: float, lat2: np.ndarray, lng2: np.ndarray) -> np.ndarray:
+    """Vectorised haversine from one point to arrays of points, in kilometres."""
+    φ1, φ2 = math.radians(lat1), np.radians(lat2)
+    dφ = np.radians(lat2 - lat1)
+    dλ = np.radians(lng2 - lng1)
+    a = np.sin(dφ / 2) ** 2 + math.cos(φ1) * np.cos(φ2) * np.sin(dλ / 2) ** 2
+    return EARTH_RADIUS_KM * 2 * np.arcsin(np.sqrt(a))
+
+
+def haversine_matrix(lat1: np.ndarray, lng1: np.ndarray, lat2: np.ndarray, lng2: np.ndarray) -> np.ndarray:
+    """Distances from each point 1 (rows) to each point 2 (columns), in kilometres."""
+    φ1 = np.radians(lat1)[:, None]
+    φ2 = np.radians(lat2)[None, :]
+    dφ = φ2 - φ1
+    dλ = np.radians(lng2)[None, :] - np.radians(lng1)[:, None]
+    a = np.sin(dφ / 2) ** 2 + np.cos(φ1) * np.cos(φ2) * np.sin(dλ / 2) ** 2
+    return EARTH_RADIUS_KM * 2 * np.arcsin(np.sqrt(a))
+
+
+def snap(lat: float, lng: float, grid_deg: float) -> tuple[float, float]:
+    """Snap coordinates to the centre of their grid_deg × grid_deg cell."""
+    return (
+        round((math.floor(lat / grid_deg) + 0.5) * grid_deg, 6),
+        round((math.floor(lng / grid_deg) + 0.5) * grid_deg, 6),
+    )
+
+
+def covers(
+    center_lat: float,
+    center_lng: float,
+    radius_km: float,
+    lat: float,
+    lng: float,
+    dist_km: float,
+) -> bool:
+    """True if the circle (center, radius_km) contains the circle (lat/lng, dist_km)."""
+    return haversine(center_lat, center_lng, lat, lng) + dist_km <= radius_km
+
+
+_KM_PER_DEG_LAT = math.pi * EARTH_RADIUS_KM / 180
+
+
+def tile_centers(
+    lat: float,
+    lng: float,
+    radius_km: float,
+    tile_km: float,
+    margin_km: float = 5.0,
+) -> list[tuple[float, float]]:
+    """Centres of tile_km circles that together cover the circle (lat/lng, radius_km).
+
+    Centres sit on a fixed global hexagonal lattice (not one anchored at the
+    query), so overlapping queries share tiles. The lattice is laid out for
+    tiles of tile_km - margin_km to absorb the distortion of spacing rows by
+    each row's own longitude scale.
+    """
+    r = tile_km - margin_km
+    dlat = 1.5 * r / _KM_PER_DEG_LAT
+    reach_km = radius_km + tile_km
+    reach_lat = reach_km / _KM_PER_DEG_LAT
+
+    centers = []
+    for row in range(math.floor((lat - reach_lat) / dlat), math.ceil((lat + reach_lat) / dlat) + 1):
+        row_lat = row * dlat
+        if abs(row_lat) > 90:
+            continue
+        km_per_deg_lng = _KM_PER_DEG_LAT * max(math.cos(math.radians(row_lat)), 0.01)
+        dlng = math.sqrt(3) * r / km_per_deg_lng
+        offset = dlng / 2 if row % 2 else 0.0
+        reach_lng = min(reach_km / km_per_deg_lng, 180.0)
+        first = math.floor((lng - reach_lng - offset) / dlng)
+        last = math.ceil((lng + reach_lng - offset) / dlng)
+        for col in range(first, last + 1):
+            c_lat = round(row_lat, 6)
+            c_lng = round((col * dlng + offset + 180) % 360 - 180, 6)
+            if haversine(lat, lng, c_lat, c_lng) < reach_km:
+                centers.append((c_lat, c_lng))
+    return list(dict.fromkeys(centers))  # rows near the poles can wrap onto themselves
@@ -0,0 +1,255 @@
+"""Persistent local archive of every observation fetched from eBird.
+
+Upstream windows stop at 30 days and cached responses expire, so the client
+can append each observation payload it receives here. Rows are stored by
+observation date: one directory per day, holding immutable segments. A
+segment is a NumPy structured array (.npy, read memory-mapped) of integer
+codes and coordinates plus a JSON file with the segment's string
+dictionaries. Queries over any date range open only the partitions in that
+range; compact() merges each day's segments into one without duplicates
+and applies the retention policy.
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+from datetime import date, timedelta
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+from .columns import ObsColumns
+from .geo import haversine_np
+
+_ROW = np.dtype([
+    ("species", "<i4"),
+    ("loc", "<i4"),
+    ("sub", "<i4"),
+    ("obs_dt", "<i4"),
+    ("how_many", "<i4"),   # -1 when not reported
+    ("lat", "<f8"),
+    ("lng", "<f8"),
+    ("flags", "u1"),
+])
+
+_NOTABLE = 1
+_VALID = 2
+_REVIEWED = 4
+_PRIVATE = 8
+
+
+class _Dictionary:
+    """Builds string → code tables for one segment."""
+
+    def __init__(self):
+        self.codes: dict = {}
+
+    def code(self, value) -> int:
+        return self.codes.setdefault(value, len(self.codes))
+
+    def values(self) -> list:
+        return list(self.codes)
+
+
+@lru_cache(maxsize=1024)
+def _strings(path: str) -> dict[str, list]:
+    # Segments are immutable once written, so their dictionaries can be cached by path.
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def _key(sub_id: str, loc_id: str, obs_dt: str, species_code: str, notable: bool) -> tuple:
+    return (sub_id or (loc_id, obs_dt), species_code, notable)
+
+
+class HistoryStore:
+    def __init__(self, root: str | Path, retention_days: int | None = None):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.retention_days = retention_days
+
+    # -- writing --------------------------------------------------------------
+
+    def append(self, records: list[dict], *, notable: bool = False) -> int:
+        """Append raw eBird observation JSON objects. Returns rows written."""
+        by_day: dict[str, list[dict]] = {}
+        for r in records:
+            by_day.setdefault(r["obsDt"][:10], []).append(r)
+        for day, rows in by_day.items():
+            self._write_segment(day, [
+                (
+                    r["speciesCode"], r["comName"], r["sciName"], r["locId"], r["locName"],
+                    r.get("subId", ""), r["obsDt"], r.get("howMany"), r["lat"], r["lng"],
+                    (_NOTABLE if notable else 0)
+                    | (_VALID if r.get("obsValid", True) else 0)
+                    | (_REVIEWED if r.get("obsReviewed", False) else 0)
+                    | (_PRIVATE if r.get("locationPrivate", False) else 0),
+                )
+                for r in rows
+            ])
+        return len(records)
+
+    def _write_segment(self, day: str, rows: list[tuple]) -> None:
+        species, locs, subs, times = _Dictionary(), _Dictionary(), _Dictionary(), _Dictionary()
+        arr = np.empty(len(rows), dtype=_ROW)
+        for i, (code, com, sci, loc_id, loc_name, sub, obs_dt, how_many, lat, lng, flags) in enumerate(rows):
+            arr[i] = (
+                species.code((code, com, sci)),
+                locs.code((loc_id, loc_name)),
+                subs.code(sub),
+                times.code(obs_dt),
+                -1 if how_many is None else how_many,
+                lat,
+                lng,
+                flags,
+            )
+
+        part = self.root / day
+        part.mkdir(exist_ok=True)
+        name = f"{time.time_ns()}-{os.getpid()}-{threading.get_ident()}"
+        strings = {
+            "species": species.values(),
+            "loc": locs.values(),
+            "sub": subs.values(),
+            "obs_dt": times.values(),
+        }
+        # Dictionary first, array last: readers discover segments by their .npy.
+        tmp = part / f".{name}.tmp"
+        tmp.write_text(json.dumps(strings), encoding="utf-8")
+        os.replace(tmp, part / f"{name}.json")
+        with tmp.open("wb") as f:
+            np.save(f, arr)
+        os.replace(tmp, part / f"{name}.npy")
+
+    # -- reading --------------------------------------------------------------
+
+    def days(self, start: date | None = None, end: date | None = None) -> list[str]:
+        """Partition names (YYYY-MM-DD) within [start, end], oldest first."""
+        lo = str(start) if start else ""
+        hi = str(end) if end else "9999"
+        return sorted(
+            p.name for p in self.root.iterdir()
+            if p.is_dir() and len(p.name) == 10 and lo <= p.name <= hi
+        )
+
+    def query(
+        self,
+        start: date,
+        end: date,
+        *,
+        lat: float | None = None,
+        lng: float | None = None,
+        dist_km: float | None = None,
+        notable: bool = False,
+    ) -> ObsColumns:
+        """Observations dated start..end (inclusive), optionally within dist_km of lat/lng.
+
+        notable selects rows recorded from the notable feeds (True) or the
+        ordinary ones (False). Rows fetched more than once are returned once.
+        """
+        records: dict[tuple, dict] = {}
+        for day in self.days(start, end):
+            for arr, strings in self._segments(self.root / day):
+                mask = ((arr["flags"] & _NOTABLE) > 0) == notable
+                if dist_km is not None:
+                    mask &= haversine_np(lat, lng, arr["lat"], arr["lng"]) <= dist_km
+                species, locs, subs, times = (
+                    strings["species"], strings["loc"], strings["sub"], strings["obs_dt"],
+                )
+                for row in arr[mask].tolist():
+                    s, l, sub, t, how_many, r_lat, r_lng, flags = row
+                    code, com, sci = species[s]
+                    loc_id, loc_name = locs[l]
+                    key = _key(subs[sub], loc_id, times[t], code, notable)
+                    if key in records:
+                        continue
+                    records[key] = {
+                        "speciesCode": code,
+                        "comName": com,
+                        "sciName": sci,
+                        "locId": loc_id,
+                        "locName": loc_name,
+                        "obsDt": times[t],
+                        "howMany": None if how_many < 0 else how_many,
+                        "lat": r_lat,
+                        "lng": r_lng,
+                        "obsValid": bool(flags & _VALID),
+                        "obsReviewed": bool(flags & _REVIEWED),
+                        "locationPrivate": bool(flags & _PRIVATE),
+                        "subId": subs[sub],
+                    }
+        return ObsColumns.from_records(list(records.values()))
+
+    def _segments(self, part: Path):
+        """(array, dictionaries) for each segment of a partition, memory-mapped."""
+        for attempt in range(2):
+            try:
+                paths = sorted(part.glob("*.npy"))
+                opened = [
+                    (np.load(p, mmap_mode="r"), _strings(str(p.with_suffix(".json"))))
+                    for p in paths
+                ]
+            except FileNotFoundError:
+                # A compaction replaced segments under us; list the partition again.
+                if attempt:
+                    raise
+                continue
+            return opened
+        return []
+
+    # -- maintenance ----------------------------------------------------------
+
+    def compact(self, today: date | None = None) -> dict[str, int]:
+        """Merge each day's segments into one deduplicated segment, then apply retention."""
+        pruned = self.prune(today)
+        merged = removed = 0
+        for day in self.days():
+            part = self.root / day
+            paths = sorted(part.glob("*.npy"))
+            if len(paths) < 2:
+                continue
+            rows: dict[tuple, tuple] = {}
+            for arr, strings in self._segments(part):
+                species, locs, subs, times = (
+                    strings["species"], strings["loc"], strings["sub"], strings["obs_dt"],
+                )
+                for s, l, sub, t, how_many, r_lat, r_lng, flags in arr.tolist():
+                    code, com, sci = species[s]
+                    loc_id, loc_name = locs[l]
+                    key = _key(subs[sub], loc_id, times[t], code, bool(flags & _NOTABLE))
+                    # Later segments hold newer copies of the same row.
+                    rows[key] = (
+                        code, com, sci, loc_id, loc_name, subs[sub], times[t],
+                        None if how_many < 0 else how_many, r_lat, r_lng, flags,
+                    )
+                    removed += 1
+            self._write_segment(day, list(rows.values()))
+            removed -= len(rows)
+            for p in paths:
+                p.unlink(missing_ok=True)
+                p.with_suffix(".json").unlink(missing_ok=True)
+            merged += 1
+        return {"partitions_compacted": merged, "duplicates_removed": removed, "partitions_pruned": pruned}
+
+    def prune(self, today: date | None = None) -> int:
+        """Delete partitions older than retention_days. Returns the count removed."""
+        if self.retention_days is None:
+            return 0
+        cutoff = (today or date.today()) - timedelta(days=self.retention_days)
+        old = [day for day in self.days() if day < str(cutoff)]
+        for day in old:
+            shutil.rmtree(self.root / day, ignore_errors=True)
+        return len(old)
+
+    def usage(self) -> dict[str, int]:
+        days = self.days()
+        segments = list(self.root.glob("*/*.npy"))
+        rows = sum(np.load(p, mmap_mode="r").shape[0] for p in segments)
+        return {
+            "partitions": len(days),
+            "segments": len(segments),
+            "rows": rows,
+            "bytes": sum(p.stat().st_size for p in self.root.glob("*/*") if p.is_file()),
+        }
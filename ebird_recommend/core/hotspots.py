@@ -0,0 +1,212 @@
+"""Local hotspot catalog with an in-memory spatial index.
+
+Hotspot metadata changes rarely, so instead of asking /ref/hotspot/geo for
+every radius, whole regions are bulk-loaded from /ref/hotspot/{region} into
+one JSON file each under the store directory and indexed on a uniform
+lat/lng grid. Radius and k-nearest queries then run locally. Regions past
+their TTL are re-fetched in the background while the old index keeps
+serving.
+
+The catalog only knows the regions it was configured with: a query is
+answered locally only when every grid cell its circle touches, and every
+cell next to those, holds loaded hotspots. Near a region border the cells
+across it are empty, so such queries fall back to upstream instead of
+silently missing the neighbour's hotspots (as do queries next to large
+empty areas such as open water). Load neighbouring regions too if many
+queries run near borders.
+"""
+
+import json
+import logging
+import math
+import os
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .geo import _KM_PER_DEG_LAT, haversine_np
+from .models import Hotspot
+
+if TYPE_CHECKING:
+    from .client import EBirdClient
+
+log = logging.getLogger(__name__)
+
+_CELL_DEG = 0.25
+# Wait this long before retrying a load that left regions missing or expired.
+_RETRY = timedelta(minutes=10)
+
+
+class HotspotIndex:
+    """Grid index over a fixed set of hotspots."""
+
+    def __init__(self, hotspots: list[Hotspot]):
+        self.hotspots = hotspots
+        self._by_id = {h.loc_id: h for h in hotspots}
+        self.lat = np.array([h.lat for h in hotspots], dtype=np.float64)
+        self.lng = np.array([h.lng for h in hotspots], dtype=np.float64)
+        cells: dict[tuple[int, int], list[int]] = {}
+        for i, (lat, lng) in enumerate(zip(self.lat.tolist(), self.lng.tolist())):
+            cells.setdefault(self._cell(lat, lng), []).append(i)
+        self._cells = {c: np.array(ids, dtype=np.int64) for c, ids in cells.items()}
+        if hotspots:
+            self.bounds = (self.lat.min(), self.lng.min(), self.lat.max(), self.lng.max())
+        else:
+            self.bounds = None
+
+    def __len__(self) -> int:
+        return len(self.hotspots)
+
+    @staticmethod
+    def _cell(lat: float, lng: float) -> tuple[int, int]:
+        return math.floor(lat / _CELL_DEG), math.floor(lng / _CELL_DEG)
+
+    @staticmethod
+    def _span(lat: float, radius_km: float) -> tuple[float, float]:
+        d_lat = radius_km / _KM_PER_DEG_LAT
+        d_lng = radius_km / (_KM_PER_DEG_LAT * max(math.cos(math.radians(min(abs(lat) + d_lat, 90.0))), 0.01))
+        return d_lat, min(d_lng, 180.0)
+
+    def get(self, loc_id: str) -> Hotspot | None:
+        return self._by_id.get(loc_id)
+
+    def covers(self, lat: float, lng: float, radius_km: float) -> bool:
+        """True if the circle is well inside the loaded area.
+
+        Every cell the circle's bounding box touches, plus a one-cell
+        margin, must hold hotspots: a cell straddling a region border is
+        occupied, but its neighbour on the far side is not.
+        """
+        if self.bounds is None:
+            return False
+        d_lat, d_lng = self._span(lat, radius_km)
+        lat0, lng0 = self._cell(lat - d_lat, lng - d_lng)
+        lat1, lng1 = self._cell(lat + d_lat, lng + d_lng)
+        return all(
+            (i, j) in self._cells
+            for i in range(lat0 - 1, lat1 + 2)
+            for j in range(lng0 - 1, lng1 + 2)
+        )
+
+    def _candidates(self, lat: float, lng: float, radius_km: float) -> np.ndarray:
+        d_lat, d_lng = self._span(lat, radius_km)
+        lat0, lng0 = self._cell(lat - d_lat, lng - d_lng)
+        lat1, lng1 = self._cell(lat + d_lat, lng + d_lng)
+        found = [
+            ids
+            for i in range(lat0, lat1 + 1)
+            for j in range(lng0, lng1 + 1)
+            if (ids := self._cells.get((i, j))) is not None
+        ]
+        return np.concatenate(found) if found else np.empty(0, dtype=np.int64)
+
+    def within(self, lat: float, lng: float, radius_km: float) -> list[Hotspot]:
+        """Hotspots within radius_km, nearest first."""
+        ids = self._candidates(lat, lng, radius_km)
+        dist = haversine_np(lat, lng, self.lat[ids], self.lng[ids])
+        inside = dist <= radius_km
+        ids, dist = ids[inside], dist[inside]
+        return [self.hotspots[i] for i in ids[np.argsort(dist, kind="stable")].tolist()]
+
+    def nearest(self, lat: float, lng: float, k: int) -> list[Hotspot]:
+        """The k hotspots closest to lat/lng, nearest first."""
+        k = min(k, len(self.hotspots))
+        if k <= 0:
+            return []
+        radius = 10.0
+        while True:
+            ids = self._candidates(lat, lng, radius)
+            dist = haversine_np(lat, lng, self.lat[ids], self.lng[ids])
+            # Only hits inside the searched circle are guaranteed to be the nearest.
+            inside = dist <= radius
+            if inside.sum() >= k or radius >= 2 * math.pi * 6371:
+                ids, dist = ids[inside], dist[inside]
+                return [self.hotspots[i] for i in ids[np.argsort(dist, kind="stable")[:k]].tolist()]
+            radius *= 4
+
+
+class HotspotCatalog:
+    """Region hotspot lists kept on disk and served from a HotspotIndex."""
+
+    def __init__(self, store_dir: str | Path, regions: list[str], ttl_hours: float = 168.0):
+        self.store_dir = Path(store_dir)
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        self.regions = regions
+        self.ttl = timedelta(hours=ttl_hours)
+        self._index: HotspotIndex | None = None
+        self._fetched_at: dict[str, datetime] = {}
+        self._lock = threading.Lock()
+        self._loading = False
+        self._attempted_at: datetime | None = None
+
+    def index(self, client: "EBirdClient | None" = None, *, wait: bool = False) -> HotspotIndex | None:
+        """The current index, or None before the first load has finished.
+
+        Loads from disk, and fetches missing or expired regions through
+        client, in a background thread unless wait=True. A stale index keeps
+        being returned while it is refreshed.
+        """
+        if self._index is not None and not self._stale():
+            return self._index
+        with self._lock:
+            now = datetime.now()
+            start = not self._loading and (
+                self._attempted_at is None or now - self._attempted_at > _RETRY
+            )
+            if start:
+                self._loading = True
+                self._attempted_at = now
+        if start:
+            if wait:
+                self._load(client)
+            else:
+                threading.Thread(target=self._load, args=(client,), daemon=True, name="hotspot-catalog").start()
+        return self._index
+
+    def _stale(self) -> bool:
+        now = datetime.now()
+        return any(
+            region not in self._fetched_at or now - self._fetched_at[region] > self.ttl
+            for region in self.regions
+        )
+
+    def _path(self, region: str) -> Path:
+        return self.store_dir / f"{region}.json"
+
+    def _load(self, client: "EBirdClient | None") -> None:
+        try:
+            records: list[dict] = []
+            for region in self.regions:
+                data = self._read(region)
+                expired = data is None or datetime.now() - datetime.fromisoformat(data["fetched_at"]) > self.ttl
+                if expired and client is not None:
+                    try:
+                        hotspots = client.region_hotspots(region)
+                        data = self._write(region, [h.model_dump(by_alias=True) for h in hotspots])
+                    except Exception:
+                        log.warning("Could not refresh hotspots for %s", region, exc_info=True)
+                if data is not None:
+                    self._fetched_at[region] = datetime.fromisoformat(data["fetched_at"])
+                    records.extend(data["hotspots"])
+            if records:
+                self._index = HotspotIndex([Hotspot(**h) for h in {h["locId"]: h for h in records}.values()])
+        finally:
+            with self._lock:
+                self._loading = False
+
+    def _read(self, region: str) -> dict | None:
+        try:
+            return json.loads(self._path(region).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, region: str, hotspots: list[dict]) -> dict:
+        data = {"fetched_at": datetime.now().isoformat(), "hotspots": hotspots}
+        path = self._path(region)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(data), encoding="utf-8")
+        os.replace(tmp, path)
+        return data
@@ -0,0 +1,107 @@
+"""Registry of uploaded life lists, addressed by content hash.
+
+The frontend uploads a life list once (PUT /lifelist) and then refers to it
+by id on every /recommend call. Only scientific names matter for scoring,
+so each list is stored as a frozenset of names: a bounded in-memory LRU in
+front of one small JSON file per list. get() returns None once a list has
+been evicted from both tiers, and the client is expected to re-upload.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterable
+
+
+def life_list_id(names: Iterable[str]) -> str:
+    """Content hash of a set of scientific names (order and duplicates ignored)."""
+    h = hashlib.sha256("\n".join(sorted(set(names))).encode())
+    return h.hexdigest()[:32]
+
+
+class LifeListStore:
+    # Prune files every this many new uploads, so the directory may briefly
+    # hold up to max_files + _PRUNE_EVERY lists.
+    _PRUNE_EVERY = 100
+
+    def __init__(
+        self,
+        store_dir: str | Path | None = None,
+        max_entries: int = 256,
+        max_files: int = 10_000,
+    ):
+        self.store_dir = Path(store_dir) if store_dir is not None else None
+        if self.store_dir is not None:
+            self.store_dir.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.max_files = max_files
+        self._lists: OrderedDict[str, frozenset[str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def put(self, names: Iterable[str]) -> tuple[str, frozenset[str]]:
+        """Store a life list; returns its id and the stored name set."""
+        seen = frozenset(names)
+        list_id = life_list_id(seen)
+        self._remember(list_id, seen)
+        if self.store_dir is not None:
+            path = self._path(list_id)
+            if path.exists():
+                path.touch()
+            else:
+                tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+                tmp.write_text(json.dumps(sorted(seen)), encoding="utf-8")
+                os.replace(tmp, path)
+                with self._lock:
+                    self._writes += 1
+                    prune = self._writes % self._PRUNE_EVERY == 0
+                if prune:
+                    self._prune()
+        return list_id, seen
+
+    def get(self, list_id: str) -> frozenset[str] | None:
+        with self._lock:
+            seen = self._lists.get(list_id)
+            if seen is not None:
+                self._lists.move_to_end(list_id)
+                return seen
+        if self.store_dir is None or not list_id.isalnum():
+            return None
+        path = self._path(list_id)
+        try:
+            seen = frozenset(json.loads(path.read_text(encoding="utf-8")))
+        except (OSError, ValueError):
+            return None
+        path.touch()
+        self._remember(list_id, seen)
+        return seen
+
+    def _path(self, list_id: str) -> Path:
+        return self.store_dir / f"{list_id}.json"
+
+    def _remember(self, list_id: str, seen: frozenset[str]) -> None:
+        with self._lock:
+            self._lists[list_id] = seen
+            self._lists.move_to_end(list_id)
+            while len(self._lists) > self.max_entries:
+                self._lists.popitem(last=False)
+
+    def _prune(self) -> None:
+        """Drop the least recently used files beyond max_files."""
+        files = list(self.store_dir.glob("*.json"))
+        if len(files) <= self.max_files:
+            return
+        files.sort(key=_mtime)
+        for f in files[: len(files) - self.max_files]:
+            f.unlink(missing_ok=True)
+
+
+def _mtime(path: Path) -> float:
+    # Another process may prune the same directory concurrently.
+    try:
+        return path.stat().st_mtime
+    except FileNotFoundError:
+        return 0.0
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, model_validator
 from pydantic.alias_generators import to_camel
 from datetime import date
 from typing import Literal, Optional
@@ -55,8 +55,12 @@ FilterMode = Literal["all", "yes", "no"]
 
 
 class RecommendRequest(BaseModel):
-    """Request body for POST /recommend — life list parsed and stored by the frontend."""
-    life_list: list[SeenSpecies]
+    """Request body for POST /recommend — life list parsed and stored by the frontend.
+
+    Send either the full life_list or the life_list_id returned by PUT /lifelist.
+    """
+    life_list: Optional[list[SeenSpecies]] = None
+    life_list_id: Optional[str] = None
     lat: float
     lng: float
     radius: int = 50
@@ -65,6 +69,45 @@ class RecommendRequest(BaseModel):
     lifer: FilterMode = "all"    # "all" | "yes" = lifers only | "no" = seen only
     notable: FilterMode = "all"  # "all" | "yes" = rare only   | "no" = non-rare only
 
+    @model_validator(mode="after")
+    def _require_life_list(self) -> "RecommendRequest":
+        if self.life_list is None and self.life_list_id is None:
+            raise ValueError("Provide either life_list or life_list_id")
+        return self
+
+
+class Origin(BaseModel):
+    """One point of a batch recommendation request."""
+    lat: float
+    lng: float
+    radius: int = 50
+
+
+class BatchRecommendRequest(BaseModel):
+    """Request body for POST /recommend/batch — one life list, many origins.
+
+    days, top and the filters apply to every origin.
+    """
+    life_list: Optional[list[SeenSpecies]] = None
+    life_list_id: Optional[str] = None
+    origins: list[Origin] = Field(min_length=1, max_length=50)
+    days: int = 14
+    top: int = 20
+    lifer: FilterMode = "all"
+    notable: FilterMode = "all"
+
+    @model_validator(mode="after")
+    def _require_life_list(self) -> "BatchRecommendRequest":
+        if self.life_list is None and self.life_list_id is None:
+            raise ValueError("Provide either life_list or life_list_id")
+        return self
+
+
+class LifeListRef(BaseModel):
+    """Response of PUT /lifelist: the id to send as RecommendRequest.life_list_id."""
+    life_list_id: str
+    species: int
+
 
 class Recommendation(BaseModel):
     """A recommended (species, location) pair with a score."""
@@ -85,6 +128,14 @@ class Recommendation(BaseModel):
     # Links
     species_url: str = ""
     hotspot_url: str = ""
+    # Hotspot metadata, filled in from a local HotspotCatalog when available
+    num_species_all_time: Optional[int] = None
+
+
+class BatchRecommendation(BaseModel):
+    """Recommendations for one origin of a batch request."""
+    origin: Origin
+    recommendations: list[Recommendation]
 
 
 class Checklist(BaseModel):
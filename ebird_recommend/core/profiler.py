@@ -0,0 +1,111 @@
+"""Low-overhead sampling profiler with flamegraph-ready output.
+
+SamplingProfiler wakes every interval seconds on a background thread, takes
+the Python stack of each watched thread from sys._current_frames() and
+counts identical stacks. Nothing is traced, so the profiled code runs at
+full speed apart from the sampler's share of the GIL.
+
+write() saves the counts in the "folded" format, one stack per line:
+
+    MainThread;run (asyncio/base_events.py:640);recommend (ebird_recommend/core/recommender.py:89) 42
+
+which flamegraph.pl, inferno and speedscope.app read directly.
+"""
+
+import os
+import sys
+import threading
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+from typing import Callable, Iterable
+
+# Leaf frames of threads that are idle: waiting for work, a lock or I/O.
+_IDLE = {
+    ("threading.py", "Condition.wait"),
+    ("selectors.py", "EpollSelector.select"),
+    ("selectors.py", "KqueueSelector.select"),
+    ("selectors.py", "SelectSelector.select"),
+    ("queue.py", "Queue.get"),
+    ("thread.py", "_worker"),
+}
+
+_PREFIXES = sorted({os.path.dirname(os.__file__), *sys.path}, key=len, reverse=True)
+
+
+def _short(filename: str) -> str:
+    for prefix in _PREFIXES:
+        if prefix and filename.startswith(prefix):
+            return filename[len(prefix):].lstrip("/\\").replace("\\", "/").removeprefix("site-packages/")
+    return filename
+
+
+class SamplingProfiler:
+    """Sample the stacks of some threads (default: all but the sampler) until stopped."""
+
+    def __init__(self, threads: Callable[[], Iterable[int]] | None = None, interval: float = 0.002):
+        self.threads = threads
+        self.interval = interval
+        self.samples: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._labels: dict[tuple, str] = {}
+
+    def start(self) -> "SamplingProfiler":
+        self._thread = threading.Thread(target=self._run, name="ebird-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "SamplingProfiler":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            names = {t.ident: t.name for t in threading.enumerate()}
+            idents = self.threads() if self.threads is not None else frames.keys()
+            for ident in list(idents):
+                frame = frames.get(ident)
+                if frame is None or ident == own:
+                    continue
+                stack = self._stack(frame)
+                if stack:
+                    self.samples[f"{names.get(ident, ident)};{stack}"] += 1
+
+    def _label(self, frame: FrameType) -> str:
+        code = frame.f_code
+        key = (code.co_filename, code.co_firstlineno, code.co_qualname)
+        label = self._labels.get(key)
+        if label is None:
+            label = f"{code.co_qualname} ({_short(code.co_filename)}:{code.co_firstlineno})".replace(";", ":")
+            self._labels[key] = label
+        return label
+
+    def _stack(self, frame: FrameType) -> str | None:
+        """Root-first ';'-joined frames, or None if the thread is idle."""
+        leaf = frame.f_code
+        if (os.path.basename(leaf.co_filename), leaf.co_qualname) in _IDLE:
+            return None
+        labels = []
+        while frame is not None:
+            labels.append(self._label(frame))
+            frame = frame.f_back
+        return ";".join(reversed(labels))
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+    def write(self, path: str | Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(self.folded(), encoding="utf-8")
+        return path
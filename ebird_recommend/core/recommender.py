@@ -4,32 +4,43 @@ Given the user's life list and nearby eBird observations, produce a ranked
 list of (species, location) pairs worth chasing.
 """
 
-import math
+import bisect
+import heapq
+import re
+import time
+from collections.abc import Set
 from datetime import date, datetime
 from collections import defaultdict
+from typing import NamedTuple
 
-from .models import Observation, NotableObservation, SeenSpecies, Recommendation, EBIRD_WEB
+import numpy as np
+
+from . import metrics
+from .columns import ObsColumns
+from .geo import haversine, haversine_matrix, haversine_np
+from .models import FilterMode, Observation, NotableObservation, SeenSpecies, Recommendation, EBIRD_WEB
+from .timing import phase
 
 
 # ---------------------------------------------------------------------------
-# Geometry
+# Scoring
 # ---------------------------------------------------------------------------
 
-def haversine(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
-    """Return great-circle distance in kilometres."""
-    R = 6371.0
-    φ1, φ2 = math.radians(lat1), math.radians(lat2)
-    dφ = math.radians(lat2 - lat1)
-    dλ = math.radians(lng2 - lng1)
-    a = math.sin(dφ / 2) ** 2 + math.cos(φ1) * math.cos(φ2) * math.sin(dλ / 2) ** 2
-    return R * 2 * math.asin(math.sqrt(a))
+# eBird's own "YYYY-MM-DD[ HH:MM]"; other spellings go through strptime.
+_OBS_DT = re.compile(r"\d{4}-\d{2}-\d{2}(?: (?:[01]\d|2[0-3]):[0-5]\d)?", re.ASCII)
 
 
-# ---------------------------------------------------------------------------
-# Scoring
-# ---------------------------------------------------------------------------
+def _is_canonical(obs_dt: str) -> bool:
+    m = _OBS_DT.match(obs_dt)
+    return m is not None and (m.end() == 16 or len(obs_dt) == 10)
+
 
 def _parse_obs_date(obs_dt: str) -> date | None:
+    if _is_canonical(obs_dt):
+        try:
+            return date(int(obs_dt[:4]), int(obs_dt[5:7]), int(obs_dt[8:10]))
+        except ValueError:
+            pass
     for fmt in ("%Y-%m-%d %H:%M", "%Y-%m-%d"):
         try:
             return datetime.strptime(obs_dt[:16], fmt).date()
@@ -38,6 +49,23 @@ def _parse_obs_date(obs_dt: str) -> date | None:
     return None
 
 
+def _obs_days(values: list[str]) -> np.ndarray:
+    """Day ordinals of obs_dt strings as _parse_obs_date reads them, -1 if unparseable.
+
+    Canonical strings only differ in the time, so each distinct day is parsed once.
+    """
+    by_day: dict[str, int] = {}
+    out = np.empty(len(values), dtype=np.int64)
+    for i, v in enumerate(values):
+        key = v[:10] if _is_canonical(v) else v
+        day = by_day.get(key)
+        if day is None:
+            d = _parse_obs_date(key)
+            day = by_day[key] = d.toordinal() if d else -1
+        out[i] = day
+    return out
+
+
 def score(
     days_ago: int,
     report_count: int,
@@ -86,21 +114,152 @@ def _reason(is_lifer: bool, is_notable: bool, days_ago: int, report_count: int)
 # Main recommendation function
 # ---------------------------------------------------------------------------
 
+# Membership is all that matters: scientific_name → SeenSpecies, or just the names.
+Seen = dict[str, SeenSpecies] | Set[str]
+
+# Below this many observations the per-row Python path beats NumPy's setup cost.
+_VECTORIZE_MIN_ROWS = 500
+
+_RECOMMEND_SECONDS = metrics.Histogram(
+    "ebird_recommend_seconds", "recommend() duration by engine (numpy or python).", ("engine",)
+)
+_RECOMMEND_OBSERVATIONS = metrics.Histogram(
+    "ebird_recommend_observations", "Observations (recent plus notable) scored per recommend() call.",
+    buckets=metrics.COUNT_BUCKETS,
+)
+_RECOMMEND_RESULTS = metrics.Histogram(
+    "ebird_recommend_results", "Recommendations returned per recommend() call.",
+    buckets=metrics.COUNT_BUCKETS,
+)
+
+
 def recommend(
     user_lat: float,
     user_lng: float,
-    seen: dict[str, SeenSpecies],          # scientific_name → SeenSpecies
-    all_obs: list[Observation],
-    notable_obs: list[NotableObservation],
+    seen: Seen,
+    all_obs: list[Observation] | ObsColumns,
+    notable_obs: list[NotableObservation] | ObsColumns,
     max_dist_km: float,
+    *,
+    lifer: FilterMode = "all",
+    notable: FilterMode = "all",
+    top: int | None = None,
+    as_of: date | None = None,
 ) -> list[Recommendation]:
-    """Return all recommended (species, location) pairs, ranked by score.
+    """Return recommended (species, location) pairs, best location per species, ranked by score.
 
-    Filtering and top-N truncation are the caller's responsibility,
-    so they happen after any post-processing filters.
+    lifer/notable ("all" | "yes" | "no") filter on the species' best location,
+    exactly as if applied to the full ranked list; top keeps only the first N.
+    Rows are filtered and the best N selected before any Recommendation is
+    built, while "+N spots" still counts every location of the species.
+
+    Observations may be pydantic models or lean ObsColumns (see EBirdClient).
+    Recency is measured from as_of (default today), e.g. the end of a
+    historical window.
     """
+    start = time.perf_counter()
+    rows = len(all_obs) + len(notable_obs)
+    with phase("recommend"):
+        if rows >= _VECTORIZE_MIN_ROWS:
+            engine = "numpy"
+            recs = _recommend_numpy(
+                user_lat, user_lng, seen, _as_columns(all_obs), _as_columns(notable_obs),
+                max_dist_km, lifer, notable, top, as_of,
+            )
+        else:
+            engine = "python"
+            recs = _recommend_python(
+                user_lat, user_lng, seen, _as_rows(all_obs), _as_rows(notable_obs),
+                max_dist_km, lifer, notable, top, as_of,
+            )
+    _RECOMMEND_SECONDS.labels(engine).observe(time.perf_counter() - start)
+    _RECOMMEND_OBSERVATIONS.observe(rows)
+    _RECOMMEND_RESULTS.observe(len(recs))
+    return recs
+
+
+def _as_columns(obs: list[Observation] | ObsColumns) -> ObsColumns:
+    return obs if isinstance(obs, ObsColumns) else ObsColumns.from_models(obs)
+
+
+def _as_rows(obs: list[Observation] | ObsColumns) -> list:
+    return list(obs.records()) if isinstance(obs, ObsColumns) else obs
+
+
+def _keep(flag: bool, mode: FilterMode) -> bool:
+    return mode == "all" or flag == (mode == "yes")
+
+
+def _make_recommendation(
+    species_code: str,
+    common_name: str,
+    scientific_name: str,
+    loc_id: str,
+    loc_name: str,
+    lat: float,
+    lng: float,
+    dist: float,
+    last_date: date,
+    days_ago: int,
+    report_count: int,
+    is_notable: bool,
+    is_lifer: bool,
+    score: float,
+    other_spots: int,
+) -> Recommendation:
+    reason = _reason(is_lifer, is_notable, days_ago, report_count)
+    # "also at N other spots"
+    if other_spots > 0:
+        reason += f" | +{other_spots} spot{'s' if other_spots > 1 else ''}"
+    return Recommendation(
+        species_code=species_code,
+        common_name=common_name,
+        scientific_name=scientific_name,
+        loc_id=loc_id,
+        loc_name=loc_name,
+        lat=lat,
+        lng=lng,
+        distance_km=round(dist, 1),
+        last_reported=str(last_date),
+        report_count=report_count,
+        is_notable=is_notable,
+        is_lifer=is_lifer,
+        score=score,
+        reason=reason,
+        species_url=f"{EBIRD_WEB}/species/{species_code}",
+        hotspot_url=f"{EBIRD_WEB}/hotspot/{loc_id}",
+    )
+
+
+class _Candidate(NamedTuple):
+    score: float
+    order: int          # first-occurrence rank of the (species, loc) pair; breaks score ties
+    species_code: str
+    loc_id: str
+    bucket: dict
+    is_notable: bool
+    is_lifer: bool
+    last_date: date
+    days_ago: int
+    report_count: int
+    dist: float
+
+
+def _recommend_python(
+    user_lat: float,
+    user_lng: float,
+    seen: Seen,
+    all_obs: list[Observation],
+    notable_obs: list[NotableObservation],
+    max_dist_km: float,
+    lifer: FilterMode = "all",
+    notable: FilterMode = "all",
+    top: int | None = None,
+    as_of: date | None = None,
+) -> list[Recommendation]:
+    """Reference implementation: aggregate and score row by row."""
 
-    today = date.today()
+    today = as_of or date.today()
 
     # Build a set of notable (speciesCode, locId) for O(1) lookup
     notable_keys: set[tuple[str, str]] = {
@@ -120,6 +279,10 @@ def recommend(
     })
 
     for obs in all_obs + list(notable_obs):  # type: ignore[operator]
+        # Lifer status is per species, so filtering rows here leaves every
+        # remaining species' locations (and "+N spots" counts) intact.
+        if not _keep(obs.scientific_name not in seen, lifer):
+            continue
         key: Key = (obs.species_code, obs.loc_id)
         bucket = agg[key]
         bucket["common_name"] = obs.common_name
@@ -131,14 +294,13 @@ def recommend(
         if d:
             bucket["dates"].append(d)
 
-    # Build recommendations
-    recs: list[Recommendation] = []
-
-    for (species_code, loc_id), bucket in agg.items():
-        sci = bucket["scientific_name"]
-        is_lifer = sci not in seen
-        is_notable = (species_code, loc_id) in notable_keys
+    # Deduplicate by species: keep the best-scored location per species.
+    # Score already encodes both distance penalty and frequency bonus,
+    # so the top entry naturally reflects the optimal distance/reliability balance.
+    best: dict[str, _Candidate] = {}
+    spots: dict[str, int] = defaultdict(int)   # species_code → number of locations
 
+    for order, ((species_code, loc_id), bucket) in enumerate(agg.items()):
         dates = bucket["dates"]
         if not dates:
             continue
@@ -148,45 +310,517 @@ def recommend(
 
         dist = haversine(user_lat, user_lng, bucket["lat"], bucket["lng"])
 
-        s = score(days_ago, report_count, dist, max_dist_km)
-
-        recs.append(Recommendation(
+        c = _Candidate(
+            score=score(days_ago, report_count, dist, max_dist_km),
+            order=order,
             species_code=species_code,
-            common_name=bucket["common_name"],
-            scientific_name=sci,
             loc_id=loc_id,
-            loc_name=bucket["loc_name"],
-            lat=bucket["lat"],
-            lng=bucket["lng"],
-            distance_km=round(dist, 1),
-            last_reported=str(last_date),
+            bucket=bucket,
+            is_notable=(species_code, loc_id) in notable_keys,
+            is_lifer=bucket["scientific_name"] not in seen,
+            last_date=last_date,
+            days_ago=days_ago,
             report_count=report_count,
-            is_notable=is_notable,
-            is_lifer=is_lifer,
-            score=s,
-            reason=_reason(is_lifer, is_notable, days_ago, report_count),
-            species_url=f"{EBIRD_WEB}/species/{species_code}",
-            hotspot_url=f"{EBIRD_WEB}/hotspot/{loc_id}",
+            dist=dist,
+        )
+        spots[species_code] += 1
+        current = best.get(species_code)
+        if current is None or c.score > current.score:   # earlier pair wins ties
+            best[species_code] = c
+
+    winners = [c for c in best.values() if _keep(c.is_notable, notable)]
+    rank_key = lambda c: (-c.score, c.order)
+    if top is not None and top < len(winners):
+        winners = heapq.nsmallest(top, winners, key=rank_key)
+    else:
+        winners.sort(key=rank_key)
+
+    return [
+        _make_recommendation(
+            c.species_code,
+            c.bucket["common_name"],
+            c.bucket["scientific_name"],
+            c.loc_id,
+            c.bucket["loc_name"],
+            c.bucket["lat"],
+            c.bucket["lng"],
+            c.dist,
+            c.last_date,
+            c.days_ago,
+            c.report_count,
+            c.is_notable,
+            c.is_lifer,
+            c.score,
+            spots[c.species_code] - 1,
+        )
+        for c in winners
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Columnar engine
+# ---------------------------------------------------------------------------
+
+def _factorize(values: list) -> tuple[np.ndarray, list]:
+    """Map values to dense int codes in first-occurrence order."""
+    codes: dict = {}
+    idx = np.fromiter(
+        (codes.setdefault(v, len(codes)) for v in values), dtype=np.int64, count=len(values),
+    )
+    return idx, list(codes)
+
+
+def _top_k(scores: np.ndarray, order: np.ndarray, k: int | None) -> np.ndarray:
+    """Indices of the k best entries by (score desc, order asc), in ranked order."""
+    if k is not None and k < len(scores):
+        # Partial selection: everything scoring at least the k-th best, ties included.
+        threshold = -np.partition(-scores, k - 1)[k - 1]
+        pool = np.flatnonzero(scores >= threshold)
+        return pool[np.lexsort((order[pool], -scores[pool]))][:k]
+    return np.lexsort((order, -scores))
+
+
+class _Groups(NamedTuple):
+    """Per-(species, location) aggregates of an observation set, in first-occurrence order."""
+    cols: ObsColumns
+    sp_codes: list
+    order: np.ndarray          # first row of each group; breaks score ties
+    last_row: np.ndarray       # row supplying display attributes
+    last_day: np.ndarray       # ordinal of the latest dated report
+    report_count: np.ndarray
+    is_notable: np.ndarray
+    species: np.ndarray        # index into sp_codes
+    lat: np.ndarray
+    lng: np.ndarray
+
+
+def _aggregate(
+    all_obs: ObsColumns,
+    notable_obs: ObsColumns,
+    seen: Seen,
+    lifer: FilterMode,
+) -> _Groups | None:
+    """Group rows by (species_code, loc_id), dropping groups without a dated report."""
+    cols = all_obs + notable_obs
+    is_notable_row = np.zeros(len(cols), dtype=bool)
+    is_notable_row[len(all_obs):] = True
+
+    if lifer != "all":
+        sci_idx, sci_names = _factorize(cols.scientific_name)
+        lifer_name = np.array([name not in seen for name in sci_names], dtype=bool)
+        mask = lifer_name[sci_idx] == (lifer == "yes")
+        cols = cols.take(np.flatnonzero(mask).tolist())
+        is_notable_row = is_notable_row[mask]
+
+    n = len(cols)
+    if n == 0:
+        return None
+
+    # Group by (species_code, loc_id); group ids follow first occurrence,
+    # which is the tie-break order of the reference implementation.
+    sp_idx, sp_codes = _factorize(cols.species_code)
+    loc_idx, loc_ids = _factorize(cols.loc_id)
+    pair = sp_idx * len(loc_ids) + loc_idx
+    _, first_row, inverse = np.unique(pair, return_index=True, return_inverse=True)
+    order = np.argsort(first_row, kind="stable")
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    group = rank[inverse.ravel()]
+    n_groups = len(order)
+
+    day = _obs_days(cols.obs_dt)
+
+    last_day = np.full(n_groups, -1, dtype=np.int64)
+    np.maximum.at(last_day, group, day)
+    report_count = np.bincount(group, weights=day >= 0, minlength=n_groups).astype(np.int64)
+    is_notable = np.bincount(group, weights=is_notable_row, minlength=n_groups) > 0
+    # Display attributes come from the last row of each group.
+    last_row = np.zeros(n_groups, dtype=np.int64)
+    np.maximum.at(last_row, group, np.arange(n))
+
+    keep = np.flatnonzero(report_count > 0)
+    if len(keep) == 0:
+        return None
+    last_row = last_row[keep]
+    return _Groups(
+        cols=cols,
+        sp_codes=sp_codes,
+        order=keep,
+        last_row=last_row,
+        last_day=last_day[keep],
+        report_count=report_count[keep],
+        is_notable=is_notable[keep],
+        species=sp_idx[last_row],
+        lat=np.asarray(cols.lat, dtype=np.float64)[last_row],
+        lng=np.asarray(cols.lng, dtype=np.float64)[last_row],
+    )
+
+
+def _rank(
+    g: _Groups,
+    sel: np.ndarray,
+    dist: np.ndarray,
+    max_dist_km: float,
+    seen: Seen,
+    notable: FilterMode,
+    top: int | None,
+    as_of: date | None = None,
+) -> list[Recommendation]:
+    """Score the groups sel (at distances dist) and build the ranked winners."""
+    if len(sel) == 0:
+        return []
+    last_day = g.last_day[sel]
+    report_count = g.report_count[sel]
+    is_notable = g.is_notable[sel]
+    g_species = g.species[sel]
+    order = g.order[sel]
+
+    days_ago = (as_of or date.today()).toordinal() - last_day
+    recency = np.select(
+        [days_ago <= 1, days_ago <= 3, days_ago <= 7, days_ago <= 14], [15.0, 10.0, 5.0, 2.0], 0.0,
+    )
+    raw = recency + np.minimum(report_count, 8) * 1.5 - (dist / max_dist_km) * 10
+    # Python's round() to match score() exactly; ties in the rounded value decide order.
+    scores = np.array([round(v, 2) for v in raw.tolist()])
+
+    # Best group per species without sorting: the max score, earliest group on ties.
+    n_species = len(g.sp_codes)
+    best_score = np.full(n_species, -np.inf)
+    np.maximum.at(best_score, g_species, scores)
+    at_best = np.flatnonzero(scores == best_score[g_species])
+    best_group = np.full(n_species, len(sel), dtype=np.int64)
+    np.minimum.at(best_group, g_species[at_best], at_best)
+    best = best_group[best_group < len(sel)]
+    spots = np.bincount(g_species, minlength=n_species)
+
+    if notable != "all":
+        best = best[is_notable[best] == (notable == "yes")]
+    best = best[_top_k(scores[best], order[best], top)]
+
+    cols = g.cols
+    recs: list[Recommendation] = []
+    for i in best.tolist():
+        row = int(g.last_row[sel[i]])
+        sp = g_species[i]
+        sci = cols.scientific_name[row]
+        recs.append(_make_recommendation(
+            g.sp_codes[sp],
+            cols.common_name[row],
+            sci,
+            cols.loc_id[row],
+            cols.loc_name[row],
+            cols.lat[row],
+            cols.lng[row],
+            float(dist[i]),
+            date.fromordinal(int(last_day[i])),
+            int(days_ago[i]),
+            int(report_count[i]),
+            bool(is_notable[i]),
+            sci not in seen,
+            float(scores[i]),
+            int(spots[sp]) - 1,
         ))
+    return recs
 
-    recs.sort(key=lambda r: r.score, reverse=True)
 
-    # Deduplicate by species: keep the best-scored location per species.
-    # Score already encodes both distance penalty and frequency bonus,
-    # so the top entry naturally reflects the optimal distance/reliability balance.
-    seen_codes: dict[str, int] = {}   # species_code → count of other locations
-    deduped: list[Recommendation] = []
-    for r in recs:
-        if r.species_code not in seen_codes:
-            seen_codes[r.species_code] = 0
-            deduped.append(r)
-        else:
-            seen_codes[r.species_code] += 1
+def _recommend_numpy(
+    user_lat: float,
+    user_lng: float,
+    seen: Seen,
+    all_obs: ObsColumns,
+    notable_obs: ObsColumns,
+    max_dist_km: float,
+    lifer: FilterMode = "all",
+    notable: FilterMode = "all",
+    top: int | None = None,
+    as_of: date | None = None,
+) -> list[Recommendation]:
+    """Same result as _recommend_python, computed with array operations.
+
+    Only the returned winners are turned into Recommendation objects.
+    """
+    with phase("aggregate"):
+        g = _aggregate(all_obs, notable_obs, seen, lifer)
+    if g is None:
+        return []
+    with phase("rank"):
+        dist = haversine_np(user_lat, user_lng, g.lat, g.lng)
+        return _rank(g, np.arange(len(g.order)), dist, max_dist_km, seen, notable, top, as_of)
+
+
+def recommend_batch(
+    origins: list[tuple[float, float, float]],
+    seen: Seen,
+    all_obs: list[Observation] | ObsColumns,
+    notable_obs: list[NotableObservation] | ObsColumns,
+    *,
+    lifer: FilterMode = "all",
+    notable: FilterMode = "all",
+    top: int | None = None,
+) -> list[list[Recommendation]]:
+    """recommend() for many (lat, lng, radius_km) origins over one shared observation set.
+
+    Observations are aggregated once; distances from every origin to every
+    location are computed in one array operation, and each origin is scored
+    on the locations within its own radius. Results are in origin order.
+    """
+    g = _aggregate(_as_columns(all_obs), _as_columns(notable_obs), seen, lifer)
+    if g is None or not origins:
+        return [[] for _ in origins]
+    o_lat, o_lng, o_radius = (np.array(v, dtype=np.float64) for v in zip(*origins))
+    dist = haversine_matrix(o_lat, o_lng, g.lat, g.lng)
+    within = dist <= o_radius[:, None]
+    return [
+        _rank(g, np.flatnonzero(within[k]), dist[k][within[k]], o_radius[k], seen, notable, top)
+        for k in range(len(origins))
+    ]
 
-    # Append "also at N other spots" to the reason of deduplicated entries
-    for r in deduped:
-        n = seen_codes.get(r.species_code, 0)
-        if n > 0:
-            r.reason += f" | +{n} spot{'s' if n > 1 else ''}"
 
-    return deduped
+# ---------------------------------------------------------------------------
+# Incremental index
+# ---------------------------------------------------------------------------
+
+# days_ago values at which score()'s recency bonus changes on the next day.
+_RECENCY_STEPS = (1, 3, 7, 14)
+
+
+class _Pair:
+    """Aggregate of one (species_code, loc_id) pair in a RecommendationIndex."""
+
+    __slots__ = (
+        "species_code", "loc_id", "common_name", "scientific_name", "loc_name",
+        "lat", "lng", "dist", "order", "days", "count", "notable", "last_day", "score", "ranked",
+    )
+
+    def __init__(self, species_code: str, loc_id: str, order: int):
+        self.species_code = species_code
+        self.loc_id = loc_id
+        self.order = order
+        self.days: dict[int, int] = {}    # date ordinal → reports that day
+        self.count = 0
+        self.notable = 0                  # notable rows among them
+        self.last_day = -1
+        self.score = 0.0
+        self.ranked = False
+
+
+class RecommendationIndex:
+    """recommend() for a fixed origin, maintained incrementally.
+
+    Holds the per-(species, location) aggregates of an observation window
+    and each species' locations ordered by score. insert() and expire()
+    take observation deltas (e.g. what a refresh added or dropped) and
+    roll() advances the day, expiring rows that left the window and
+    rescoring only pairs whose recency bonus changes; each costs time in
+    the size of the change, not of the window. recommend() then walks the
+    ranking until it has top entries.
+
+    Rows are identified by (sub_id, species_code) and whether they came
+    from the notable feed, so re-inserting a known row is a no-op, and a
+    notable row counts alongside its ordinary copy, as in recommend().
+    Equal scores are ordered by when the pair first entered the index.
+    """
+
+    def __init__(
+        self,
+        user_lat: float,
+        user_lng: float,
+        max_dist_km: float,
+        back: int = 14,
+        today: date | None = None,
+    ):
+        self.user_lat = user_lat
+        self.user_lng = user_lng
+        self.max_dist_km = max_dist_km
+        self.back = back
+        self.today = (today or date.today()).toordinal()
+        self._pairs: dict[tuple[str, str], _Pair] = {}
+        self._rows: dict[tuple, tuple[_Pair, int]] = {}      # row id → (pair, day)
+        self._rows_by_day: dict[int, set[tuple]] = defaultdict(set)
+        self._pairs_by_last_day: dict[int, set[_Pair]] = defaultdict(set)
+        # species_code → [(-score, order, loc_id)], best first
+        self._locations: dict[str, list[tuple[float, int, str]]] = {}
+        # [(-score, order, species_code)] of each species' best location, best first
+        self._ranking: list[tuple[float, int, str]] = []
+        self._next_order = 0
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    # -- deltas -------------------------------------------------------------
+
+    def insert(self, obs: list[Observation] | ObsColumns, *, notable: bool = False) -> int:
+        """Add observations; returns how many were new."""
+        cutoff = self.today - self.back
+        added = 0
+        for o in _as_rows(obs):
+            row_id = (o.sub_id or (o.loc_id, o.obs_dt), o.species_code, notable)
+            if row_id in self._rows:
+                continue
+            d = _parse_obs_date(o.obs_dt)
+            if d is None or d.toordinal() < cutoff:
+                continue
+            day = d.toordinal()
+            key = (o.species_code, o.loc_id)
+            pair = self._pairs.get(key)
+            if pair is None:
+                pair = self._pairs[key] = _Pair(o.species_code, o.loc_id, self._next_order)
+                self._next_order += 1
+                pair.dist = haversine(self.user_lat, self.user_lng, o.lat, o.lng)
+            # Display attributes follow the latest row, as in recommend().
+            pair.common_name = o.common_name
+            pair.scientific_name = o.scientific_name
+            pair.loc_name = o.loc_name
+            pair.lat = o.lat
+            pair.lng = o.lng
+
+            self._rows[row_id] = (pair, day)
+            self._rows_by_day[day].add(row_id)
+            pair.days[day] = pair.days.get(day, 0) + 1
+            pair.count += 1
+            pair.notable += notable
+            self._set_last_day(pair, max(pair.last_day, day))
+            self._rescore(pair)
+            added += 1
+        return added
+
+    def expire(self, obs: list[Observation] | ObsColumns, *, notable: bool = False) -> int:
+        """Remove observations; returns how many were present."""
+        removed = 0
+        for o in _as_rows(obs):
+            removed += self._remove((o.sub_id or (o.loc_id, o.obs_dt), o.species_code, notable))
+        return removed
+
+    def roll(self, today: date | None = None) -> None:
+        """Advance to today: expire rows older than the window and rescore recency changes."""
+        new_today = (today or date.today()).toordinal()
+        if new_today <= self.today:
+            return
+        old_today, self.today = self.today, new_today
+
+        for day in [d for d in self._rows_by_day if d < new_today - self.back]:
+            for row_id in list(self._rows_by_day[day]):
+                self._remove(row_id)
+
+        # A pair's score only changes when days_ago crosses a recency step.
+        stale_days = {
+            t - step - 1
+            for t in range(old_today + 1, new_today + 1)
+            for step in _RECENCY_STEPS
+        }
+        for day in stale_days:
+            for pair in list(self._pairs_by_last_day.get(day, ())):
+                self._rescore(pair)
+
+    def _remove(self, row_id: tuple) -> int:
+        entry = self._rows.pop(row_id, None)
+        if entry is None:
+            return 0
+        pair, day = entry
+        day_rows = self._rows_by_day[day]
+        day_rows.discard(row_id)
+        if not day_rows:
+            del self._rows_by_day[day]
+
+        pair.count -= 1
+        pair.notable -= row_id[2]
+        if pair.days[day] == 1:
+            del pair.days[day]
+        else:
+            pair.days[day] -= 1
+
+        if pair.count == 0:
+            self._set_last_day(pair, -1)
+            self._unrank(pair)
+            del self._pairs[(pair.species_code, pair.loc_id)]
+        else:
+            self._set_last_day(pair, max(pair.days))
+            self._rescore(pair)
+        return 1
+
+    # -- ordering -------------------------------------------------------------
+
+    def _set_last_day(self, pair: _Pair, day: int) -> None:
+        if day == pair.last_day:
+            return
+        if pair.last_day >= 0:
+            self._pairs_by_last_day[pair.last_day].discard(pair)
+        pair.last_day = day
+        if day >= 0:
+            self._pairs_by_last_day[day].add(pair)
+
+    def _rescore(self, pair: _Pair) -> None:
+        new = score(self.today - pair.last_day, pair.count, pair.dist, self.max_dist_km)
+        if pair.ranked:
+            if new == pair.score:
+                return
+            self._unrank(pair)
+        pair.score = new
+        self._rank_in(pair)
+
+    def _rank_in(self, pair: _Pair) -> None:
+        locations = self._locations.setdefault(pair.species_code, [])
+        old_best = locations[0] if locations else None
+        bisect.insort(locations, (-pair.score, pair.order, pair.loc_id))
+        pair.ranked = True
+        self._update_species(pair.species_code, old_best)
+
+    def _unrank(self, pair: _Pair) -> None:
+        locations = self._locations[pair.species_code]
+        old_best = locations[0]
+        entry = (-pair.score, pair.order, pair.loc_id)
+        del locations[bisect.bisect_left(locations, entry)]
+        pair.ranked = False
+        if not locations:
+            del self._locations[pair.species_code]
+        self._update_species(pair.species_code, old_best)
+
+    def _update_species(self, species_code: str, old_best: tuple | None) -> None:
+        locations = self._locations.get(species_code)
+        new_best = locations[0] if locations else None
+        if new_best == old_best:
+            return
+        if old_best is not None:
+            entry = (old_best[0], old_best[1], species_code)
+            del self._ranking[bisect.bisect_left(self._ranking, entry)]
+        if new_best is not None:
+            bisect.insort(self._ranking, (new_best[0], new_best[1], species_code))
+
+    # -- queries --------------------------------------------------------------
+
+    def recommend(
+        self,
+        seen: Seen,
+        *,
+        lifer: FilterMode = "all",
+        notable: FilterMode = "all",
+        top: int | None = None,
+    ) -> list[Recommendation]:
+        """Same contract as recommend() over the indexed window."""
+        recs: list[Recommendation] = []
+        for _, _, species_code in self._ranking:
+            if top is not None and len(recs) >= top:
+                break
+            locations = self._locations[species_code]
+            pair = self._pairs[(species_code, locations[0][2])]
+            is_lifer = pair.scientific_name not in seen
+            if not (_keep(is_lifer, lifer) and _keep(pair.notable > 0, notable)):
+                continue
+            recs.append(_make_recommendation(
+                species_code,
+                pair.common_name,
+                pair.scientific_name,
+                pair.loc_id,
+                pair.loc_name,
+                pair.lat,
+                pair.lng,
+                pair.dist,
+                date.fromordinal(pair.last_day),
+                self.today - pair.last_day,
+                pair.count,
+                pair.notable > 0,
+                is_lifer,
+                pair.score,
+                len(locations) - 1,
+            ))
+        return recs
@@ -0,0 +1,110 @@
+"""Single-flight deduplication of concurrent identical upstream fetches.
+
+While one caller is fetching a key, other threads asking for the same key
+wait for that result instead of issuing their own request. Optionally the
+leader also takes an exclusive lock file, so leaders in other processes
+(e.g. sibling uvicorn workers) queue behind it and can pick the freshly
+cached result up instead of fetching again.
+"""
+
+import hashlib
+import threading
+from pathlib import Path
+from typing import Any, Callable
+
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, fall back to in-process only
+    fcntl = None
+
+_LOCK_STRIPES = 256
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    def __init__(self, lock_dir: str | Path | None = None):
+        self._lock = threading.Lock()
+        self._calls: dict[str, _Call] = {}
+        self._lock_dir = None
+        if lock_dir is not None and fcntl is not None:
+            self._lock_dir = Path(lock_dir)
+            self._lock_dir.mkdir(parents=True, exist_ok=True)
+        self.originating = 0
+        self.coalesced = 0
+        self.coalesced_cross_process = 0
+
+    def do(
+        self,
+        key: str,
+        fetch: Callable[[], Any],
+        recheck: Callable[[], Any | None] | None = None,
+    ) -> Any:
+        """Return fetch() for key, sharing one in-flight call among concurrent callers.
+
+        recheck is consulted after the cross-process lock is acquired; if it
+        returns a value (another process filled the cache meanwhile) that
+        value is used and fetch() is skipped.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = self._lead(key, fetch, recheck)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def _lead(self, key: str, fetch: Callable[[], Any], recheck: Callable[[], Any | None] | None) -> Any:
+        if self._lock_dir is None:
+            return self._fetch(fetch)
+
+        # Lock files are striped by key hash so the directory stays bounded.
+        stripe = int(hashlib.md5(key.encode()).hexdigest(), 16) % _LOCK_STRIPES
+        with open(self._lock_dir / f"{stripe:03d}.lock", "a+b") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                if recheck is not None:
+                    result = recheck()
+                    if result is not None:
+                        with self._lock:
+                            self.coalesced_cross_process += 1
+                        return result
+                return self._fetch(fetch)
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _fetch(self, fetch: Callable[[], Any]) -> Any:
+        with self._lock:
+            self.originating += 1
+        return fetch()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "originating": self.originating,
+            "coalesced": self.coalesced,
+            "coalesced_cross_process": self.coalesced_cross_process,
+        }
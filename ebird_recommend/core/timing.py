@@ -0,0 +1,78 @@
+"""Per-request phase timing.
+
+Inside track_phases(), every phase("name") block adds its wall time to the
+returned PhaseLog, including blocks run on threads started with
+asyncio.to_thread or the client's tile pool (both copy the context). Outside
+it, phase() only does a context-variable lookup, so library code can mark
+its phases unconditionally.
+
+Durations of a phase are summed, so two upstream fetches running side by
+side report roughly twice their wall time; phases also nest (fetch and
+decode sit inside upstream), so they do not add up to the total.
+"""
+
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+
+class PhaseLog:
+    """Seconds and call counts per phase, in first-seen order."""
+
+    def __init__(self):
+        self.seconds: dict[str, float] = {}
+        self.calls: dict[str, int] = {}
+        # Threads that ran a phase of this request (for the sampling profiler).
+        self.threads: set[int] = {threading.get_ident()}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+            self.calls[name] = self.calls.get(name, 0) + 1
+
+    def milliseconds(self) -> dict[str, float]:
+        with self._lock:
+            return {name: round(s * 1000, 2) for name, s in self.seconds.items()}
+
+    def server_timing(self, total: float | None = None) -> str:
+        """The phases as a Server-Timing header value, optionally with a total."""
+        with self._lock:
+            parts = [
+                f"{name};dur={s * 1000:.2f}" + (f';desc="x{self.calls[name]}"' if self.calls[name] > 1 else "")
+                for name, s in self.seconds.items()
+            ]
+        if total is not None:
+            parts.append(f"total;dur={total * 1000:.2f}")
+        return ", ".join(parts)
+
+
+_phases: contextvars.ContextVar[PhaseLog | None] = contextvars.ContextVar("ebird_phases", default=None)
+
+
+@contextmanager
+def track_phases() -> Iterator[PhaseLog]:
+    """Collect the phases timed inside the block."""
+    log = PhaseLog()
+    token = _phases.set(log)
+    try:
+        yield log
+    finally:
+        _phases.reset(token)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Time the block as name in the current PhaseLog, if any."""
+    log = _phases.get()
+    if log is None:
+        yield
+        return
+    log.threads.add(threading.get_ident())
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        log.add(name, time.perf_counter() - start)
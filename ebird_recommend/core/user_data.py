@@ -2,60 +2,350 @@
 
 Download from: My eBird → https://ebird.org/downloadMyData
 The file is named MyEBirdData.csv
+
+Exports of heavy users run to hundreds of thousands of rows, so parsing is
+streaming: LifeListParser takes the file in chunks, resolves the columns
+once from the header, detects the date layout from the first rows and keeps
+only one (common name, latest date) pair per species. load_life_list can
+also split a large file across a process pool.
 """
 
+import codecs
 import csv
-import io
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import date, datetime
 from pathlib import Path
+from typing import Callable
 from .models import SeenSpecies
 
 _COL_COMMON     = "Common Name"
 _COL_SCIENTIFIC = "Scientific Name"
 _COL_DATE       = "Date"
 
+_DATE_FORMATS = ("%Y-%m-%d", "%m/%d/%Y", "%d/%m/%Y")
 
-def _parse_rows(reader: csv.DictReader) -> dict[str, SeenSpecies]:
-    seen: dict[str, SeenSpecies] = {}
-    for row in reader:
-        sci = row.get(_COL_SCIENTIFIC, "").strip()
-        if not sci:
+_CHUNK_SIZE = 1 << 20
+# Rows used to detect the date layout before parsing starts.
+_SAMPLE_ROWS = 64
+# Files smaller than this are parsed in-process even when workers are requested.
+_PARALLEL_MIN_BYTES = 32 << 20
+
+
+def _parse_date_slow(raw: str) -> date | None:
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(raw, fmt).date()
+        except ValueError:
             continue
+    return None
 
-        raw_date = row.get(_COL_DATE, "").strip()
-        obs_date: date | None = None
-        if raw_date:
-            for fmt in ("%Y-%m-%d", "%m/%d/%Y", "%d/%m/%Y"):
-                try:
-                    obs_date = datetime.strptime(raw_date, fmt).date()
-                    break
-                except ValueError:
-                    continue
 
-        existing = seen.get(sci)
-        if existing is None:
-            seen[sci] = SeenSpecies(
-                scientific_name=sci,
-                common_name=row.get(_COL_COMMON, "").strip(),
-                last_seen=obs_date,
+def _ymd(raw: str) -> date:
+    if len(raw) != 10 or raw[4] != "-" or raw[7] != "-":
+        raise ValueError(raw)
+    return date(int(raw[:4]), int(raw[5:7]), int(raw[8:10]))
+
+
+def _mdy(raw: str) -> date:
+    m, d, y = raw.split("/")
+    if len(y) != 4:
+        raise ValueError(raw)
+    return date(int(y), int(m), int(d))
+
+
+def _dmy(raw: str) -> date:
+    d, m, y = raw.split("/")
+    if len(y) != 4:
+        raise ValueError(raw)
+    return date(int(y), int(m), int(d))
+
+
+# Fixed-layout parsers, one per entry of _DATE_FORMATS.
+_FAST_PARSERS: dict[str, Callable[[str], date]] = {
+    "%Y-%m-%d": _ymd,
+    "%m/%d/%Y": _mdy,
+    "%d/%m/%Y": _dmy,
+}
+
+
+def detect_date_format(samples: list[str]) -> str | None:
+    """First format in _DATE_FORMATS whose fast parser accepts every sample."""
+    samples = [s for s in samples if s]
+    if not samples:
+        return None
+    for fmt in _DATE_FORMATS:
+        try:
+            for s in samples:
+                _FAST_PARSERS[fmt](s)
+        except ValueError:
+            continue
+        return fmt
+    return None
+
+
+class _Lines:
+    """Iterator the csv reader pulls buffered lines from.
+
+    Lines handed out for the current row are kept in taken, and exhausted
+    is set if the reader asked for a line the buffer did not have yet.
+    """
+
+    def __init__(self):
+        self.queue: deque[str] = deque()
+        self.taken: list[str] = []
+        self.exhausted = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        if not self.queue:
+            self.exhausted = True
+            raise StopIteration
+        line = self.queue.popleft()
+        self.taken.append(line)
+        return line
+
+
+class LifeListParser:
+    """Incremental MyEBirdData.csv parser.
+
+    feed() text or UTF-8 bytes in arbitrary chunks, then close() to get the
+    life list. header and date_format can be preset when parsing a slice of
+    a file that does not start with the header row.
+    """
+
+    def __init__(self, header: list[str] | None = None, date_format: str | None = None):
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self._tail = ""                 # partial line awaiting its newline
+        self._lines = _Lines()
+        self._reader = csv.reader(self._lines)
+        self._cols: tuple[int, int, int] | None = None
+        self.date_format = date_format
+        self._parse_date: Callable[[str], date | None] | None = None
+        self._dates: dict[str, date | None] = {}
+        self._sample: list[list[str]] | None = None if date_format else []
+        self.species: dict[str, list] = {}   # sci → [common name, latest date]
+        if header is not None:
+            self._set_header(header)
+
+    def feed(self, chunk: str | bytes) -> None:
+        text = self._decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+        if not text:
+            return
+        lines = (self._tail + text).split("\n")
+        self._tail = lines.pop()
+        self._lines.queue.extend(line + "\n" for line in lines)
+        self._drain()
+
+    def close(self) -> dict[str, SeenSpecies]:
+        """The life list parsed so far. Raises csv.Error for malformed CSV."""
+        tail = self._tail + self._decoder.decode(b"", final=True)
+        self._tail = ""
+        if tail:
+            self._lines.queue.append(tail)
+        # An unterminated quote now runs to the end: let csv make what it can of it.
+        self._drain(final=True)
+        self._flush_sample()
+        return {
+            sci: SeenSpecies(scientific_name=sci, common_name=common, last_seen=last)
+            for sci, (common, last) in self.species.items()
+        }
+
+    def _drain(self, final: bool = False) -> None:
+        # csv decides where records end (quotes only count at the start of a
+        # field). If a record runs past the buffered lines, the reader returns
+        # it truncated: put its lines back and parse it again once the rest
+        # has been fed.
+        lines = self._lines
+        while lines.queue:
+            lines.taken = []
+            lines.exhausted = False
+            row = next(self._reader, None)
+            if lines.exhausted and not final:
+                lines.queue.extendleft(reversed(lines.taken))
+                return
+            if row:
+                self._row(row)
+
+    def _row(self, row: list[str]) -> None:
+        if self._cols is None:
+            self._set_header(row)
+        elif self._sample is not None:
+            self._sample.append(row)
+            if len(self._sample) >= _SAMPLE_ROWS:
+                self._flush_sample()
+        else:
+            self._add(row)
+
+    def _set_header(self, header: list[str]) -> None:
+        names = [h.strip().lstrip("\ufeff") for h in header]
+
+        def index(name: str) -> int:
+            return names.index(name) if name in names else -1
+
+        self._cols = (index(_COL_SCIENTIFIC), index(_COL_COMMON), index(_COL_DATE))
+
+    def _flush_sample(self) -> None:
+        if self._sample is None:
+            return
+        rows, self._sample = self._sample, None
+        if self.date_format is None and self._cols is not None:
+            d = self._cols[2]
+            self.date_format = detect_date_format(
+                [r[d].strip() for r in rows if 0 <= d < len(r)]
             )
-        elif obs_date and (existing.last_seen is None or obs_date > existing.last_seen):
-            existing.last_seen = obs_date
+        for row in rows:
+            self._add(row)
+
+    def _date(self, raw: str) -> date | None:
+        if self._parse_date is None:
+            fast = _FAST_PARSERS.get(self.date_format)
+
+            def parse(s: str) -> date | None:
+                if fast is not None:
+                    try:
+                        return fast(s)
+                    except ValueError:
+                        pass
+                return _parse_date_slow(s)
+
+            self._parse_date = parse
+        if raw not in self._dates:
+            self._dates[raw] = self._parse_date(raw)
+        return self._dates[raw]
+
+    def _add(self, row: list[str]) -> None:
+        s, c, d = self._cols
+        n = len(row)
+        sci = row[s].strip() if 0 <= s < n else ""
+        if not sci:
+            return
+        raw_date = row[d].strip() if 0 <= d < n else ""
+        obs_date = self._date(raw_date) if raw_date else None
+
+        existing = self.species.get(sci)
+        if existing is None:
+            self.species[sci] = [row[c].strip() if 0 <= c < n else "", obs_date]
+        elif obs_date and (existing[1] is None or obs_date > existing[1]):
+            existing[1] = obs_date
 
-    return seen
 
+def _split_points(path: Path, start: int, parts: int) -> list[int]:
+    """Byte offsets dividing path[start:] into roughly equal ranges at record boundaries.
 
-def load_life_list(csv_path: str | Path) -> dict[str, SeenSpecies]:
+    A newline ends a record only where the number of quotes since start is
+    even, so splits never land inside a multi-line quoted field. That holds
+    for files written by eBird, which quotes any field containing a quote; a
+    stray quote in an unquoted field (hand-edited files) inverts the parity
+    until the next one, so such files should be parsed with workers=1.
+    """
+    size = path.stat().st_size
+    targets = deque(start + (size - start) * i // parts for i in range(1, parts))
+    points = [start]
+    parity = 0
+    with path.open("rb") as f:
+        f.seek(start)
+        pos = start
+        while targets:
+            block = f.read(_CHUNK_SIZE)
+            if not block:
+                break
+            i = 0
+            while targets and i < len(block):
+                if pos + i < targets[0]:
+                    j = min(targets[0] - pos, len(block))
+                    parity ^= block.count(b'"', i, j) & 1
+                    i = j
+                    continue
+                nl = block.find(b"\n", i)
+                if nl < 0:
+                    parity ^= block.count(b'"', i) & 1
+                    i = len(block)
+                    continue
+                parity ^= block.count(b'"', i, nl) & 1
+                i = nl + 1
+                if parity == 0 and pos + i > points[-1]:
+                    points.append(pos + i)
+                    while targets and targets[0] < pos + i:
+                        targets.popleft()
+            pos += len(block)
+    points.append(size)
+    return points
+
+
+def _parse_range(path: Path, start: int, end: int, header: list[str], date_format: str | None) -> dict:
+    parser = LifeListParser(header=header, date_format=date_format)
+    with path.open("rb") as f:
+        f.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            chunk = f.read(min(_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            parser.feed(chunk)
+            remaining -= len(chunk)
+    parser.close()
+    return parser.species
+
+
+def _load_parallel(path: Path, workers: int) -> dict[str, SeenSpecies]:
+    # Parse the first block in-process: it yields the header row and fixes the
+    # date layout for every worker.
+    with path.open("rb") as f:
+        first_line = f.readline()
+        f.seek(0)
+        head = f.read(_CHUNK_SIZE)
+    probe = LifeListParser()
+    probe.feed(head)
+    probe.close()
+    header = next(csv.reader([first_line.decode("utf-8-sig")]))
+
+    ranges = _split_points(path, len(first_line), workers)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(
+            _parse_range,
+            [path] * (len(ranges) - 1),
+            ranges[:-1],
+            ranges[1:],
+            [header] * (len(ranges) - 1),
+            [probe.date_format] * (len(ranges) - 1),
+        )
+        # Merge in file order: first common name seen wins, latest date wins.
+        merged: dict[str, list] = {}
+        for species in results:
+            for sci, (common, last) in species.items():
+                existing = merged.get(sci)
+                if existing is None:
+                    merged[sci] = [common, last]
+                elif last and (existing[1] is None or last > existing[1]):
+                    existing[1] = last
+
+    return {
+        sci: SeenSpecies(scientific_name=sci, common_name=common, last_seen=last)
+        for sci, (common, last) in merged.items()
+    }
+
+
+def load_life_list(csv_path: str | Path, workers: int | None = None) -> dict[str, SeenSpecies]:
     """Return a dict of scientific_name → SeenSpecies from the user's eBird CSV.
 
-    Keeps only the most recent observation date per species.
+    Keeps only the most recent observation date per species. With workers > 1,
+    files over 32 MiB are split across that many processes.
     """
     path = Path(csv_path)
     if not path.exists():
         raise FileNotFoundError(f"eBird data file not found: {path}")
 
-    with path.open(newline="", encoding="utf-8") as f:
-        return _parse_rows(csv.DictReader(f))
+    if workers and workers > 1 and path.stat().st_size >= _PARALLEL_MIN_BYTES:
+        return _load_parallel(path, workers)
+
+    parser = LifeListParser()
+    with path.open("rb") as f:
+        while chunk := f.read(_CHUNK_SIZE):
+            parser.feed(chunk)
+    return parser.close()
 
 
 def load_life_list_from_string(csv_text: str) -> dict[str, SeenSpecies]:
@@ -63,4 +353,6 @@ def load_life_list_from_string(csv_text: str) -> dict[str, SeenSpecies]:
 
     Keeps only the most recent observation date per species.
     """
-    return _parse_rows(csv.DictReader(io.StringIO(csv_text)))
+    parser = LifeListParser()
+    parser.feed(csv_text)
+    return parser.close()
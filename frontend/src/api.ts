@@ -1,4 +1,4 @@
-import type { HotspotDetail, Recommendation, RecommendRequest } from './types'
+import type { HotspotDetail, Recommendation, RecommendRequest, SeenSpecies } from './types'
 
 const BASE_URL = import.meta.env.VITE_API_URL ?? 'http://localhost:8000'
 
@@ -9,23 +9,60 @@ function headers(apiKey: string): Record<string, string> {
   }
 }
 
-export async function fetchRecommendations(
-  apiKey: string,
-  req: RecommendRequest,
-): Promise<Recommendation[]> {
-  const res = await fetch(`${BASE_URL}/recommend`, {
-    method: 'POST',
-    headers: headers(apiKey),
-    body: JSON.stringify(req),
-  })
-
+async function throwIfError(res: Response): Promise<void> {
   if (res.status === 401) throw new Error('Invalid or missing eBird API key.')
   if (!res.ok) {
     const detail = await res.json().catch(() => ({ detail: res.statusText }))
     throw new Error(detail?.detail ?? 'API error')
   }
+}
 
-  return res.json()
+// The life list is uploaded once and then referenced by id; the server
+// answers 404 for an id it has evicted, and we upload again.
+let uploaded: { lifeList: SeenSpecies[]; id: string } | null = null
+
+async function uploadLifeList(apiKey: string, lifeList: SeenSpecies[]): Promise<string> {
+  const res = await fetch(`${BASE_URL}/lifelist`, {
+    method: 'PUT',
+    headers: headers(apiKey),
+    body: JSON.stringify(lifeList),
+  })
+  await throwIfError(res)
+  const { life_list_id } = await res.json()
+  uploaded = { lifeList, id: life_list_id }
+  return life_list_id
+}
+
+// Last /recommend response per request body. The server answers 304 to a
+// matching If-None-Match when the underlying eBird data has not changed.
+const recommendCache = new Map<string, { etag: string; data: Recommendation[] }>()
+
+export async function fetchRecommendations(
+  apiKey: string,
+  req: RecommendRequest,
+): Promise<Recommendation[]> {
+  const { life_list, ...params } = req
+  const post = (id: string) => {
+    const body = JSON.stringify({ ...params, life_list_id: id })
+    const cached = recommendCache.get(body)
+    const res = fetch(`${BASE_URL}/recommend`, {
+      method: 'POST',
+      headers: cached ? { ...headers(apiKey), 'If-None-Match': cached.etag } : headers(apiKey),
+      body,
+    })
+    return res.then((r) => ({ res: r, body, cached }))
+  }
+
+  const id = uploaded?.lifeList === life_list ? uploaded.id : await uploadLifeList(apiKey, life_list)
+  let { res, body, cached } = await post(id)
+  if (res.status === 404) ({ res, body, cached } = await post(await uploadLifeList(apiKey, life_list)))
+  if (res.status === 304 && cached) return cached.data
+
+  await throwIfError(res)
+  const data: Recommendation[] = await res.json()
+  const etag = res.headers.get('ETag')
+  if (etag) recommendCache.set(body, { etag, data })
+  return data
 }
 
 export async function fetchHotspotDetail(
@@ -38,11 +75,6 @@ export async function fetchHotspotDetail(
     headers: headers(apiKey),
   })
 
-  if (res.status === 401) throw new Error('Invalid or missing eBird API key.')
-  if (!res.ok) {
-    const detail = await res.json().catch(() => ({ detail: res.statusText }))
-    throw new Error(detail?.detail ?? 'API error')
-  }
-
+  await throwIfError(res)
   return res.json()
 }
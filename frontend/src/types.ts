@@ -66,4 +66,5 @@ export interface Recommendation {
   reason: string
   species_url: string
   hotspot_url: string
+  num_species_all_time?: number | null // set when the server has a hotspot catalog
 }
@@ -1,21 +1,28 @@
 """Development server entry point.
 
 Usage:
-    python serve.py          # no reload (safe for repeated runs)
-    python serve.py --reload # hot reload (only one instance at a time!)
+    python serve.py              # no reload (safe for repeated runs)
+    python serve.py --reload     # hot reload (only one instance at a time!)
+    python serve.py --port 8100 --workers 4
 
 Note: --reload spawns a watcher + worker process pair. Running multiple
 instances with --reload will stack up zombie processes on port 8000.
 Kill all python.exe / uvicorn processes before restarting with --reload.
 """
-import sys
+import argparse
 import uvicorn
 
 if __name__ == "__main__":
-    reload = "--reload" in sys.argv
+    parser = argparse.ArgumentParser(description="Run the eBird recommender API.")
+    parser.add_argument("--reload", action="store_true", help="Restart on code changes")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes (ignored with --reload)")
+    args = parser.parse_args()
     uvicorn.run(
         "ebird_recommend.api.app:app",
-        host="127.0.0.1",
-        port=8000,
-        reload=reload,
+        host=args.host,
+        port=args.port,
+        reload=args.reload,
+        workers=None if args.reload else args.workers,
     )
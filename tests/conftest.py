@@ -0,0 +1,36 @@
+"""Shared fixtures: the API wired to synthetic upstream data under a temp dir."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from benchmarks.synthetic import SyntheticRegion
+from ebird_recommend.api import deps
+from ebird_recommend.api.app import app
+from ebird_recommend.api.response_cache import ResponseCache
+from ebird_recommend.core.cache import Cache, MemoryCache, TieredCache
+from ebird_recommend.core.client import AsyncEBirdClient
+from ebird_recommend.core.lifelists import LifeListStore
+from ebird_recommend.core.singleflight import SingleFlight
+
+API_KEY = "test-synthetic"
+
+
+@pytest.fixture(scope="module")
+def api(tmp_path_factory):
+    root = tmp_path_factory.mktemp("api")
+    region = SyntheticRegion.sized(2_000)
+    saved = deps.cache, deps.responses, deps.life_lists, deps.flight
+    deps.cache = TieredCache(MemoryCache(), Cache(root / "cache"))
+    deps.responses = ResponseCache(deps.cache)
+    deps.life_lists = LifeListStore(root / "lifelists")
+    deps.flight = SingleFlight()
+    with deps._clients_lock:
+        deps._clients[API_KEY] = AsyncEBirdClient(API_KEY, cache=deps.cache, transport=region.transport())
+    try:
+        with TestClient(app, headers={"X-EBird-Api-Token": API_KEY}) as client:
+            yield client, region
+    finally:
+        with deps._clients_lock:  # app shutdown closes the clients it still holds
+            if (leftover := deps._clients.pop(API_KEY, None)) is not None:
+                leftover.close()
+        deps.cache, deps.responses, deps.life_lists, deps.flight = saved
@@ -0,0 +1,51 @@
+"""AsyncEBirdClient runs on its own pool and tiles wide queries without blocking workers."""
+
+import asyncio
+import threading
+import time
+
+import httpx
+
+from ebird_recommend.core.client import AsyncEBirdClient, EBirdClient
+
+LATENCY = 0.2
+
+
+def _handler(calls: list):
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(threading.current_thread().name)
+        time.sleep(LATENCY)
+        return httpx.Response(200, json=[])
+
+    return handler
+
+
+def test_concurrency_follows_pool_size():
+    calls = []
+    client = AsyncEBirdClient("key", pool_size=16, transport=httpx.MockTransport(_handler(calls)))
+
+    async def main():
+        start = time.perf_counter()
+        await asyncio.gather(*(client.checklists_at_location(f"L{i}") for i in range(16)))
+        return time.perf_counter() - start
+
+    try:
+        # More than the default executor's min(32, cpus + 4) workers on small machines.
+        assert asyncio.run(main()) < 4 * LATENCY
+    finally:
+        client.close()
+    assert len(calls) == 16 and all(name.startswith("ebird-async") for name in calls)
+
+
+def test_wide_queries_are_tiled_on_the_pool():
+    calls = []
+    client = AsyncEBirdClient("key", pool_size=2, tile_concurrency=2, transport=httpx.MockTransport(_handler(calls)))
+    try:
+        # Two workers are enough: neither waits on the other's tiles.
+        asyncio.run(asyncio.wait_for(client.nearby_recent_obs(40.0, -74.0, 120), timeout=30))
+    finally:
+        client.close()
+    with EBirdClient("key") as sync:
+        tiles = sync._tile_areas(40.0, -74.0, 120)
+    assert len(calls) == len(tiles) > 2
+    assert all(name.startswith("ebird-async") for name in calls)
@@ -0,0 +1,50 @@
+"""The per-key client LRU closes what it evicts, once no request is using it."""
+
+from collections import Counter, OrderedDict
+
+import pytest
+
+from ebird_recommend.api import deps
+
+
+@pytest.fixture
+def lru(monkeypatch):
+    monkeypatch.setattr(deps, "_MAX_CLIENTS", 2)
+    monkeypatch.setattr(deps, "_clients", OrderedDict())
+    monkeypatch.setattr(deps, "_leases", Counter())
+    monkeypatch.setattr(deps, "_evicted", set())
+    yield
+    deps.close_clients()
+
+
+def _closed(client) -> bool:
+    return client.sync._http.is_closed
+
+
+def test_evicted_client_is_closed(lru):
+    a = deps.get_client("a")
+    deps.get_client("b")
+    assert deps.get_client("a") is a  # "a" is now most recent; "b" goes next
+    b = deps._clients["b"]
+    deps.get_client("c")
+    assert _closed(b) and not _closed(a)
+    assert list(deps._clients) == ["a", "c"]
+
+
+def test_leased_client_is_closed_when_released(lru):
+    with deps.lease_client("a") as a:
+        with deps.lease_client("a") as again:
+            assert again is a
+            deps.get_client("b")
+            deps.get_client("c")  # evicts "a" while two requests hold it
+        assert "a" not in deps._clients and not _closed(a)
+    assert _closed(a)
+    assert not deps._leases and not deps._evicted
+
+
+def test_shutdown_closes_evicted_clients_still_leased(lru):
+    with deps.lease_client("a") as a:
+        deps.get_client("b")
+        deps.get_client("c")
+        deps.close_clients()
+        assert _closed(a)
@@ -0,0 +1,43 @@
+"""Geo reuse must not cut narrower answers out of latest-per-species results."""
+
+import httpx
+
+from ebird_recommend.core.cache import Cache
+from ebird_recommend.core.client import EBirdClient
+
+
+def _client(tmp_path, rows: list[dict], calls: list):
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append((request.url.path.removeprefix("/v2"), dict(request.url.params)))
+        return httpx.Response(200, json=rows)
+
+    return EBirdClient("key", cache=Cache(tmp_path), geo_reuse=True, transport=httpx.MockTransport(handler))
+
+
+def _obs(code: str, lat: float, lng: float) -> dict:
+    return {
+        "speciesCode": code, "comName": code, "sciName": code, "locId": f"L-{code}", "locName": "",
+        "obsDt": "2099-01-01 08:00", "lat": lat, "lng": lng, "subId": f"S-{code}",
+    }
+
+
+def test_recent_obs_share_only_the_same_snapped_query(tmp_path):
+    calls = []
+    with _client(tmp_path, [_obs("far", 40.3, -74.0)], calls) as client:
+        first = client.nearby_recent_obs(40.001, -74.001, 10, 7)
+        again = client.nearby_recent_obs(40.002, -74.0005, 10, 7)
+        client.nearby_recent_obs(40.002, -74.0005, 20, 7)
+        client.nearby_recent_obs(40.002, -74.0005, 10, 3)
+    assert [params["dist"] for path, params in calls] == ["10", "20", "10"]
+    assert {path for path, _ in calls} == {"/data/obs/geo/recent"}
+    # Rows come back as fetched, not filtered to a circle the upstream never saw.
+    assert [o.species_code for o in again] == [o.species_code for o in first] == ["far"]
+
+
+def test_notable_obs_reuse_a_covering_superset(tmp_path):
+    calls = []
+    with _client(tmp_path, [_obs("near", 40.0, -74.0), _obs("far", 40.3, -74.0)], calls) as client:
+        narrow = client.nearby_notable_obs(40.001, -74.001, 10, 7)
+        client.nearby_notable_obs(40.011, -74.001, 20, 3)
+    assert len(calls) == 1 and calls[0][1]["dist"] == "50" and calls[0][1]["back"] == "30"
+    assert [o.species_code for o in narrow] == ["near"]
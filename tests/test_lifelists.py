@@ -0,0 +1,30 @@
+"""LifeListStore: concurrent uploads of one list and periodic pruning."""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ebird_recommend.core.lifelists import LifeListStore, life_list_id
+
+
+def test_concurrent_uploads_of_the_same_list(tmp_path):
+    store = LifeListStore(tmp_path, max_entries=0)
+    names = [f"Genus species{i}" for i in range(2_000)]
+    with ThreadPoolExecutor(8) as pool:
+        ids = set(pool.map(lambda _: store.put(names)[0], range(64)))
+    assert ids == {life_list_id(names)}
+    assert store.get(ids.pop()) == frozenset(names)
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_files_are_pruned_every_few_uploads(tmp_path):
+    store = LifeListStore(tmp_path, max_files=5)
+    store._PRUNE_EVERY = 4
+    ids = []
+    for i in range(7):
+        ids.append(store.put([f"only{i}"])[0])
+        os.utime(tmp_path / f"{ids[-1]}.json", (time.time() - 60 + i,) * 2)
+    assert len(list(tmp_path.glob("*.json"))) == 7  # pruned at 4 files, not since
+
+    ids.append(store.put(["only7"])[0])
+    assert sorted(p.stem for p in tmp_path.glob("*.json")) == sorted(ids[3:])
@@ -0,0 +1,58 @@
+"""Partitioned observation windows: day-delta refreshes and the window boundary."""
+
+import json
+from datetime import date, datetime, timedelta
+
+import httpx
+
+from ebird_recommend.core.cache import Cache
+from ebird_recommend.core.client import EBirdClient, _window
+
+
+def _obs(code: str, day: date) -> dict:
+    return {
+        "speciesCode": code, "comName": code, "sciName": code, "locId": "L1", "locName": "",
+        "obsDt": f"{day} 08:00", "lat": 40.0, "lng": -74.0, "subId": f"S-{code}-{day}",
+    }
+
+
+def _client(tmp_path, calls: list) -> EBirdClient:
+    today = date.today()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        back = int(request.url.params["back"])
+        calls.append(back)
+        return httpx.Response(200, json=[_obs(f"sp{d}", today - timedelta(days=d)) for d in range(back)])
+
+    return EBirdClient(
+        "key", cache=Cache(tmp_path, ttl_hours=4), stale_after_hours=1, partitioned=True,
+        transport=httpx.MockTransport(handler),
+    )
+
+
+def _age(cache: Cache, hours: float) -> None:
+    for path in cache.cache_dir.glob("*.json"):
+        data = json.loads(path.read_text())
+        data["cached_at"] = (datetime.fromisoformat(data["cached_at"]) - timedelta(hours=hours)).isoformat()
+        path.write_text(json.dumps(data))
+
+
+def test_expired_window_is_refreshed_by_days(tmp_path):
+    calls = []
+    with _client(tmp_path, calls) as client:
+        assert len(client.recent_obs_at_location("L1", back=14)) == 14
+        _age(client._cache, 26)  # past the 4 h TTL, a day or two old
+        assert len(client.recent_obs_at_location("L1", back=14)) == 14
+        assert calls[0] == 14 and 2 < calls[1] < 14
+
+        # Refreshed in place: fresh again, no further upstream call.
+        client.recent_obs_at_location("L1", back=7)
+        assert len(calls) == 2
+
+
+def test_window_holds_back_days_including_today():
+    today = date.today()
+    state = {"back": 30, "days": {str(today - timedelta(days=d)): [_obs("sp", today - timedelta(days=d))] for d in range(30)}}
+    rows = _window(state, 14)
+    assert len(rows) == 14
+    assert rows[0]["obsDt"][:10] == str(today) and rows[-1]["obsDt"][:10] == str(today - timedelta(days=13))
@@ -0,0 +1,145 @@
+"""RecommendationIndex must agree with recommend() over the same window.
+
+Species with equal scores may come out in a different order (the index
+orders ties by when a pair entered it, recommend() by input order), so
+rankings are compared sorted by (score, species). Location distances are
+chosen so that no two locations of a species can tie.
+"""
+
+import itertools
+import math
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from ebird_recommend.core.geo import EARTH_RADIUS_KM
+from ebird_recommend.core.models import NotableObservation, Observation
+from ebird_recommend.core.recommender import RecommendationIndex, recommend
+
+USER = (40.0, -74.0)
+MAX_DIST = 50
+BACK = 14
+START = date(2025, 6, 1)
+SPECIES = 30
+# Distance penalties 0.53 * i + 0.2 differ by 0.03 modulo the 0.5 steps of
+# the recency and frequency bonuses, so scores of two locations never tie.
+LOCATIONS = [(USER[0] + math.degrees((1 + 2.65 * i) / EARTH_RADIUS_KM), USER[1]) for i in range(16)]
+
+
+def _rows(rng: random.Random, n: int, first: date, days: int, prefix: str) -> list[Observation]:
+    rows = []
+    for i in range(n):
+        s, loc = rng.randrange(SPECIES), rng.randrange(len(LOCATIONS))
+        day = first + timedelta(days=rng.randrange(days))
+        rows.append(Observation(
+            speciesCode=f"sp{s}", comName=f"Common {s}", sciName=f"Genus species{s}",
+            locId=f"L{loc}", locName=f"Location {loc}", lat=LOCATIONS[loc][0], lng=LOCATIONS[loc][1],
+            obsDt=f"{day} {rng.randrange(6, 18):02d}:00", subId=f"{prefix}{i}",
+        ))
+    return rows
+
+
+def _notable(rows: list[Observation]) -> list[NotableObservation]:
+    return [NotableObservation(**o.model_dump()) for o in rows]
+
+
+def _window(rows: list, today: date) -> list:
+    return [o for o in rows if 0 <= (today - date.fromisoformat(o.obs_dt[:10])).days <= BACK]
+
+
+def _sorted(recs) -> list[dict]:
+    return sorted((r.model_dump() for r in recs), key=lambda r: (-r["score"], r["species_code"]))
+
+
+def _check(index: RecommendationIndex, all_obs: list, notable_obs: list, today: date, seen: set) -> None:
+    all_obs, notable_obs = _window(all_obs, today), _window(notable_obs, today)
+    for lifer, notable in itertools.product(["all", "yes", "no"], repeat=2):
+        expected = _sorted(recommend(
+            *USER, seen, all_obs, notable_obs, MAX_DIST, lifer=lifer, notable=notable, as_of=today,
+        ))
+        assert _sorted(index.recommend(seen, lifer=lifer, notable=notable)) == expected
+        top = index.recommend(seen, lifer=lifer, notable=notable, top=5)
+        assert [r["score"] for r in _sorted(top)] == [r["score"] for r in expected[:5]]
+        assert all(r in expected for r in _sorted(top))
+
+
+@pytest.fixture
+def rng():
+    return random.Random(7)
+
+
+def test_inserts_match_recommend(rng):
+    today = START + timedelta(days=20)
+    all_obs = _rows(rng, 600, START, 21, "S")       # a third falls before the window
+    notable_obs = _notable(rng.sample(all_obs, 40))
+    index = RecommendationIndex(*USER, MAX_DIST, BACK, today=today)
+    assert index.insert(all_obs) == len(_window(all_obs, today))
+    index.insert(notable_obs, notable=True)
+    _check(index, all_obs, notable_obs, today, seen={f"Genus species{i}" for i in range(0, SPECIES, 3)})
+
+    # Re-inserting known rows changes nothing.
+    assert index.insert(all_obs[:100]) == 0
+    assert index.insert(notable_obs, notable=True) == 0
+    _check(index, all_obs, notable_obs, today, seen=set())
+
+
+def test_deltas_match_recommend(rng):
+    today = START + timedelta(days=BACK)
+    all_obs = _rows(rng, 500, START, BACK + 1, "S")
+    notable_obs = _notable(rng.sample(all_obs, 30))
+    index = RecommendationIndex(*USER, MAX_DIST, BACK, today=today)
+    for chunk in range(0, len(all_obs), 60):
+        index.insert(all_obs[chunk:chunk + 60])
+    index.insert(notable_obs, notable=True)
+
+    dropped = rng.sample(all_obs, 150)
+    assert index.expire(dropped) == 150
+    assert index.expire(dropped) == 0
+    unflagged = notable_obs[:10]
+    index.expire(unflagged, notable=True)
+    kept = [o for o in all_obs if o not in dropped]
+    _check(index, kept, notable_obs[10:], today, seen=set())
+
+    # Dropping every row of a species removes it; adding rows back restores it.
+    sp0 = [o for o in kept if o.species_code == "sp0"]
+    index.expire(sp0)
+    index.expire([o for o in notable_obs[10:] if o.species_code == "sp0"], notable=True)
+    assert all(r.species_code != "sp0" for r in index.recommend(set()))
+    index.insert(sp0)
+    _check(index, kept, [o for o in notable_obs[10:] if o.species_code != "sp0"], today, seen=set())
+
+
+def test_rolling_the_window_matches_recommend(rng):
+    today = START + timedelta(days=BACK)
+    all_obs = _rows(rng, 400, START, BACK + 1, "S")
+    notable_obs = _notable(rng.sample(all_obs, 25))
+    index = RecommendationIndex(*USER, MAX_DIST, BACK, today=today)
+    index.insert(all_obs)
+    index.insert(notable_obs, notable=True)
+    seen = {f"Genus species{i}" for i in range(0, SPECIES, 4)}
+    _check(index, all_obs, notable_obs, today, seen)
+
+    for step in (1, 1, 2, 3, 1, 7, 16):
+        today += timedelta(days=step)
+        index.roll(today)
+        fresh = _rows(rng, 30, today - timedelta(days=1), 2, f"D{today}-")
+        index.insert(fresh)
+        all_obs += fresh
+        _check(index, all_obs, notable_obs, today, seen)
+        assert len(index) == len(_window(all_obs, today)) + len(_window(notable_obs, today))
+
+    index.roll(today - timedelta(days=3))  # never moves back
+    _check(index, all_obs, notable_obs, today, seen)
+
+
+def test_life_list_changes_apply_at_query_time(rng):
+    today = START + timedelta(days=BACK)
+    all_obs = _rows(rng, 300, START, BACK + 1, "S")
+    index = RecommendationIndex(*USER, MAX_DIST, BACK, today=today)
+    index.insert(all_obs)
+    seen: set[str] = set()
+    for i in range(SPECIES):
+        _check(index, all_obs, [], today, seen)
+        seen.add(f"Genus species{i}")
+    assert index.recommend(seen, lifer="yes") == []
@@ -0,0 +1,130 @@
+"""The NumPy recommender must match the row-by-row reference exactly."""
+
+import itertools
+import random
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from ebird_recommend.core import recommender as R
+from ebird_recommend.core.columns import ObsColumns
+from ebird_recommend.core.models import NotableObservation, Observation
+
+AS_OF = date(2025, 6, 1)
+USER = (40.1, -74.1)
+
+
+def _observations(cls, rng: random.Random, n: int, species: int, locations: int) -> list:
+    rows = []
+    for _ in range(n):
+        s, loc = rng.randrange(species), rng.randrange(locations)
+        day = AS_OF - timedelta(days=rng.randrange(20))
+        roll = rng.random()
+        if roll < 0.03:
+            obs_dt = rng.choice(["garbage", "", "2025-13-45"])  # unparseable
+        elif roll < 0.1:
+            obs_dt = str(day)  # date only
+        else:
+            obs_dt = f"{day} {rng.randrange(5, 20):02d}:{rng.randrange(60):02d}"
+        rows.append(cls(
+            speciesCode=f"sp{s}", comName=f"Common {s}", sciName=f"Genus species{s}",
+            locId=f"L{loc}", locName=f"Location {loc}", obsDt=obs_dt,
+            # Few distinct coordinates, so equal scores (ties) are common.
+            lat=40 + (loc % 7) * 0.05, lng=-74 + (loc % 5) * 0.05,
+        ))
+    return rows
+
+
+@pytest.fixture(scope="module", params=[(1, 60, 6, 5), (2, 3_000, 80, 60), (3, 8_000, 300, 500)],
+                ids=["tiny", "medium", "large"])
+def case(request):
+    seed, n, species, locations = request.param
+    rng = random.Random(seed)
+    all_obs = _observations(Observation, rng, n, species, locations)
+    notable_obs = _observations(NotableObservation, rng, max(1, n // 10), species, locations)
+    seen = {f"Genus species{i}" for i in range(0, species, 3)}
+    models = ObsColumns.from_models(all_obs), ObsColumns.from_models(notable_obs)
+    records = (
+        ObsColumns.from_records([o.model_dump(by_alias=True) for o in all_obs]),
+        ObsColumns.from_records([o.model_dump(by_alias=True) for o in notable_obs]),
+    )
+    return all_obs, notable_obs, seen, models, records
+
+
+def _dump(recs) -> list[dict]:
+    return [r.model_dump() for r in recs]
+
+
+@pytest.mark.parametrize(
+    "lifer,notable,top",
+    list(itertools.product(["all", "yes", "no"], ["all", "yes", "no"], [None, 1, 5, 20, 10**6])),
+)
+def test_numpy_matches_python(case, lifer, notable, top):
+    all_obs, notable_obs, seen, models, records = case
+    args = (lifer, notable, top, AS_OF)
+    expected = _dump(R._recommend_python(*USER, seen, all_obs, notable_obs, 50, *args))
+
+    assert _dump(R._recommend_numpy(*USER, seen, *models, 50, *args)) == expected
+    # Lean columns decoded from raw JSON, as the API passes them.
+    assert _dump(R._recommend_numpy(*USER, seen, *records, 50, *args)) == expected
+    assert _dump(R.recommend(
+        *USER, seen, all_obs, notable_obs, 50, lifer=lifer, notable=notable, top=top, as_of=AS_OF,
+    )) == expected
+
+
+def test_exact_ties():
+    # Identical sightings: the same species at two locations with equal
+    # scores (the earlier pair wins) and several species with equal scores
+    # (input order decides the ranking).
+    rows = [
+        Observation(
+            speciesCode=f"sp{s}", comName=f"Common {s}", sciName=f"Genus species{s}",
+            locId=f"L{loc}", locName=f"Location {loc}", obsDt=f"{AS_OF - timedelta(days=d)} 08:00",
+            lat=40.2, lng=-74.0,
+        )
+        for s in (3, 1, 2) for loc in (2, 1) for d in (1, 4)
+    ]
+    expected = _dump(R._recommend_python(*USER, set(), rows, [], 50, as_of=AS_OF))
+    assert len({r["score"] for r in expected}) == 1
+    assert [(r["species_code"], r["loc_id"]) for r in expected] == [("sp3", "L2"), ("sp1", "L2"), ("sp2", "L2")]
+    got = R._recommend_numpy(*USER, set(), ObsColumns.from_models(rows), ObsColumns.from_models([]), 50, as_of=AS_OF)
+    assert _dump(got) == expected
+    for top in (1, 2):
+        got = R._recommend_numpy(
+            *USER, set(), ObsColumns.from_models(rows), ObsColumns.from_models([]), 50, top=top, as_of=AS_OF,
+        )
+        assert _dump(got) == expected[:top]
+
+
+def test_filters_match_filtering_the_full_ranking(case):
+    all_obs, notable_obs, seen, models, _ = case
+    full = R._recommend_python(*USER, seen, all_obs, notable_obs, 50, as_of=AS_OF)
+    got = R._recommend_numpy(*USER, seen, *models, 50, "yes", "no", 5, AS_OF)
+    assert _dump(got) == _dump([r for r in full if r.is_lifer and not r.is_notable][:5])
+
+
+def _strptime_date(obs_dt: str) -> date | None:
+    for fmt in ("%Y-%m-%d %H:%M", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(obs_dt[:16], fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def test_obs_dates_parse_like_strptime():
+    values = [
+        "2025-06-01", "2025-06-01 08:00", "2025-06-01 23:59:59", "2025-6-1", "2025-06-01 8:00",
+        "2025-06-01 24:00", "2025-06-01 08:60", "2025-06-01 08:0", "2025-06-01 ", "2025-06-01\n",
+        "2025-06-01T08:00", "2025-02-30", "2024-02-29 12:00", "0000-01-01", "\u0662\u0660\u0662\u0665-06-01",
+        "", "garbage",
+    ]
+    rng = random.Random(5)
+    for _ in range(5_000):
+        chars = list(f"{rng.randrange(3000):04d}-{rng.randrange(14):02d}-{rng.randrange(33):02d} "
+                     f"{rng.randrange(26):02d}:{rng.randrange(62):02d}"[:rng.choice([10, 13, 16])])
+        chars[rng.randrange(len(chars))] = rng.choice("0123456789-: T")
+        values.append("".join(chars))
+    expected = [_strptime_date(v) for v in values]
+    assert [R._parse_obs_date(v) for v in values] == expected
+    assert R._obs_days(values).tolist() == [d.toordinal() if d else -1 for d in expected]
@@ -0,0 +1,43 @@
+"""Response cache keys round coordinates; validation must not count as cache lookups."""
+
+from datetime import datetime
+
+from ebird_recommend.api.response_cache import ResponseCache
+from ebird_recommend.core.cache import Cache, MemoryCache, SQLiteCache, TieredCache
+from ebird_recommend.core.geo import haversine
+
+
+def test_validation_does_not_count_lookups(tmp_path):
+    for disk in (Cache(tmp_path / "files"), SQLiteCache(tmp_path / "cache.db")):
+        cache = TieredCache(MemoryCache(), disk)
+        stored = cache.set("upstream", [1, 2, 3])
+        responses = ResponseCache(cache)
+        responses.put(("route",), b"[]", {"upstream": stored.cached_at, "other-caller": None})
+
+        assert responses.get(("route",)) is not None
+        cache.memory.clear()  # validate against the disk tier too
+        assert responses.get(("route",)) is not None
+        for store in (cache.memory, disk):
+            assert store.stats()["hits"] == store.stats()["misses"] == 0
+
+        cache.set("upstream", [4])
+        assert responses.get(("route",)) is None
+        assert cache.cached_at("missing") is None
+        assert isinstance(cache.cached_at("upstream"), datetime)
+
+
+def test_recommend_computes_from_exact_coordinates(api):
+    client, region = api
+    lat, lng = region.config.lat + 0.0004, region.config.lng - 0.0004
+    body = {"lng": lng, "radius": 20, "top": 30, "life_list": []}
+
+    first = client.post("/recommend", json={**body, "lat": lat})
+    assert first.headers["X-Cache"] != "HIT"
+    recs = first.json()
+    assert recs
+    for r in recs:
+        assert r["distance_km"] == round(haversine(lat, lng, r["lat"], r["lng"]), 1)
+
+    # Same ~100 m cell: served from the response cache.
+    second = client.post("/recommend", json={**body, "lat": round(lat, 3)})
+    assert second.headers["X-Cache"] == "HIT" and second.content == first.content
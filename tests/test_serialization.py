@@ -0,0 +1,53 @@
+"""The fast JSON paths must produce the bytes FastAPI's response_model path would."""
+
+import json
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from ebird_recommend.core import fastjson
+from ebird_recommend.core.models import (
+    BatchRecommendation, Hotspot, HotspotDetailResponse, NotableObservation, Recommendation,
+)
+
+
+def _reference(model, body: bytes) -> bytes:
+    """What the response_model path sends for the same payload."""
+    payload = TypeAdapter(model).validate_python(json.loads(body))
+    return JSONResponse(jsonable_encoder(payload)).body
+
+
+def test_routes_match_response_model(api):
+    client, region = api
+    lat, lng = region.config.lat, region.config.lng
+    life_list = [{"scientific_name": s, "common_name": s} for s in sorted(region.life_list())]
+    hotspot = region.hotspots()[0]["locId"]
+    cases = [
+        (list[Recommendation], client.post("/recommend", json={
+            "lat": lat, "lng": lng, "radius": 30, "top": 50, "life_list": life_list,
+        })),
+        (list[BatchRecommendation], client.post("/recommend/batch", json={
+            "origins": [{"lat": lat, "lng": lng, "radius": 10}, {"lat": lat + 0.1, "lng": lng, "radius": 20}],
+            "life_list": life_list,
+        })),
+        (list[NotableObservation], client.get("/notable", params={"lat": lat, "lng": lng, "radius": 40})),
+        (list[Hotspot], client.get("/hotspots", params={"lat": lat, "lng": lng, "radius": 20})),
+        (HotspotDetailResponse, client.get(f"/hotspot/{hotspot}")),
+    ]
+    for model, response in cases:
+        assert response.status_code == 200, response.text
+        assert len(response.content) > 100
+        assert response.content == _reference(model, response.content)
+
+
+def test_fastjson_matches_jsonresponse():
+    payload = [{
+        "common_name": "Grünfink “quoted” \\ ☃", "lat": -33.8688, "lng": 151.2093, "score": 0.1 + 0.2,
+        "distance_km": 12.0, "how_many": None, "is_lifer": True, "report_count": 0,
+    }]
+    assert fastjson.dumps(payload) == JSONResponse(payload).body
+    # Beyond 1e-4 .. 1e16 orjson spells floats differently ("0.00001", not "1e-05"):
+    # other bytes, same number.
+    edge = [1e-5, -2.5e-7, 1e16]
+    assert json.loads(fastjson.dumps(edge)) == json.loads(JSONResponse(edge).body) == edge
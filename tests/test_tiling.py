@@ -0,0 +1,64 @@
+"""Wide geo queries: tiles merge like one upstream query and their count is bounded."""
+
+import asyncio
+
+import httpx
+
+from ebird_recommend.core.client import MAX_DIST_KM, AsyncEBirdClient, EBirdClient
+
+
+def _obs(code: str, sub: str, obs_dt: str, lat: float = 40.0, lng: float = -74.0) -> dict:
+    return {
+        "speciesCode": code, "comName": code, "sciName": code, "locId": f"L{sub}", "locName": "",
+        "obsDt": obs_dt, "lat": lat, "lng": lng, "subId": sub,
+    }
+
+
+def _tile_date(area: tuple) -> str:
+    return f"2099-01-{1 + int(abs(area[0] * 100 + area[1] * 10)) % 28:02d} 08:00"
+
+
+def _transport(calls: list) -> httpx.MockTransport:
+    def handler(request: httpx.Request) -> httpx.Response:
+        params = request.url.params
+        area = (float(params["lat"]), float(params["lng"]), int(params["dist"]))
+        calls.append(area)
+        # Every tile sees the species; each tile's latest sighting has its own date.
+        return httpx.Response(200, json=[
+            _obs("amecro", f"S{area}", _tile_date(area)),
+            _obs("norcar", "S0", "2099-01-01"),
+        ])
+
+    return httpx.MockTransport(handler)
+
+
+def test_recent_obs_keep_the_latest_sighting_per_species():
+    calls = []
+    with EBirdClient("key", transport=_transport(calls)) as client:
+        recent = client.nearby_recent_obs(40.0, -74.0, 120)
+        notable = client.nearby_notable_obs(40.0, -74.0, 120)
+    tiles = len(calls) // 2
+    assert len({_tile_date(area) for area in calls}) > 1
+    assert sorted((o.species_code, o.obs_dt) for o in recent) == [
+        ("amecro", max(_tile_date(area) for area in calls)),
+        ("norcar", "2099-01-01"),
+    ]
+    # Notable reports are listed one per sighting, duplicates across tiles merged.
+    assert len(notable) == tiles + 1
+
+
+def test_too_many_tiles_fall_back_to_one_query():
+    calls = []
+    with EBirdClient("key", transport=_transport(calls), max_tiles=8) as client:
+        assert len(client._tile_areas(40.0, -74.0, 60)) == 8
+        client.nearby_recent_obs(40.0, -74.0, 500)
+    assert calls == [(40.0, -74.0, MAX_DIST_KM)]
+
+    calls.clear()
+    client = AsyncEBirdClient("key", transport=_transport(calls), max_tiles=8)
+    try:
+        asyncio.run(client.nearby_recent_obs(40.0, -74.0, 500))
+        asyncio.run(client.nearby_recent_obs_many([(40.0, -74.0, 500), (41.0, -74.0, 10)]))
+    finally:
+        client.close()
+    assert sorted(calls) == [(40.0, -74.0, MAX_DIST_KM)] * 2 + [(41.0, -74.0, 10)]
@@ -0,0 +1,66 @@
+"""LifeListParser must agree with csv.DictReader whatever the chunking."""
+
+import csv
+import io
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+
+from ebird_recommend.api import app as api
+from ebird_recommend.core.user_data import LifeListParser, load_life_list_from_string
+
+HEADER = "Submission ID,Common Name,Scientific Name,Date\n"
+ROWS = (
+    'S1,a 3" bird,Genus alpha,2024-01-01\n'          # stray quote in an unquoted field
+    'S2,Bravo,Genus bravo,2024-01-02\n'
+    'S3,"Charlie, ""the"" multi\nline",Genus charlie,2024-01-03\n'
+    'S4,Délta,Genus delta,2024-01-04\n'
+    'S5,Bravo,Genus bravo,2024-03-05\n'
+)
+
+
+def _reference(text: str) -> dict[str, tuple[str, date]]:
+    latest = {}
+    for row in csv.DictReader(io.StringIO(text, newline="")):
+        day = date.fromisoformat(row["Date"])
+        if row["Scientific Name"] not in latest or day > latest[row["Scientific Name"]][1]:
+            latest[row["Scientific Name"]] = (row["Common Name"], day)
+    return latest
+
+
+def _parse(data: bytes, size: int) -> dict[str, tuple[str, date]]:
+    parser = LifeListParser()
+    for i in range(0, len(data), size):
+        parser.feed(data[i:i + size])
+    return {sci: (s.common_name, s.last_seen) for sci, s in parser.close().items()}
+
+
+@pytest.mark.parametrize("newline", ["\n", "\r\n"])
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 1 << 20])
+def test_matches_dictreader_at_any_chunk_boundary(newline, size):
+    text = (HEADER + ROWS).replace("\n", newline)
+    expected = _reference(text)
+    assert len(expected) == 4
+    assert expected["Genus alpha"][0] == 'a 3" bird'
+    assert _parse(text.encode(), size) == expected
+
+
+def test_unterminated_quote_runs_to_the_end():
+    text = HEADER + 'S1,Alpha,Genus alpha,2024-01-01\nS2,"Bravo,Genus bravo,2024-01-02\nS3,Charlie,Genus charlie,2024\n'
+    for size in (1, 5, 1 << 20):
+        assert set(_parse(text.encode(), size)) == {"Genus alpha"}
+
+
+def test_missing_final_newline():
+    seen = load_life_list_from_string((HEADER + ROWS).rstrip("\n"))
+    assert seen["Genus bravo"].last_seen == date(2024, 3, 5)
+
+
+def test_upload_rejects_malformed_csv():
+    with TestClient(api.app) as client:
+        # A bare carriage return inside an unquoted field is a csv.Error.
+        response = client.put("/lifelist/csv", content=HEADER + "S1,Al\rpha,Genus alpha,2024-01-01\n")
+        assert response.status_code == 400
+        response = client.put("/lifelist/csv", content=b"\xff\xfe" + HEADER.encode())
+        assert response.status_code == 422